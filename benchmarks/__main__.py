@@ -0,0 +1,106 @@
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Tuple
+from benchmarks.suite import BENCHMARKS, per_op
+
+BASELINE = Path(__file__).with_name("baseline.json")
+CALIBRATION = "calibration"
+
+def _reference(values: dict, key: str) -> bool:
+    return values.get(key) == 1
+
+def calibrate(scale: float) -> float:
+    # A fixed pure-Python workload timed in every round. Results are compared
+    # relative to it, so a machine that is slower or busier as a whole than
+    # when the baseline was recorded does not read as a regression.
+    values = {"a": 1}
+    return per_op(lambda: _reference(values, "a"), scale)
+
+def run(scale: float, only: str, rounds: int) -> Tuple[dict, dict]:
+    # Rounds interleave every benchmark, so a burst of load on the machine
+    # touches one sample of many benchmarks rather than all samples of one.
+    samples: Dict[str, List[float]] = {}
+    for index in range(rounds):
+        samples.setdefault(CALIBRATION, []).append(calibrate(scale))
+        for bench in BENCHMARKS:
+            if only and only not in bench.__name__:
+                continue
+            print(f"round {index + 1}/{rounds}: running {bench.__name__}...", file=sys.stderr)
+            for name, value in bench(scale).items():
+                samples.setdefault(name, []).append(value)
+    results = {name: min(values) for name, values in samples.items()}
+    spread = {name: median(values) / min(values) - 1 if min(values) else 0.0 for name, values in samples.items()}
+    return results, spread
+
+def compare(results: dict, spread: dict, baseline: dict, threshold: float) -> list:
+    # Both sides are divided by their own calibration, and a benchmark only
+    # regresses when it is slower by more than the threshold plus twice the
+    # spread its own rounds showed in this run.
+    regressions = []
+    ratio = 1.0
+    if CALIBRATION in results and baseline.get(CALIBRATION):
+        ratio = results[CALIBRATION] / baseline[CALIBRATION]
+    print(f"machine speed relative to the baseline: {1 / ratio:.2f}x")
+    print(f"{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>8} {'noise':>7}")
+    for name, current in sorted(results.items()):
+        if name == CALIBRATION:
+            continue
+        previous = baseline.get(name)
+        if previous is None:
+            print(f"{name:<36} {'-':>12} {current * 1e6:>10.2f}us {'new':>8}")
+            continue
+        change = (current / ratio - previous) / previous if previous else 0.0
+        noise = spread.get(name, 0.0)
+        flag = ""
+        if change > threshold + 2 * noise:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<36} {previous * 1e6:>10.2f}us {current * 1e6:>10.2f}us {change:>+7.0%} {noise:>6.0%}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Scutum hot path benchmarks")
+    parser.add_argument("--output", type=Path, help="write results as JSON to this file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed slowdown before failing (0.5 = 50%%)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts")
+    parser.add_argument("--only", default="", help="run benchmarks whose name contains this string")
+    parser.add_argument("--rounds", type=int, default=5, help="run the suite this many times and keep the best")
+    args = parser.parse_args()
+
+    results, spread = run(args.scale, args.only, args.rounds)
+    document = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "scale": args.scale,
+        "rounds": args.rounds,
+        "results": results,
+        "spread": spread,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+        print(f"baseline saved to {args.baseline}", file=sys.stderr)
+        return 0
+    if not args.baseline.exists():
+        print(json.dumps(document, indent=2, sort_keys=True))
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("scale") != args.scale:
+        print(f"warning: baseline was recorded with --scale {baseline.get('scale')}", file=sys.stderr)
+    regressions = compare(results, spread, baseline["results"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed more than {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
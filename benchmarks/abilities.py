@@ -0,0 +1,79 @@
+import argparse
+import asyncio
+import time
+from typing import List
+from benchmarks.suite import per_op
+from scutum import AsyncGate, AsyncPolicy, DecisionCache, Gate, Policy
+
+def make_policy(base: type, actions: int, latency: float = 0.0) -> type:
+    def action(self, user):
+        return user.id % 2 == 0
+
+    def edit(self, user, resource):
+        return user.id == resource
+
+    async def async_action(self, user):
+        await asyncio.sleep(latency)
+        return user.id % 2 == 0
+
+    async def async_edit(self, user, resource):
+        return user.id == resource
+
+    methods = {f"action{number}": async_action if base is AsyncPolicy else action for number in range(actions)}
+    methods["edit"] = async_edit if base is AsyncPolicy else edit
+    return type("GeneratedPolicy", (base,), methods)
+
+class User:
+    def __init__(self, id: int):
+        self.id = id
+
+def build(policies: int, actions: int, cache: bool) -> Gate:
+    gate = Gate(cache=DecisionCache(maxsize=100_000) if cache else None)
+    policy = make_policy(Policy, actions)
+    for index in range(policies):
+        gate.add_policy(f"p{index}", policy)
+    return gate
+
+def main():
+    parser = argparse.ArgumentParser(description="Cost of computing a user's capability map")
+    parser.add_argument("--policies", type=int, default=30)
+    parser.add_argument("--actions", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.001, help="seconds each async rule waits")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--scale", type=float, default=0.01)
+    args = parser.parse_args()
+
+    user = User(2)
+    gate = build(args.policies, args.actions, cache=False)
+    paths: List[str] = [f"p{index}:action{number}" for index in range(args.policies) for number in range(args.actions)]
+    cached = build(args.policies, args.actions, cache=True)
+
+    print(f"{len(paths)} user-only rules, {args.policies} resource rules skipped")
+    cases = {
+        "allowed() per rule": lambda: [path for path in paths if gate.allowed(path, user)],
+        "abilities()": lambda: gate.abilities(user),
+        "abilities() cached": lambda: cached.abilities(user),
+        "version_only cached": lambda: cached.abilities(user, version_only=True),
+    }
+    for name, case in cases.items():
+        print(f"{name:>22} {per_op(case, args.scale) * 1e6:>10.1f} us")
+
+    async def run_async():
+        gate = AsyncGate()
+        policy = make_policy(AsyncPolicy, args.actions, args.latency)
+        for index in range(args.policies):
+            await gate.add_policy(f"p{index}", policy)
+        start = time.perf_counter()
+        for path in paths:
+            await gate.allowed(path, user)
+        sequential = time.perf_counter() - start
+        start = time.perf_counter()
+        await gate.abilities(user, concurrency=args.concurrency)
+        return sequential, time.perf_counter() - start
+
+    sequential, concurrent = asyncio.run(run_async())
+    print(f"async, {args.latency * 1000:g} ms per rule: sequential allowed() {sequential * 1000:.1f} ms, "
+          f"abilities(concurrency={args.concurrency}) {concurrent * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import tracemalloc
+from typing import Callable
+from benchmarks.suite import per_op
+from scutum import Gate, Response
+from scutum.exceptions import AuthorizationException
+
+def build() -> Gate:
+    gate = Gate()
+    gate.add_rule("bool", lambda user: True)
+    gate.add_rule("allow", lambda user: Response.allow())
+    gate.add_rule("deny", lambda user: Response.deny())
+    gate.add_rule("custom", lambda user: Response.allow("Welcome back"))
+    return gate
+
+def allocations(func: Callable[[], object], checks: int):
+    # Retained bytes come from keeping every returned decision alive; peak
+    # bytes include the garbage a single check leaves behind.
+    results = [None] * checks
+    func()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for index in range(checks):
+        results[index] = func()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    current = tracemalloc.get_traced_memory()[0]
+    func()
+    peak = tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    retained = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+    blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    return retained / checks, blocks / checks, peak
+
+def authorize(gate: Gate, rule: str) -> Callable[[], object]:
+    def check():
+        try:
+            gate.authorize(rule, None)
+        except AuthorizationException:
+            pass
+    return check
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory allocated per check by the decision path")
+    parser.add_argument("--checks", type=int, default=10_000)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    gate = build()
+    cases = {
+        "check bool": lambda: gate.check("bool", None),
+        "check Response.allow()": lambda: gate.check("allow", None),
+        "check Response.allow(msg)": lambda: gate.check("custom", None),
+        "allowed Response.allow()": lambda: gate.allowed("allow", None),
+        "authorize Response.deny()": authorize(gate, "deny"),
+    }
+    print(f"{'case':>26} {'B/check':>8} {'blocks':>7} {'peak B':>7} {'ns':>6}")
+    for name, case in cases.items():
+        retained, blocks, peak = allocations(case, args.checks)
+        timing = per_op(case, args.scale) * 1e9
+        print(f"{name:>26} {retained:>8.1f} {blocks:>7.2f} {peak:>7} {timing:>6.0f}")
+
+if __name__ == "__main__":
+    main()
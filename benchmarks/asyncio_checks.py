@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import time
+from scutum import AsyncGate, AsyncScope
+
+async def build_gate(latency: float) -> AsyncGate:
+    gate = AsyncGate()
+    await gate.add_scope("doc", AsyncScope("doc"))
+
+    async def slow(user, *args):
+        await asyncio.sleep(latency)
+        return False
+
+    async def read(user, *args):
+        await asyncio.sleep(latency)
+        return True
+
+    await gate.add_rule("doc:edit", slow)
+    await gate.add_rule("doc:share", slow)
+    await gate.add_rule("doc:read", read)
+    return gate
+
+async def run_allowed(gate: AsyncGate, tasks: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*[gate.allowed("doc:read", user) for user in range(tasks)])
+    return time.perf_counter() - start
+
+async def run_any(gate: AsyncGate, tasks: int) -> float:
+    rules = ["doc:edit", "doc:share", "doc:read"]
+    start = time.perf_counter()
+    await asyncio.gather(*[gate.any(rules, user) for user in range(tasks)])
+    return time.perf_counter() - start
+
+async def main(args):
+    gate = await build_gate(args.latency)
+    print(f"rule latency: {args.latency * 1000:.0f}ms")
+    print(f"{'tasks':>8} {'allowed ms':>12} {'any ms':>12}")
+    for tasks in args.tasks:
+        allowed = await run_allowed(gate, tasks)
+        any_ = await run_any(gate, tasks)
+        print(f"{tasks:>8} {allowed * 1000:>12.1f} {any_ * 1000:>12.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent AsyncGate checks with I/O-bound rules")
+    parser.add_argument("--latency", type=float, default=0.01, help="simulated rule I/O in seconds")
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1, 10, 100, 1000])
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import time
+from typing import Dict, List, Optional
+from scutum import AsyncGate, AsyncPolicy, Bulkhead
+from scutum.exceptions import BulkheadFullException
+
+class Service:
+    # A backend that slows down as concurrent calls pile up and fails once
+    # more than ``breaking_point`` are in flight.
+    def __init__(self, latency: float, breaking_point: int):
+        self.latency = latency
+        self.breaking_point = breaking_point
+        self.in_flight = 0
+        self.peak = 0
+        self.failures = 0
+
+    async def call(self) -> bool:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.in_flight > self.breaking_point:
+                self.failures += 1
+                raise ConnectionError("service overloaded")
+            await asyncio.sleep(self.latency * (1 + self.in_flight / self.breaking_point))
+            return True
+        finally:
+            self.in_flight -= 1
+
+service = Service(0.005, 64)
+
+class BillingPolicy(AsyncPolicy):
+    async def refund(self, user):
+        return await service.call()
+
+class PostPolicy(AsyncPolicy):
+    async def view(self, user):
+        await asyncio.sleep(0.001)
+        return True
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+async def run(bulkheads: Optional[Dict[str, Bulkhead]], spike: int, steady: int):
+    gate = AsyncGate(bulkheads=bulkheads)
+    await gate.add_policy("billing", BillingPolicy)
+    await gate.add_policy("post", PostPolicy)
+    service.in_flight = service.peak = service.failures = 0
+    outcomes = {"allowed": 0, "rejected": 0, "failed": 0}
+    billing: List[float] = []
+    posts: List[float] = []
+
+    async def check(rule: str, latencies: List[float]):
+        start = time.perf_counter()
+        try:
+            await gate.allowed(rule, None)
+            if rule.startswith("billing"):
+                outcomes["allowed"] += 1
+        except BulkheadFullException:
+            outcomes["rejected"] += 1
+        except ConnectionError:
+            outcomes["failed"] += 1
+        latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(
+        *[check("billing:refund", billing) for _ in range(spike)],
+        *[check("post:view", posts) for _ in range(steady)],
+    )
+    return outcomes, percentile(billing, 0.99), percentile(posts, 0.99), gate.bulkheads
+
+def main():
+    parser = argparse.ArgumentParser(description="A spike of checks against one slow backend, with and without a bulkhead")
+    parser.add_argument("--spike", type=int, default=2_000)
+    parser.add_argument("--steady", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=32)
+    parser.add_argument("--queue", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{args.spike} billing checks at once, backend breaks above {service.breaking_point} concurrent calls")
+    print(f"{'mode':>10} {'peak':>6} {'allowed':>8} {'failed':>7} {'rejected':>9} {'billing p99':>12} {'post p99':>9}")
+    for name, bulkheads in (
+        ("unbounded", None),
+        ("bulkhead", {"billing": Bulkhead(args.limit, max_queue=args.queue)}),
+    ):
+        outcomes, billing, posts, configured = asyncio.run(run(bulkheads, args.spike, args.steady))
+        print(f"{name:>10} {service.peak:>6} {outcomes['allowed']:>8} {outcomes['failed']:>7} {outcomes['rejected']:>9} "
+              f"{billing * 1000:>10.1f}ms {posts * 1000:>7.1f}ms")
+        if configured:
+            print(f"{'':>10} {configured['billing'].stats()}")
+
+if __name__ == "__main__":
+    main()
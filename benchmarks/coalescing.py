@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import random
+import time
+from contextlib import nullcontext
+from typing import List, Optional
+from scutum import AsyncGate, AsyncPolicy, Coalescer, batch
+
+class Backend:
+    # A database behind a connection pool: queries beyond ``pool`` wait for a
+    # free connection, as they would with a real driver.
+    def __init__(self, latency: float, pool: int):
+        self.latency = latency
+        self.pool = pool
+        self.queries = 0
+        self._connections: Optional[asyncio.Semaphore] = None
+
+    async def owners(self, docs: List[int]) -> List[int]:
+        self.queries += 1
+        if self._connections is None:
+            self._connections = asyncio.Semaphore(self.pool) if self.pool else nullcontext()
+        async with self._connections:
+            await asyncio.sleep(self.latency)
+        return [doc % 7 for doc in docs]
+
+backend = Backend(0.002, 10)
+
+class DocumentPolicy(AsyncPolicy):
+    async def read(self, user, doc):
+        return (await backend.owners([doc]))[0] == user
+
+    @batch("read")
+    async def read_many(self, user, docs):
+        return [owner == user for owner in await backend.owners(docs)]
+
+async def request(gate: AsyncGate, user: int, docs: List[int]) -> int:
+    # One resolver per item, each checking its own item, as a GraphQL list
+    # field or a serializer over a page of results would.
+    async def resolve(doc):
+        return doc if await gate.allowed("document:read", user, doc) else None
+    return sum(1 for doc in await asyncio.gather(*[resolve(doc) for doc in docs]) if doc is not None)
+
+async def run(coalesce: bool, requests: int, items: int, distinct: int):
+    gate = AsyncGate(coalesce=Coalescer() if coalesce else None)
+    await gate.add_policy("document", DocumentPolicy)
+    backend.queries = 0
+    backend._connections = None
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for _ in range(requests):
+        docs = [rng.randrange(distinct) for _ in range(items)]
+        await request(gate, rng.randrange(7), docs)
+    elapsed = time.perf_counter() - start
+    return backend.queries, elapsed, gate.coalesce
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend queries issued by per-item checks with and without coalescing")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--pool", type=int, default=10, help="connections; 0 for unbounded")
+    args = parser.parse_args()
+    backend.latency = args.latency
+    backend.pool = args.pool
+
+    print(f"{args.requests} requests x {args.items} item checks over {args.distinct} distinct documents, "
+          f"{args.latency * 1000:g} ms per query, pool {args.pool or 'unbounded'}")
+    print(f"{'mode':>10} {'queries':>9} {'per req':>9} {'ms/req':>8}")
+    for coalesce in (False, True):
+        queries, elapsed, coalescer = asyncio.run(run(coalesce, args.requests, args.items, args.distinct))
+        mode = "coalesced" if coalesce else "per-check"
+        print(f"{mode:>10} {queries:>9} {queries / args.requests:>9.1f} {elapsed / args.requests * 1000:>8.2f}")
+        if coalescer is not None:
+            print(f"{'':>10} {coalescer.stats()}")
+
+if __name__ == "__main__":
+    main()
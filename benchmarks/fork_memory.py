@@ -0,0 +1,90 @@
+import argparse
+import gc
+import os
+import sys
+from typing import Callable, List, Tuple
+from scutum import Gate, Scope
+
+def build(rules: int, services: int, resources: int) -> Tuple[Gate, List[str]]:
+    gate = Gate()
+    per_scope = max(1, rules // (services * resources))
+    paths = []
+    for service in range(services):
+        gate.add_scope(f"svc{service}", Scope(f"svc{service}"))
+        for resource in range(resources):
+            scope = f"svc{service}:res{resource}"
+            gate.add_scope(scope, Scope(f"res{resource}"))
+            for action in range(per_scope):
+                path = f"{scope}:action{action}"
+                gate.add_rule(path, lambda user, limit=action: user.level >= limit)
+                paths.append(path)
+    return gate, paths
+
+def private_kb() -> int:
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            if line.startswith("Private_Dirty:"):
+                return int(line.split()[1])
+    return 0
+
+class User:
+    level = 3
+
+def worker(gate: Gate, paths, passes: int) -> List[int]:
+    start = private_kb()
+    user = User()
+    for _ in range(passes):
+        for path in paths:
+            gate.allowed(path, user)
+    gc.collect()
+    return [private_kb() - start]
+
+def master(frozen: bool, gc_freeze: bool, args) -> List[int]:
+    gate, paths = build(args.rules, args.services, args.resources)
+    if frozen:
+        gate.freeze()
+    gc.collect()
+    if gc_freeze:
+        gc.freeze()
+    return forked(args.workers, worker, gate, paths, args.passes)
+
+def forked(count: int, func: Callable[..., List[int]], *args) -> List[int]:
+    read, write = os.pipe()
+    children = []
+    for _ in range(count):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            try:
+                for value in func(*args):
+                    os.write(write, f"{value}\n".encode())
+            finally:
+                os._exit(0)
+        children.append(pid)
+    os.close(write)
+    for pid in children:
+        os.waitpid(pid, 0)
+    with os.fdopen(read) as output:
+        return [int(line) for line in output]
+
+def main():
+    parser = argparse.ArgumentParser(description="Private memory dirtied per forked worker by a shared gate")
+    parser.add_argument("--rules", type=int, default=5000)
+    parser.add_argument("--services", type=int, default=50)
+    parser.add_argument("--resources", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--passes", type=int, default=3, help="checks of every rule per worker")
+    args = parser.parse_args()
+    if not hasattr(os, "fork") or not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("fork_memory needs os.fork and /proc/self/smaps_rollup (Linux)")
+
+    print(f"{args.rules} rules, {args.workers} workers, {args.passes} passes per worker")
+    print(f"{'mode':<18} {'KiB/worker':>11} {'MiB total':>10}")
+    for frozen, gc_freeze in ((False, False), (True, False), (False, True), (True, True)):
+        samples = forked(1, master, frozen, gc_freeze, args)
+        mode = ("frozen" if frozen else "mutable") + ("+gc.freeze" if gc_freeze else "")
+        average = sum(samples) / len(samples)
+        print(f"{mode:<18} {average:>11.0f} {sum(samples) / 1024:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+POLICY = '''from scutum import Policy
+
+class Policy{index}(Policy):
+{methods}
+'''
+
+METHOD = '''    def action{index}(self, user, *args, **kwargs):
+        return user.id == {index}
+'''
+
+STARTUP = '''
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from importlib import import_module
+from scutum import Gate
+gate = Gate()
+for index in range({policies}):
+    if {lazy}:
+        gate.lazy_policy(f"p{{index}}", f"project.policy{{index}}:Policy{{index}}")
+    else:
+        gate.add_policy(f"p{{index}}", getattr(import_module(f"project.policy{{index}}"), f"Policy{{index}}"))
+startup = time.perf_counter() - start
+
+class User:
+    id = 0
+
+start = time.perf_counter()
+gate.allowed("p0:action0", User())
+first = time.perf_counter() - start
+start = time.perf_counter()
+gate.allowed("p0:action0", User())
+warm = time.perf_counter() - start
+print(json.dumps({{"startup": startup, "first": first, "warm": warm}}))
+'''
+
+def generate(root: Path, policies: int, actions: int):
+    package = root / "project"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    methods = "".join(METHOD.format(index=index) for index in range(actions))
+    for index in range(policies):
+        (package / f"policy{index}.py").write_text(POLICY.format(index=index, methods=methods))
+
+def measure(root: Path, policies: int, lazy: bool) -> dict:
+    script = STARTUP.format(root=str(root), policies=policies, lazy=lazy)
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time of eager vs lazy policy registration")
+    parser.add_argument("--policies", type=int, default=500)
+    parser.add_argument("--actions", type=int, default=10, help="actions per policy")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        generate(root, args.policies, args.actions)
+        measure(root, args.policies, False)
+        print(f"{args.policies} policies x {args.actions} actions, best of {args.runs} fresh processes")
+        print(f"{'mode':<8} {'startup ms':>12} {'first check ms':>16} {'warm check us':>15}")
+        for lazy in (False, True):
+            runs = [measure(root, args.policies, lazy) for _ in range(args.runs)]
+            best = {key: min(run[key] for run in runs) for key in runs[0]}
+            mode = "lazy" if lazy else "eager"
+            print(f"{mode:<8} {best['startup'] * 1000:>12.1f} {best['first'] * 1000:>16.2f} {best['warm'] * 1e6:>15.1f}")
+
+if __name__ == "__main__":
+    main()
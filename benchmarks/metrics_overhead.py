@@ -0,0 +1,44 @@
+import argparse
+import os
+import tempfile
+import timeit
+from scutum import AuditLog, Gate, JSONLinesSink, Metrics, Scope
+
+def build_gate(**options) -> Gate:
+    gate = Gate(**options)
+    gate.add_scope("post", Scope("post"))
+    gate.add_rule("post:edit", lambda user, post: user == post)
+    return gate
+
+class HeldSink:
+    def write(self, records):
+        pass
+
+def per_check(gate: Gate, number: int, repeat: int) -> float:
+    timings = timeit.repeat(lambda: gate.allowed("post:edit", 1, 1), number=number, repeat=repeat)
+    return min(timings) / number
+
+def main():
+    parser = argparse.ArgumentParser(description="Gate.allowed cost with and without metrics and the audit log")
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = per_check(build_gate(), args.number, args.repeat)
+    metered = build_gate(metrics=Metrics())
+    enabled = per_check(metered, args.number, args.repeat)
+    print(f"{'metrics off':<14} {baseline * 1e9:>8.0f} ns/check")
+    print(f"{'metrics on':<14} {enabled * 1e9:>8.0f} ns/check  (+{(enabled - baseline) * 1e9:.0f} ns)")
+    held = AuditLog(HeldSink(), maxsize=10 ** 8, batch_size=10 ** 8, flush_interval=3600)
+    enqueued = per_check(build_gate(audit=held), args.number, args.repeat)
+    print(f"{'audit enqueue':<14} {enqueued * 1e9:>8.0f} ns/check  (+{(enqueued - baseline) * 1e9:.0f} ns, request path only)")
+    with tempfile.TemporaryDirectory() as directory:
+        audit = AuditLog(JSONLinesSink(os.path.join(directory, "audit.jsonl")), maxsize=1_000_000)
+        audited = per_check(build_gate(audit=audit), args.number, args.repeat)
+        audit.close()
+    print(f"{'audit + file':<14} {audited * 1e9:>8.0f} ns/check  (+{(audited - baseline) * 1e9:.0f} ns, drain thread sharing the CPU)")
+    print()
+    print(metered.metrics.exposition(), end="")
+
+if __name__ == "__main__":
+    main()
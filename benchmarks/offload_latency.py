@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from scutum import AsyncGate, Offloader
+
+def blocking_rule(user, report=None):
+    time.sleep(0.005)
+    return True
+
+async def pure_rule(user, post=None):
+    return user is not None
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "p50": statistics.median(samples) * 1000,
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000,
+    }
+
+async def load(fast: Callable[[], Awaitable], slow: Callable[[], Awaitable], requests: int, rate: float) -> Dict[str, float]:
+    latencies: Dict[str, List[float]] = {"fast": [], "slow": []}
+
+    async def request(index: int, scheduled: float):
+        kind, call = ("slow", slow) if index % 4 == 0 else ("fast", fast)
+        await call()
+        latencies[kind].append(time.perf_counter() - scheduled)
+
+    start = time.perf_counter()
+    tasks = []
+    for index in range(requests):
+        scheduled = start + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(request(index, scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    results = {f"fast {key}": value for key, value in percentiles(latencies["fast"]).items()}
+    results.update({f"slow {key}": value for key, value in percentiles(latencies["slow"]).items()})
+    results["req/s"] = requests / elapsed
+    return results
+
+async def gate_load(offload: Optional[Offloader], args) -> Dict[str, float]:
+    gate = AsyncGate(offload=offload)
+    await gate.add_rule("report", blocking_rule)
+    await gate.add_rule("post", pure_rule)
+    return await load(
+        lambda: gate.allowed("post", 1),
+        lambda: gate.allowed("report", 1),
+        args.requests,
+        args.rate,
+    )
+
+async def fastapi_load(offload: Optional[Offloader], args) -> Optional[Dict[str, float]]:
+    try:
+        import httpx
+        from fastapi import Depends, FastAPI
+        from scutum.ext.fastapi import create_api_gate
+    except ImportError:
+        return None
+
+    def get_user():
+        return 1
+
+    gate = create_api_gate(get_user, offload=offload)
+    await gate.add_rule("report", blocking_rule)
+    await gate.add_rule("post", pure_rule)
+    app = FastAPI()
+
+    @app.get("/post")
+    async def post(user=Depends(gate.authorized_user("post"))):
+        return {"ok": True}
+
+    @app.get("/report")
+    async def report(user=Depends(gate.authorized_user("report"))):
+        return {"ok": True}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        return await load(
+            lambda: client.get("/post"),
+            lambda: client.get("/report"),
+            args.requests,
+            args.rate,
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency of fast checks next to blocking sync rules")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=600, help="requests started per second")
+    parser.add_argument("--workers", type=int, default=16, help="thread pool size when offloading")
+    args = parser.parse_args()
+
+    print(f"{args.rate:.0f} req/s, 1 in 4 hits a sync rule that blocks for 5 ms; latency from arrival in ms")
+    print(f"{'target':<9} {'mode':<8} {'fast p50':>9} {'fast p99':>9} {'slow p50':>9} {'slow p99':>9} {'req/s':>8}")
+    for target, run in (("gate", gate_load), ("fastapi", fastapi_load)):
+        for mode in ("inline", "thread"):
+            offload = Offloader(default="thread", max_workers=args.workers) if mode == "thread" else None
+            results = asyncio.run(run(offload, args))
+            if offload is not None:
+                offload.shutdown()
+            if results is None:
+                print(f"{target:<9} skipped, fastapi and httpx are not installed")
+                break
+            print(
+                f"{target:<9} {mode:<8} {results['fast p50']:>9.2f} {results['fast p99']:>9.2f} "
+                f"{results['slow p50']:>9.2f} {results['slow p99']:>9.2f} {results['req/s']:>8.0f}"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import time
+import timeit
+from types import SimpleNamespace
+from scutum import Gate, RoleRegistry, Scope
+
+def build(roles: int, chain: int):
+    registry = RoleRegistry()
+    flattened = {}
+    start = time.perf_counter()
+    for index in range(roles):
+        parent = [f"r{index - 1}"] if index % chain else []
+        registry.role(f"r{index}", permissions=[f"p{index}"], inherits=parent)
+        flattened[f"r{index}"] = {f"p{index}"} | (flattened[parent[0]] if parent else set())
+    elapsed = time.perf_counter() - start
+    return registry, flattened, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Bitmask RBAC rules vs equivalent callable rules")
+    parser.add_argument("--roles", type=int, default=10_000, help="roles, each granting one new permission")
+    parser.add_argument("--chain", type=int, default=100, help="length of each inheritance chain")
+    parser.add_argument("--number", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    registry, flattened, elapsed = build(args.roles, args.chain)
+    print(f"declared {args.roles} roles / {args.roles} permissions in {elapsed * 1000:.0f}ms")
+
+    user_roles = [f"r{args.chain - 1}", f"r{args.roles // 2 + args.chain - 1}", f"r{args.roles - 1}"]
+    user = SimpleNamespace(
+        roles=user_roles,
+        permission_set=set().union(*(flattened[role] for role in user_roles)),
+    )
+    masked_user = SimpleNamespace(roles=user_roles, rbac_mask=registry.mask_for(user_roles))
+    permission = f"p{args.roles // 2}"
+    several = [f"p{args.roles // 2}", f"p{args.roles // 2 + 50}", f"p{args.roles - 1}"]
+
+    gate = Gate()
+    gate.add_scope("perm", Scope("perm"))
+    gate.add_rule("perm:bitmask", registry.requires(permission))
+    gate.add_rule("perm:bitmask3", registry.requires(*several))
+    gate.add_rule("perm:set", lambda user, *args: permission in user.permission_set)
+    gate.add_rule("perm:set3", lambda user, *args: all(name in user.permission_set for name in several))
+    gate.add_rule("perm:noop", lambda user, *args: True)
+    gate.add_rule("perm:roles", lambda user, *args: any(permission in flattened[role] for role in user.roles))
+
+    def fresh_user():
+        return SimpleNamespace(roles=user_roles)
+
+    cases = [
+        ("gate overhead (rule returns True)", "perm:noop", lambda: user),
+        ("bitmask rule, mask from roles", "perm:bitmask", lambda: user),
+        ("bitmask rule, new user per check", "perm:bitmask", fresh_user),
+        ("bitmask rule, precomputed mask", "perm:bitmask", lambda: masked_user),
+        ("callable: perm in user set", "perm:set", lambda: user),
+        ("callable: role lookup", "perm:roles", lambda: user),
+        ("bitmask rule, 3 permissions", "perm:bitmask3", lambda: user),
+        ("callable: 3 perms in user set", "perm:set3", lambda: user),
+    ]
+    # Cases are interleaved and the best round kept, so a noisy moment on the
+    # machine does not land on one case only.
+    best = {label: float("inf") for label, _, _ in cases}
+    for _ in range(args.repeat):
+        for label, rule, subject in cases:
+            assert gate.allowed(rule, subject())
+            elapsed = timeit.timeit(lambda: gate.allowed(rule, subject()), number=args.number)
+            best[label] = min(best[label], elapsed / args.number)
+    for label, _, _ in cases:
+        print(f"{label:<34} {best[label] * 1e9:>8.0f} ns/check")
+
+if __name__ == "__main__":
+    main()
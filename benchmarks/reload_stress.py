@@ -0,0 +1,145 @@
+import argparse
+import asyncio
+import threading
+import time
+from typing import Dict
+from scutum import AsyncGate, AsyncPolicy, Gate, Policy
+
+RULES = ["post:view", "post:edit", "comment:edit"]
+
+class PostPolicyV1(Policy):
+    def view(self, user, post=None):
+        return True
+
+    def edit(self, user, post=None):
+        return user == post
+
+class PostPolicyV2(PostPolicyV1):
+    def edit(self, user, post=None):
+        return user == post or user == 0
+
+class CommentPolicy(Policy):
+    def edit(self, user, comment=None):
+        return user == comment
+
+class AsyncPostPolicyV1(AsyncPolicy):
+    async def view(self, user, post=None):
+        return True
+
+    async def edit(self, user, post=None):
+        return user == post
+
+class AsyncPostPolicyV2(AsyncPostPolicyV1):
+    async def edit(self, user, post=None):
+        return user == post or user == 0
+
+class AsyncCommentPolicy(AsyncPolicy):
+    async def edit(self, user, comment=None):
+        return user == comment
+
+def configure(version: int):
+    def register(gate: Gate):
+        gate.add_policy("post", PostPolicyV1 if version % 2 else PostPolicyV2)
+        gate.add_policy("comment", CommentPolicy)
+    return register
+
+def configure_async(version: int):
+    async def register(gate: AsyncGate):
+        await gate.add_policy("post", AsyncPostPolicyV1 if version % 2 else AsyncPostPolicyV2)
+        await gate.add_policy("comment", AsyncCommentPolicy)
+    return register
+
+def run_threads(mode: str, threads: int, duration: float) -> Dict[str, int]:
+    gate = Gate()
+    configure(1)(gate)
+    counts = {"checks": 0, "errors": 0, "reloads": 0}
+    stop = threading.Event()
+    lock = threading.Lock()
+
+    def check():
+        checks = errors = 0
+        while not stop.is_set():
+            for rule in RULES:
+                try:
+                    gate.allowed(rule, 0, 1)
+                except Exception:
+                    errors += 1
+                checks += 1
+        with lock:
+            counts["checks"] += checks
+            counts["errors"] += errors
+
+    def reload():
+        version = 1
+        while not stop.is_set():
+            version += 1
+            if mode == "swap":
+                gate.reload(configure(version))
+            else:
+                gate.remove_scope("post")
+                gate.add_policy("post", PostPolicyV1 if version % 2 else PostPolicyV2)
+            counts["reloads"] += 1
+
+    workers = [threading.Thread(target=check) for _ in range(threads)]
+    workers.append(threading.Thread(target=reload))
+    for worker in workers:
+        worker.start()
+    time.sleep(duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return counts
+
+async def run_tasks(mode: str, tasks: int, duration: float) -> Dict[str, int]:
+    gate = AsyncGate()
+    await configure_async(1)(gate)
+    counts = {"checks": 0, "errors": 0, "reloads": 0}
+    deadline = time.perf_counter() + duration
+
+    async def check():
+        while time.perf_counter() < deadline:
+            for rule in RULES:
+                try:
+                    await gate.allowed(rule, 0, 1)
+                except Exception:
+                    counts["errors"] += 1
+                counts["checks"] += 1
+            await asyncio.sleep(0)
+
+    async def reload():
+        version = 1
+        while time.perf_counter() < deadline:
+            version += 1
+            if mode == "swap":
+                await gate.reload(configure_async(version))
+            else:
+                await gate.remove_scope("post")
+                await asyncio.sleep(0)
+                await gate.add_policy("post", AsyncPostPolicyV1 if version % 2 else AsyncPostPolicyV2)
+            counts["reloads"] += 1
+            await asyncio.sleep(0)
+
+    await asyncio.gather(reload(), *[check() for _ in range(tasks)])
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Reload policies while checks run concurrently")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--tasks", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per run")
+    args = parser.parse_args()
+
+    print(f"{'gate':<10} {'mode':<14} {'checks':>10} {'reloads':>8} {'errors':>7}")
+    failed = False
+    for mode in ("remove+add", "swap"):
+        for name, counts in (
+            ("Gate", run_threads(mode, args.threads, args.duration)),
+            ("AsyncGate", asyncio.run(run_tasks(mode, args.tasks, args.duration))),
+        ):
+            print(f"{name:<10} {mode:<14} {counts['checks']:>10} {counts['reloads']:>8} {counts['errors']:>7}")
+            failed = failed or (mode == "swap" and counts["errors"] > 0)
+    if failed:
+        raise SystemExit("checks failed while reloading with swap")
+
+if __name__ == "__main__":
+    main()
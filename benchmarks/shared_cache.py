@@ -0,0 +1,92 @@
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List, Tuple
+from scutum import DecisionCache, Gate, Scope, SharedDecisionCache
+
+def expected(user: int, post: int) -> bool:
+    return (user + post) % 3 != 0
+
+def make_gate(cache: DecisionCache) -> Tuple[Gate, List[int]]:
+    gate = Gate(cache=cache)
+    evaluations = [0]
+
+    def edit(user, post):
+        evaluations[0] += 1
+        return expected(user, post)
+
+    gate.add_scope("post", Scope("post"))
+    gate.add_rule("post:edit", edit)
+    return gate, evaluations
+
+def worker(gate: Gate, evaluations: List[int], args, index: int) -> List[str]:
+    keys = args.users * args.posts
+    start = time.perf_counter()
+    for step in range(args.checks):
+        key = (step * 7919 + index * 104729) % keys
+        user, post = divmod(key, args.posts)
+        if gate.allowed("post:edit", user, post) is not expected(user, post):
+            return ["error"]
+    return [f"{evaluations[0]} {time.perf_counter() - start}"]
+
+def forked(count: int, func: Callable[..., List[str]], *args) -> List[str]:
+    read, write = os.pipe()
+    children = []
+    for index in range(count):
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            try:
+                for line in func(*args, index):
+                    os.write(write, f"{line}\n".encode())
+            finally:
+                os._exit(0)
+        children.append(pid)
+    os.close(write)
+    for pid in children:
+        os.waitpid(pid, 0)
+    with os.fdopen(read) as output:
+        return output.read().split("\n")[:-1]
+
+def clear(cache: SharedDecisionCache, index: int) -> List[str]:
+    cache.clear()
+    return []
+
+def check_invalidation(cache: SharedDecisionCache):
+    gate, evaluations = make_gate(cache)
+    gate.allowed("post:edit", 1, 1)
+    forked(1, clear, cache)
+    gate.allowed("post:edit", 1, 1)
+    if evaluations[0] != 2:
+        sys.exit("a clear() in another worker did not invalidate this worker's decisions")
+
+def main():
+    parser = argparse.ArgumentParser(description="Correctness and throughput of the cross-process decision cache")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--checks", type=int, default=50_000, help="checks per worker")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--posts", type=int, default=100)
+    args = parser.parse_args()
+    if not hasattr(os, "fork"):
+        sys.exit("shared_cache needs os.fork")
+
+    check_invalidation(SharedDecisionCache(slots=1024))
+    keys = args.users * args.posts
+    print(f"{args.workers} workers x {args.checks} checks over {keys} keys")
+    print(f"{'cache':<8} {'evaluations':>12} {'hit rate':>9} {'checks/s':>10}")
+    for name, cache in (
+        ("local", DecisionCache(maxsize=keys)),
+        ("shared", SharedDecisionCache(slots=1 << (keys * 2).bit_length())),
+    ):
+        gate, evaluations = make_gate(cache)
+        results = forked(args.workers, worker, gate, evaluations, args)
+        if "error" in results or len(results) != args.workers:
+            sys.exit(f"{name}: a worker returned a wrong decision")
+        total = sum(int(line.split()[0]) for line in results)
+        elapsed = sum(float(line.split()[1]) for line in results)
+        checks = args.workers * args.checks
+        print(f"{name:<8} {total:>12} {1 - total / checks:>9.1%} {checks / elapsed:>10.0f}")
+
+if __name__ == "__main__":
+    main()
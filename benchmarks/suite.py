@@ -0,0 +1,167 @@
+import asyncio
+import time
+import timeit
+from typing import Callable, Dict, List
+from scutum import AsyncGate, Gate, Policy, Scope
+
+Results = Dict[str, float]
+BENCHMARKS: List[Callable[[float], Results]] = []
+
+def benchmark(func: Callable[[float], Results]) -> Callable[[float], Results]:
+    BENCHMARKS.append(func)
+    return func
+
+def per_op(func: Callable[[], object], scale: float, number: int = 20_000, repeat: int = 7) -> float:
+    number = max(1, int(number * scale))
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+class PostPolicy(Policy):
+    def edit(self, user, post):
+        return user == post
+
+def nested_gate(depth: int) -> Gate:
+    gate = Gate()
+    path = []
+    for level in range(depth):
+        path.append(f"s{level}")
+        gate.add_scope(":".join(path), Scope(f"s{level}"))
+    gate.add_rule(":".join(path + ["edit"]), lambda user, post: user == post)
+    gate.add_policy(":".join(path + ["policy"]), PostPolicy)
+    return gate
+
+def nested_path(depth: int, *names: str) -> str:
+    return ":".join([f"s{level}" for level in range(depth)] + list(names))
+
+@benchmark
+def allowed_by_depth(scale: float) -> Results:
+    results = {}
+    for depth in (1, 3, 6):
+        gate = nested_gate(depth)
+        rule = nested_path(depth, "edit")
+        policy = nested_path(depth, "policy", "edit")
+        results[f"allowed.rule.depth{depth}"] = per_op(lambda: gate.allowed(rule, 1, 1), scale)
+        results[f"allowed.policy.depth{depth}"] = per_op(lambda: gate.allowed(policy, 1, 1), scale)
+    return results
+
+@benchmark
+def lookups(scale: float) -> Results:
+    gate = nested_gate(3)
+    rule, scope = nested_path(3, "edit"), nested_path(3)
+    missing_rule, missing_scope = nested_path(3, "missing"), nested_path(2, "missing")
+    return {
+        "has_rule.hit": per_op(lambda: gate.has_rule(rule), scale),
+        "has_rule.miss": per_op(lambda: gate.has_rule(missing_rule), scale),
+        "has_scope.hit": per_op(lambda: gate.has_scope(scope), scale),
+        "has_scope.miss": per_op(lambda: gate.has_scope(missing_scope), scale),
+    }
+
+@benchmark
+def registration(scale: float) -> Results:
+    results = {}
+    for label in (1_000, 5_000):
+        count = max(1, int(label * scale))
+
+        def register():
+            gate = Gate()
+            for scope in range(count // 100 + 1):
+                gate.add_scope(f"s{scope}", Scope(f"s{scope}"))
+            for index in range(count):
+                gate.add_rule(f"s{index // 100}:r{index}", lambda user: True)
+
+        results[f"register.{label}_rules"] = per_op(register, 1, number=1, repeat=3) / count
+    return results
+
+@benchmark
+def any_none(scale: float) -> Results:
+    results = {}
+    for count in (1, 5, 10, 50):
+        gate = Gate()
+        gate.add_scope("doc", Scope("doc"))
+        rules = [f"doc:r{index}" for index in range(count)]
+        for rule in rules:
+            gate.add_rule(rule, lambda user: False)
+        number = 20_000 // count
+        results[f"any.{count}_rules"] = per_op(lambda: gate.any(rules, 1), scale, number)
+        results[f"none.{count}_rules"] = per_op(lambda: gate.none(rules, 1), scale, number)
+    return results
+
+@benchmark
+def async_concurrency(scale: float) -> Results:
+    async def run(tasks: int) -> float:
+        gate = AsyncGate()
+
+        async def read(user):
+            await asyncio.sleep(0)
+            return True
+
+        await gate.add_rule("read", read)
+        best = float("inf")
+        for _ in range(3):
+            start = time.perf_counter()
+            await asyncio.gather(*[gate.allowed("read", user) for user in range(tasks)])
+            best = min(best, time.perf_counter() - start)
+        return best / tasks
+
+    return {
+        f"async.allowed.{tasks}_tasks": asyncio.run(run(tasks))
+        for tasks in (1, 10, 100, 1_000, 10_000)
+    }
+
+@benchmark
+def flask_decorator(scale: float) -> Results:
+    try:
+        from flask import Flask
+        from scutum.ext.flask import Scutum
+    except ImportError:
+        return {}
+
+    app = Flask(__name__)
+    scutum = Scutum(app)
+    scutum.user_resolver(lambda *args, **kwargs: 1)
+    scutum.gate.add_rule("view", lambda user, *args, **kwargs: True)
+
+    @app.route("/plain")
+    def plain():
+        return "ok"
+
+    @app.route("/guarded")
+    @scutum.authorized("view")
+    def guarded():
+        return "ok"
+
+    client = app.test_client()
+    plain_cost = per_op(lambda: client.get("/plain"), scale, 500)
+    guarded_cost = per_op(lambda: client.get("/guarded"), scale, 500)
+    return {"flask.authorized.overhead": max(guarded_cost - plain_cost, 0.0)}
+
+@benchmark
+def fastapi_dependency(scale: float) -> Results:
+    try:
+        from fastapi import Depends, FastAPI
+        from fastapi.testclient import TestClient
+        from scutum.ext.fastapi import create_api_gate
+    except ImportError:
+        return {}
+
+    def get_user():
+        return 1
+
+    gate = create_api_gate(get_user)
+    app = FastAPI()
+
+    @app.on_event("startup")
+    async def startup():
+        await gate.add_rule("view", lambda user, *args, **kwargs: True)
+
+    @app.get("/plain")
+    async def plain():
+        return "ok"
+
+    @app.get("/guarded")
+    async def guarded(user=Depends(gate.authorized_user("view"))):
+        return "ok"
+
+    with TestClient(app) as client:
+        plain_cost = per_op(lambda: client.get("/plain"), scale, 200)
+        guarded_cost = per_op(lambda: client.get("/guarded"), scale, 200)
+    return {"fastapi.authorized_user.overhead": max(guarded_cost - plain_cost, 0.0)}
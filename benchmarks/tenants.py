@@ -0,0 +1,77 @@
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Callable, List
+from benchmarks.suite import per_op
+from scutum import Gate, Policy
+
+def make_policies(count: int, actions: int) -> List[type]:
+    def action(self, user, resource=None):
+        return user == resource
+    return [
+        type(f"Policy{index}", (Policy,), {f"action{number}": action for number in range(actions)})
+        for index in range(count)
+    ]
+
+def configure(gate: Gate, policies: List[type]):
+    for index, policy in enumerate(policies):
+        gate.add_policy(f"p{index}", policy)
+
+def customize(gate: Gate, tenant: int, overrides: int, policies: int):
+    for number in range(overrides):
+        gate.override_rule(f"p{(tenant + number) % policies}:action{number}", lambda user, resource=None: True)
+
+def measure(build: Callable[[int], Gate], tenants: int):
+    # Timed without tracemalloc, which slows allocation down several times.
+    start = time.perf_counter()
+    gates = [build(tenant) for tenant in range(tenants)]
+    elapsed = time.perf_counter() - start
+    del gates
+    gc.collect()
+    tracemalloc.start()
+    gates = [build(tenant) for tenant in range(tenants)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return gates, size / tenants, elapsed / tenants
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and creation time of per-tenant gates: full copies vs overlays on one base")
+    parser.add_argument("--tenants", type=int, default=10_000)
+    parser.add_argument("--policies", type=int, default=50)
+    parser.add_argument("--actions", type=int, default=10)
+    parser.add_argument("--overrides", type=int, default=3)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--full-sample", type=int, default=200, help="full gates to build; the rest is extrapolated")
+    args = parser.parse_args()
+
+    policies = make_policies(args.policies, args.actions)
+    base = Gate()
+    configure(base, policies)
+    base.freeze()
+
+    def full(tenant: int) -> Gate:
+        gate = Gate()
+        configure(gate, policies)
+        customize(gate, tenant, args.overrides, args.policies)
+        return gate
+
+    def overlay(tenant: int) -> Gate:
+        gate = base.overlay()
+        customize(gate, tenant, args.overrides, args.policies)
+        return gate
+
+    last = f"p{args.policies - 1}:action{args.actions - 1}"
+    print(f"{args.tenants} tenants, {args.policies * args.actions} base rules, {args.overrides} overrides each")
+    print(f"{'mode':>8} {'KiB/tenant':>11} {'MiB total':>10} {'us/tenant':>10} {'base ns':>8} {'override ns':>12}")
+    for name, build, count in (("full", full, min(args.full_sample, args.tenants)), ("overlay", overlay, args.tenants)):
+        gates, size, elapsed = measure(build, count)
+        gate = gates[0]
+        base_ns = per_op(lambda: gate.allowed(last, 1, 1), args.scale) * 1e9
+        override_ns = per_op(lambda: gate.allowed("p0:action0", 1, 2), args.scale) * 1e9
+        total = size * args.tenants / 2**20
+        print(f"{name:>8} {size / 1024:>11.2f} {total:>10.1f} {elapsed * 1e6:>10.1f} {base_ns:>8.0f} {override_ns:>12.0f}")
+        del gates, gate
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from scutum import Gate, Scope
+
+def build_gate(latency: float) -> Gate:
+    gate = Gate()
+    gate.add_scope("post", Scope("post"))
+
+    @gate.rule("post:edit")
+    def edit(user, post):
+        if latency:
+            time.sleep(latency)
+        return user == post
+
+    return gate
+
+def run(gate: Gate, threads: int, checks: int) -> float:
+    per_thread = checks // threads
+
+    def worker():
+        for _ in range(per_thread):
+            gate.allowed("post:edit", 1, 1)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for future in [executor.submit(worker) for _ in range(threads)]:
+            future.result()
+    return per_thread * threads / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Gate.allowed throughput by thread count")
+    parser.add_argument("--checks", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=0.001, help="simulated rule I/O in seconds")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    gate = build_gate(args.latency)
+    print(f"{'threads':>8} {'checks/sec':>12}")
+    for threads in args.threads:
+        print(f"{threads:>8} {run(gate, threads, args.checks):>12.0f}")
+
+if __name__ == "__main__":
+    main()
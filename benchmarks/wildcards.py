@@ -0,0 +1,44 @@
+import argparse
+from benchmarks.suite import per_op
+from scutum import Gate, Scope
+
+def build(rules: int, per_scope: int) -> Gate:
+    gate = Gate()
+    gate.add_scope("admin", Scope("admin"))
+    gate.add_rule("admin:*", lambda user: user.is_admin)
+    gate.add_rule("*:read", lambda user: True)
+    gate.add_rule("*:*:audit", lambda user: user.is_admin)
+    for index in range(rules // per_scope):
+        scope = f"s{index}"
+        gate.add_scope(scope, Scope(scope))
+        gate.add_scope(f"{scope}:items", Scope("items"))
+        for action in range(per_scope):
+            gate.add_rule(f"{scope}:action{action}", lambda user: True)
+    return gate
+
+class User:
+    is_admin = True
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule resolution cost with wildcard patterns as the registry grows")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--per-scope", type=int, default=100)
+    parser.add_argument("--scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    user = User()
+    cases = {
+        "exact": lambda gate, last: gate.allowed(f"{last}:action7", user),
+        "admin:*": lambda gate, last: gate.allowed("admin:delete", user),
+        "*:read": lambda gate, last: gate.allowed(f"{last}:read", user),
+        "*:*:audit": lambda gate, last: gate.allowed(f"{last}:items:audit", user),
+    }
+    print(f"{'rules':>8} " + " ".join(f"{name + ' ns':>14}" for name in cases))
+    for size in args.sizes:
+        gate = build(size, args.per_scope)
+        last = f"s{size // args.per_scope - 1}"
+        timings = [per_op(lambda: case(gate, last), args.scale) * 1e9 for case in cases.values()]
+        print(f"{size:>8} " + " ".join(f"{timing:>14.0f}" for timing in timings))
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,16 @@
 from .authorizable import authorizable
-from .policy import Policy, AsyncPolicy
+from .policy import Policy, AsyncPolicy, batch, filters
 from .response import Response
 from .gate import Gate, AsyncGate
 from .scope import Scope, AsyncScope
+from .cache import DecisionCache, SharedDecisionCache, uncached
+from .metrics import Instrumentation, Metrics
+from .offload import Offloader, offload
+from .deadline import Deadlines, deadline
+from .audit import AuditLog, AsyncAuditLog, JSONLinesSink
+from .coalesce import Coalescer
+from .abilities import Abilities
+from .bulkhead import Bulkhead
+from .rbac import RoleRegistry
+from .filters import Field, SQLSource, RecordSource, ALLOW_ALL, DENY_ALL
 from .types import Rule
\ No newline at end of file
@@ -0,0 +1,56 @@
+import inspect
+from bisect import bisect_left
+from hashlib import blake2b
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from scutum.types import Rule
+
+# Not a valid rule path, so cached ability maps never collide with decisions.
+CACHE_KEY = ":abilities"
+
+class Abilities:
+    # The paths a user is allowed, sorted, plus a version that only changes
+    # when that set does, so clients can skip downloading an unchanged map.
+    __slots__ = ("allowed", "version")
+
+    def __init__(self, allowed: Iterable[str]):
+        self.allowed: Tuple[str, ...] = tuple(sorted(allowed))
+        self.version = blake2b("\n".join(self.allowed).encode(), digest_size=8).hexdigest()
+
+    def __contains__(self, path: str) -> bool:
+        index = bisect_left(self.allowed, path)
+        return index < len(self.allowed) and self.allowed[index] == path
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.allowed)
+
+    def __len__(self) -> int:
+        return len(self.allowed)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Abilities):
+            return NotImplemented
+        return self.allowed == other.allowed
+
+    def __hash__(self) -> int:
+        return hash(self.allowed)
+
+    def __repr__(self) -> str:
+        return f"Abilities({len(self.allowed)} allowed, version={self.version!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": self.version, "allowed": list(self.allowed)}
+
+def takes_user_only(rule: Rule) -> bool:
+    try:
+        inspect.signature(rule).bind(None)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+def in_prefix(path: str, prefix: Optional[str]) -> bool:
+    return prefix is None or path == prefix or path.startswith(f"{prefix}:")
+
+def user_only_rules(index: Dict[str, Tuple[Rule, bool]], prefix: Optional[str]) -> List[Tuple[str, Rule]]:
+    return sorted(
+        (path, rule) for path, (rule, _) in index.items() if in_prefix(path, prefix) and takes_user_only(rule)
+    )
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import os
+import random
+import threading
+from collections import deque
+from time import time
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Tuple, Union
+from scutum.cache import default_subject_key
+from scutum.metrics import ALLOW
+from scutum.response import Response
+
+DROP_NEWEST = "drop-newest"
+DROP_OLDEST = "drop-oldest"
+
+Record = Tuple[float, str, Hashable, str, float, bool]
+
+_encode = json.JSONEncoder(default=str, separators=(",", ":")).encode
+
+class JSONLinesSink:
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, Any]]):
+        self._file.write("".join(_encode(record) + "\n" for record in records))
+        self._file.flush()
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        self._file.close()
+
+class BaseAuditLog:
+    # ``record`` runs on the request path: it only samples and appends a tuple
+    # to a bounded deque. Formatting and writing happen in batches on the
+    # drain side, which is a thread for AuditLog and a task for AsyncAuditLog.
+    def __init__(
+        self,
+        sink: Any,
+        maxsize: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        sample_rate: float = 1.0,
+        overflow: str = DROP_NEWEST,
+        subject_key: Callable[[Any], Hashable] = default_subject_key,
+    ):
+        if overflow not in (DROP_NEWEST, DROP_OLDEST):
+            raise ValueError(f"Unknown overflow policy: '{overflow}'")
+        self.sink = sink
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_rate = sample_rate
+        self.overflow = overflow
+        self.subject_key = subject_key
+        self.recorded = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.written = 0
+        self.errors = 0
+        self._queue: Deque[Record] = deque(maxlen=maxsize if overflow == DROP_OLDEST else None)
+        self._closed = False
+
+    def record(self, rule: str, user: Any, elapsed: float, outcome: str, response: Union[Response, bool, None] = None):
+        if outcome == ALLOW and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return
+        if len(self._queue) >= self.maxsize:
+            self.dropped += 1
+            if self.overflow == DROP_NEWEST:
+                return
+        timed_out = isinstance(response, Response) and response.timed_out
+        self._queue.append((time(), rule, self.subject_key(user), outcome, elapsed, timed_out))
+        self.recorded += 1
+        self._wake(len(self._queue) >= self.batch_size)
+
+    def _wake(self, full: bool):
+        pass
+
+    def _take(self) -> List[Record]:
+        batch = []
+        queue = self._queue
+        while queue and len(batch) < self.batch_size:
+            batch.append(queue.popleft())
+        return batch
+
+    def _write(self, batch: List[Record]):
+        records = [
+            {
+                "ts": timestamp,
+                "rule": rule,
+                "subject": subject,
+                "decision": outcome,
+                "latency_ms": round(elapsed * 1000, 3),
+                **({"timed_out": True} if timed_out else {}),
+            }
+            for timestamp, rule, subject, outcome, elapsed, timed_out in batch
+        ]
+        try:
+            self.sink.write(records)
+            self.written += len(records)
+        except Exception:
+            self.errors += len(records)
+
+    def _close_sink(self):
+        close = getattr(self.sink, "close", None)
+        if close is not None:
+            close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "recorded": self.recorded,
+            "sampled_out": self.sampled_out,
+            "dropped": self.dropped,
+            "written": self.written,
+            "errors": self.errors,
+            "queued": len(self._queue),
+        }
+
+class AuditLog(BaseAuditLog):
+    def __init__(self, sink: Any, **options):
+        super().__init__(sink, **options)
+        self._event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def record(self, rule: str, user: Any, elapsed: float, outcome: str, response: Union[Response, bool, None] = None):
+        if self._thread is None:
+            self.start()
+        super().record(rule, user, elapsed, outcome, response)
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._drain, name="scutum-audit", daemon=True)
+                self._thread.start()
+
+    def _wake(self, full: bool):
+        if full:
+            self._event.set()
+
+    def _drain(self):
+        while not self._closed:
+            self._event.wait(self.flush_interval)
+            self._event.clear()
+            self.flush()
+
+    def flush(self):
+        batch = self._take()
+        while batch:
+            self._write(batch)
+            batch = self._take()
+
+    def close(self):
+        self._closed = True
+        self._event.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        self._close_sink()
+
+class AsyncAuditLog(BaseAuditLog):
+    def __init__(self, sink: Any, **options):
+        super().__init__(sink, **options)
+        self._event: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, rule: str, user: Any, elapsed: float, outcome: str, response: Union[Response, bool, None] = None):
+        if self._task is None and not self._closed:
+            self.start()
+        super().record(rule, user, elapsed, outcome, response)
+
+    def start(self):
+        self._event = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._drain())
+
+    def _wake(self, full: bool):
+        if full and self._event is not None:
+            self._event.set()
+
+    async def _drain(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._event.clear()
+            await self.flush()
+
+    async def flush(self):
+        loop = asyncio.get_running_loop()
+        batch = self._take()
+        while batch:
+            await loop.run_in_executor(None, self._write, batch)
+            batch = self._take()
+
+    async def close(self):
+        # The drain task is stopped rather than cancelled: a batch already
+        # handed to the executor keeps running, so the task finishes it and
+        # the queue behind it before the sink is closed.
+        self._closed = True
+        if self._task is not None:
+            self._event.set()
+            await self._task
+        await self.flush()
+        await asyncio.get_running_loop().run_in_executor(None, self._close_sink)
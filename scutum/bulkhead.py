@@ -0,0 +1,124 @@
+import asyncio
+import inspect
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from scutum.types import Rule
+from scutum.response import Response
+from scutum.deadline import OPEN, CLOSED
+from scutum.exceptions import BulkheadFullException
+
+REJECT = "reject"
+
+class Bulkhead:
+    # At most ``max_concurrent`` rule calls run at once. Up to ``max_queue``
+    # more wait their turn in arrival order, for at most ``queue_timeout``
+    # seconds. Past that a check is rejected: ``on_full`` either raises
+    # BulkheadFullException or answers with an open or closed fallback.
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_queue: int = 0,
+        queue_timeout: Optional[float] = None,
+        on_full: str = REJECT,
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if on_full not in (REJECT, OPEN, CLOSED):
+            raise ValueError(f"Unknown on_full behavior: '{on_full}'")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.on_full = on_full
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_queue_depth = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._fallback = None
+        if on_full != REJECT:
+            allowed = on_full == OPEN
+            self._fallback = Response(
+                allowed, "Authorization backend is saturated", 200 if allowed else 503, fallback=True
+            )
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def fallback(self) -> Optional[Response]:
+        return self._fallback
+
+    async def call(self, rule: Rule, *args, **kwargs) -> Any:
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+        elif not await self._wait():
+            return self._full()
+        try:
+            result = rule(*args, **kwargs)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        finally:
+            self.completed += 1
+            self._release()
+
+    async def _wait(self) -> bool:
+        if len(self._waiters) >= self.max_queue:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        try:
+            if self.queue_timeout is None:
+                await waiter
+            else:
+                await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+            return True
+        except asyncio.TimeoutError:
+            if self._abandon(waiter):
+                return True
+            self.timed_out += 1
+            return False
+        except BaseException:
+            if self._abandon(waiter):
+                self._release()
+            raise
+
+    def _abandon(self, waiter: asyncio.Future) -> bool:
+        # True when the slot was handed over before the waiter gave up.
+        if waiter.done() and not waiter.cancelled():
+            return True
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        return False
+
+    def _release(self):
+        # A finished call hands its slot straight to the oldest waiter, so
+        # in_flight only drops when nobody is queued.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _full(self) -> Response:
+        self.rejected += 1
+        if self._fallback is None:
+            raise BulkheadFullException()
+        return self._fallback
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
@@ -0,0 +1,287 @@
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
+from time import monotonic, time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from scutum.response import Response
+from scutum.abilities import CACHE_KEY
+
+MISSING = object()
+
+def default_subject_key(user: Any) -> Hashable:
+    return getattr(user, "id", user)
+
+def default_resource_key(*args, **kwargs) -> Hashable:
+    key = tuple(getattr(arg, "id", arg) for arg in args)
+    if kwargs:
+        key += tuple(sorted(kwargs.items()))
+    return key
+
+def uncached(rule):
+    rule._cacheable = False
+    return rule
+
+class DecisionCache:
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: Optional[float] = None,
+        rule_ttls: Optional[Dict[str, float]] = None,
+        subject_key: Callable[[Any], Hashable] = default_subject_key,
+        resource_key: Callable[..., Hashable] = default_resource_key,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.rule_ttls = dict(rule_ttls or {})
+        self.subject_key = subject_key
+        self.resource_key = resource_key
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        self._entries: "OrderedDict[Tuple, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = Lock()
+
+    def key(self, rule: str, user: Any, *args, **kwargs) -> Optional[Tuple]:
+        key = (rule, self.subject_key(user), self.resource_key(*args, **kwargs))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key: Tuple) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+    def set(self, key: Tuple, value: Any, generation: Optional[int] = None):
+        ttl = self.rule_ttls.get(key[0], self.ttl)
+        expires = monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, rule: Optional[str] = None, scope: Optional[str] = None, user: Any = MISSING):
+        prefix = f"{scope}:" if scope is not None else None
+        subject = self.subject_key(user) if user is not MISSING else MISSING
+        with self._lock:
+            for key in list(self._entries):
+                # Ability maps cover many rules, so any targeted invalidation
+                # drops them for the matching subjects.
+                if key[0] != CACHE_KEY:
+                    if rule is not None and key[0] != rule:
+                        continue
+                    if prefix is not None and not key[0].startswith(prefix):
+                        continue
+                if subject is not MISSING and key[1] != subject:
+                    continue
+                del self._entries[key]
+            self.generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+_MAGIC = b"scutum02"
+_HEADER = struct.Struct("<8sQQ")
+_GENERATION = struct.Struct("<Q")
+_GENERATION_OFFSET = 16
+_CRC = struct.Struct("<I")
+_SLOT = struct.Struct("<16sQdBBHB64s")
+_SLOT_SIZE = _CRC.size + _SLOT.size
+_EMPTY, _BOOL, _RESPONSE = 0, 1, 2
+_STABLE_TYPES = frozenset((str, int, float, bool, bytes, type(None)))
+
+def _is_stable(value: Any) -> bool:
+    if type(value) is tuple:
+        for item in value:
+            if not _is_stable(item):
+                return False
+        return True
+    return type(value) in _STABLE_TYPES
+
+class SharedDecisionCache(DecisionCache):
+    # A fixed-size hash table in shared memory, read and written by every
+    # process that maps it. Slots are ``ways`` to a bucket and carry a CRC, so
+    # a slot torn by two concurrent writers reads as a miss instead of a wrong
+    # decision. Bumping the shared generation invalidates every slot at once.
+    # Expiry times are wall-clock, so they stay meaningful in a file that
+    # outlives a reboot or is mapped on another host.
+    def __init__(
+        self,
+        slots: int = 65536,
+        ttl: Optional[float] = None,
+        rule_ttls: Optional[Dict[str, float]] = None,
+        subject_key: Callable[[Any], Hashable] = default_subject_key,
+        resource_key: Callable[..., Hashable] = default_resource_key,
+        path: Optional[str] = None,
+        ways: int = 4,
+    ):
+        if slots < ways or slots % ways:
+            raise ValueError("slots must be a positive multiple of ways")
+        self.maxsize = slots
+        self.ttl = ttl
+        self.rule_ttls = dict(rule_ttls or {})
+        self.subject_key = subject_key
+        self.resource_key = resource_key
+        self.path = path
+        self.ways = ways
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._buckets = slots // ways
+        self._buffer = self._map(_HEADER.size + slots * _SLOT_SIZE)
+        magic, size, _ = _HEADER.unpack_from(self._buffer, 0)
+        if magic == b"\0" * 8:
+            self._buffer[0:16] = _MAGIC + struct.pack("<Q", slots)
+        elif magic != _MAGIC or size != slots:
+            raise ValueError(f"{path} holds a different decision cache layout")
+
+    def _map(self, size: int) -> mmap.mmap:
+        if self.path is None:
+            return mmap.mmap(-1, size)
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if os.fstat(descriptor).st_size < size:
+                os.ftruncate(descriptor, size)
+            return mmap.mmap(descriptor, size)
+        finally:
+            os.close(descriptor)
+
+    @property
+    def generation(self) -> int:
+        return _GENERATION.unpack_from(self._buffer, _GENERATION_OFFSET)[0]
+
+    def _bump_generation(self):
+        _GENERATION.pack_into(self._buffer, _GENERATION_OFFSET, self.generation + 1)
+
+    def key(self, rule: str, user: Any, *args, **kwargs) -> Optional[Tuple[str, bytes, int]]:
+        key = (rule, self.subject_key(user), self.resource_key(*args, **kwargs))
+        if not _is_stable(key):
+            return None
+        digest = blake2b(repr(key).encode(), digest_size=16).digest()
+        bucket = int.from_bytes(digest[:8], "little") % self._buckets
+        return rule, digest, _HEADER.size + bucket * self.ways * _SLOT_SIZE
+
+    def _read(self, offset: int) -> Optional[tuple]:
+        data = self._buffer[offset:offset + _SLOT_SIZE]
+        if _CRC.unpack_from(data)[0] != zlib.crc32(data[_CRC.size:]):
+            return None
+        return _SLOT.unpack_from(data, _CRC.size)
+
+    def get(self, key: Tuple[str, bytes, int]) -> Any:
+        _, digest, offset = key
+        buffer = self._buffer
+        generation = _GENERATION.unpack_from(buffer, _GENERATION_OFFSET)[0]
+        for _ in range(self.ways):
+            data = buffer[offset:offset + _SLOT_SIZE]
+            if data[_CRC.size:_CRC.size + 16] == digest:
+                if _CRC.unpack_from(data)[0] == zlib.crc32(data[_CRC.size:]):
+                    _, slot_generation, expires, kind, allowed, status_code, length, message = _SLOT.unpack_from(data, _CRC.size)
+                    if slot_generation == generation and (not expires or expires > time()):
+                        self.hits += 1
+                        if kind == _BOOL:
+                            return bool(allowed)
+                        if allowed:
+                            return Response.allow(message[:length].decode(), status_code)
+                        return Response.deny(message[:length].decode(), status_code)
+                break
+            offset += _SLOT_SIZE
+        self.misses += 1
+        return MISSING
+
+    def _encode(self, value: Any) -> Optional[tuple]:
+        if isinstance(value, bool):
+            return _BOOL, value, 0, b""
+        if type(value) is Response and value.fallback:
+            return None
+        if type(value) is Response and isinstance(value.allowed, bool) and 0 <= value.status_code < 65536:
+            message = str(value.message).encode()
+            if len(message) <= 64:
+                return _RESPONSE, value.allowed, value.status_code, message
+        return None
+
+    def set(self, key: Tuple[str, bytes, int], value: Any, generation: Optional[int] = None):
+        current = self.generation
+        if generation is not None and generation != current:
+            return
+        encoded = self._encode(value)
+        if encoded is None:
+            return
+        kind, allowed, status_code, message = encoded
+        ttl = self.rule_ttls.get(key[0], self.ttl)
+        expires = time() + ttl if ttl is not None else 0.0
+        _, digest, start = key
+        payload = _SLOT.pack(digest, current, expires, kind, allowed, status_code, len(message), message)
+        offset = self._victim(digest, start, current)
+        self._buffer[offset:offset + _SLOT_SIZE] = _CRC.pack(zlib.crc32(payload)) + payload
+
+    def _victim(self, digest: bytes, start: int, generation: int) -> int:
+        free = None
+        now = time()
+        for way in range(self.ways):
+            offset = start + way * _SLOT_SIZE
+            slot = self._read(offset)
+            if slot is not None and slot[0] == digest:
+                return offset
+            if free is None and (slot is None or slot[1] != generation or (slot[2] and slot[2] <= now)):
+                free = offset
+        if free is not None:
+            return free
+        self.evictions += 1
+        return start + digest[8] % self.ways * _SLOT_SIZE
+
+    def invalidate(self, rule: Optional[str] = None, scope: Optional[str] = None, user: Any = MISSING):
+        # Slots hold key digests, so decisions cannot be told apart by rule or
+        # user: every invalidation drops every shared decision. The filters
+        # are accepted so this cache can stand in for a DecisionCache.
+        self._bump_generation()
+
+    def clear(self):
+        self._bump_generation()
+
+    def close(self):
+        self._buffer.close()
+
+    def stats(self) -> Dict[str, int]:
+        generation = self.generation
+        now = time()
+        size = 0
+        for offset in range(_HEADER.size, len(self._buffer), _SLOT_SIZE):
+            slot = self._read(offset)
+            if slot is not None and slot[3] != _EMPTY and slot[1] == generation and (not slot[2] or slot[2] > now):
+                size += 1
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": size,
+        }
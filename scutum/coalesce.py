@@ -0,0 +1,102 @@
+import asyncio
+import inspect
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from scutum.types import Rule
+from scutum.cache import default_resource_key, default_subject_key
+
+class _Pending:
+    __slots__ = ("user", "resources", "futures", "keys")
+
+    def __init__(self, user: Any):
+        self.user = user
+        self.resources: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.keys: List[Hashable] = []
+
+class Coalescer:
+    # Checks of the same rule, user and extra arguments that arrive within one
+    # event loop tick are answered by a single call to the rule's ``@batch``
+    # loader. A check identical to one still in flight awaits the same future.
+    def __init__(
+        self,
+        max_batch: Optional[int] = None,
+        subject_key: Callable[[Any], Hashable] = default_subject_key,
+        resource_key: Callable[..., Hashable] = default_resource_key,
+    ):
+        self.max_batch = max_batch
+        self.subject_key = subject_key
+        self.resource_key = resource_key
+        self.checks = 0
+        self.batches = 0
+        self.deduplicated = 0
+        self._pending: Dict[Hashable, _Pending] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def load(self, name: str, loader: Rule, user: Any, resource: Any, *args, **kwargs) -> Any:
+        self.checks += 1
+        group = (name, self.subject_key(user), self.resource_key(*args, **kwargs))
+        key = (group, self.resource_key(resource))
+        try:
+            hash(key)
+        except TypeError:
+            self.batches += 1
+            results = await _resolve(loader(user, [resource], *args, **kwargs))
+            return list(results)[0]
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            return await asyncio.shield(future)
+
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(group)
+        if pending is None:
+            pending = self._pending[group] = _Pending(user)
+            loop.call_soon(self._dispatch, group, loader, args, kwargs)
+        future = self._inflight[key] = loop.create_future()
+        pending.resources.append(resource)
+        pending.futures.append(future)
+        pending.keys.append(key)
+        return await asyncio.shield(future)
+
+    def _dispatch(self, group: Hashable, loader: Rule, args: Tuple, kwargs: Dict[str, Any]):
+        pending = self._pending.pop(group)
+        size = self.max_batch or len(pending.resources)
+        for start in range(0, len(pending.resources), size):
+            asyncio.ensure_future(self._run(
+                loader,
+                pending.user,
+                pending.resources[start:start + size],
+                pending.futures[start:start + size],
+                pending.keys[start:start + size],
+                args,
+                kwargs,
+            ))
+
+    async def _run(self, loader: Rule, user: Any, resources: List[Any], futures: List[asyncio.Future], keys: List[Hashable], args: Tuple, kwargs: Dict[str, Any]):
+        self.batches += 1
+        try:
+            results = list(await _resolve(loader(user, resources, *args, **kwargs)))
+            if len(results) != len(resources):
+                raise ValueError(f"Batch loader returned {len(results)} results for {len(resources)} resources")
+        except Exception as exception:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exception)
+                    future.exception()
+        else:
+            for future, result in zip(futures, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            for key, future in zip(keys, futures):
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"checks": self.checks, "batches": self.batches, "deduplicated": self.deduplicated}
+
+async def _resolve(result: Any) -> Any:
+    if inspect.isawaitable(result):
+        return await result
+    return result
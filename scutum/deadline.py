@@ -0,0 +1,125 @@
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic
+from typing import ContextManager, Dict, Iterator, Optional
+from scutum.response import Response
+
+OPEN = "open"
+CLOSED = "closed"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("scutum_deadline", default=None)
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    expires = monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    expires = _deadline.get()
+    return None if expires is None else expires - monotonic()
+
+def _by_prefix(values: Dict[str, object], path: str, default):
+    while path:
+        if path in values:
+            return values[path]
+        path = path.rpartition(":")[0]
+    return default
+
+class Deadlines:
+    # ``timeout`` is the budget of one check, or of a whole ``any``/``all``/
+    # ``none`` call. ``rule_timeouts`` and ``fallbacks`` are keyed by rule path
+    # or scope path, and the longest matching prefix wins. Sync rules on a
+    # ``Gate`` run in ``executor`` whenever a timeout applies to them. A rule
+    # that hangs keeps its thread after the check gives up, so
+    # ``max_workers_per_scope`` caps the threads one scope may hold; past it
+    # the scope's checks get their fallback without taking another thread.
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        rule_timeouts: Optional[Dict[str, float]] = None,
+        fallback: str = CLOSED,
+        fallbacks: Optional[Dict[str, str]] = None,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        max_workers_per_scope: Optional[int] = None,
+    ):
+        for mode in [fallback, *(fallbacks or {}).values()]:
+            if mode not in (OPEN, CLOSED):
+                raise ValueError(f"Unknown fallback: '{mode}'")
+        self.timeout = timeout
+        self.rule_timeouts = dict(rule_timeouts or {})
+        self.fallback = fallback
+        self.fallbacks = dict(fallbacks or {})
+        self.max_workers = max_workers
+        self.max_workers_per_scope = max_workers_per_scope
+        self.timeouts = 0
+        self._executor = executor
+        self._owned = False
+        self._rule_timeouts: Dict[str, Optional[float]] = {}
+        self._responses: Dict[str, Response] = {}
+        self._busy: Dict[str, int] = {}
+        self._busy_lock = Lock()
+
+    def budget(self) -> ContextManager:
+        if self.timeout is None:
+            return nullcontext()
+        return deadline(self.timeout)
+
+    def timeout_for(self, rule: str) -> Optional[float]:
+        if rule in self._rule_timeouts:
+            timeout = self._rule_timeouts[rule]
+        else:
+            timeout = self._rule_timeouts[rule] = _by_prefix(self.rule_timeouts, rule, self.timeout)
+        left = remaining()
+        if left is None:
+            return timeout
+        return left if timeout is None else min(timeout, left)
+
+    def fallback_for(self, rule: str) -> Response:
+        self.timeouts += 1
+        response = self._responses.get(rule)
+        if response is None:
+            allowed = _by_prefix(self.fallbacks, rule, self.fallback) == OPEN
+            response = self._responses[rule] = Response.timeout(allowed)
+        return response
+
+    def acquire(self, rule: str) -> bool:
+        if self.max_workers_per_scope is None:
+            return True
+        scope = rule.rpartition(":")[0] or rule
+        with self._busy_lock:
+            busy = self._busy.get(scope, 0)
+            if busy >= self.max_workers_per_scope:
+                return False
+            self._busy[scope] = busy + 1
+        return True
+
+    def release(self, rule: str):
+        if self.max_workers_per_scope is None:
+            return
+        scope = rule.rpartition(":")[0] or rule
+        with self._busy_lock:
+            busy = self._busy[scope] - 1
+            if busy:
+                self._busy[scope] = busy
+            else:
+                del self._busy[scope]
+
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._owned = True
+        return self._executor
+
+    def shutdown(self, wait: bool = True):
+        if self._owned:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+            self._owned = False
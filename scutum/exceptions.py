@@ -9,4 +9,12 @@ class RuleNotFoundException(Exception):
 
 class ScopeNotFoundException(Exception):
     def __init__(self, message="Scope not found", *args):
-        super().__init__(message, *args)
\ No newline at end of file
+        super().__init__(message, *args)
+
+class FrozenGateException(Exception):
+    def __init__(self, message="Gate is frozen", *args):
+        super().__init__(message, *args)
+
+class BulkheadFullException(Exception):
+    def __init__(self, message="Too many concurrent authorization checks", *args):
+        super().__init__(message, *args)
@@ -1,9 +1,17 @@
 from typing import Any, Callable
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from scutum import AsyncGate
+from scutum.memo import AsyncRequestMemo
 
-def create_api_gate(user_resolver: Callable):
-    gate = AsyncGate()
+def create_api_gate(user_resolver: Callable, **options):
+    gate = AsyncGate(**options)
+
+    def request_memo(request: Request) -> AsyncRequestMemo:
+        memo = getattr(request.state, "scutum_memo", None)
+        if memo is None:
+            memo = AsyncRequestMemo(gate)
+            request.state.scutum_memo = memo
+        return memo
 
     def authorized_user_factory(
         rule: str,
@@ -12,11 +20,15 @@ def create_api_gate(user_resolver: Callable):
         *args,
         **kwargs
     ) -> AsyncGate:
-        async def dependency(user: Any = Depends(user_resolver)):
-            if await gate.denied(rule, user, *args, **kwargs):
+        async def dependency(
+            user: Any = Depends(user_resolver),
+            memo: AsyncRequestMemo = Depends(request_memo),
+        ):
+            if await memo.denied(rule, user, *args, **kwargs):
                 raise HTTPException(status_code=status, detail=message)
             return user
         return dependency
 
     gate.authorized_user = authorized_user_factory
+    gate.request_memo = request_memo
     return gate
@@ -1,6 +1,7 @@
 from scutum import Gate
-from typing import Callable, Optional
-from flask import Flask, Response
+from scutum.memo import RequestMemo
+from typing import Any, Callable, Dict, Optional
+from flask import Flask, Response, g, has_request_context
 from functools import wraps
 
 class Scutum:
@@ -8,9 +9,10 @@ class Scutum:
         self,
         app: Flask = None,
         user_resolver: Optional[Callable] = None,
-        default_response: Response = Response("Unauthorized", status=403)
+        default_response: Response = Response("Unauthorized", status=403),
+        **gate_options
     ):
-        self._gate = Gate()
+        self._gate = Gate(**gate_options)
         self._response = default_response
 
         self._user_resolver = self._default_resolver
@@ -35,12 +37,38 @@ class Scutum:
     def _default_resolver(self, *args, **kwargs):
         raise NotImplementedError("User resolver function not implemented")
 
+    def current_user(self, *args, **kwargs):
+        if not has_request_context():
+            return self._user_resolver(*args, **kwargs)
+        if "_scutum_user" not in g:
+            g._scutum_user = self._user_resolver(*args, **kwargs)
+        return g._scutum_user
+
+    def memo(self) -> RequestMemo:
+        if not has_request_context():
+            return RequestMemo(self._gate)
+        if "_scutum_memo" not in g:
+            g._scutum_memo = RequestMemo(self._gate)
+        return g._scutum_memo
+
+    def memo_stats(self) -> Dict[str, int]:
+        return self.memo().stats()
+
+    def check(self, rule: str, user: Any, *args, **kwargs):
+        return self.memo().check(rule, user, *args, **kwargs)
+
+    def allowed(self, rule: str, user: Any, *args, **kwargs) -> bool:
+        return self.memo().allowed(rule, user, *args, **kwargs)
+
+    def denied(self, rule: str, user: Any, *args, **kwargs) -> bool:
+        return self.memo().denied(rule, user, *args, **kwargs)
+
     def authorized(self, rule: str):
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
-                user = self._user_resolver(*args, **kwargs)
-                if self._gate.denied(rule, user, *args, **kwargs):
+                user = self.current_user(*args, **kwargs)
+                if self.denied(rule, user, *args, **kwargs):
                     return self._response
                 return func(*args, **kwargs)
             return wrapper
@@ -50,9 +78,9 @@ class Scutum:
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
-                user = self._user_resolver(*args, **kwargs)
-                if self._gate.none(rules, user, *args, **kwargs):
+                user = self.current_user(*args, **kwargs)
+                if self.memo().none(rules, user, *args, **kwargs):
                     return self._response
                 return func(*args, **kwargs)
             return wrapper
-        return decorator
\ No newline at end of file
+        return decorator
@@ -0,0 +1,233 @@
+import operator
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+class Predicate:
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        return Not(self)
+
+class Always(Predicate):
+    def __init__(self, value: bool):
+        self.value = value
+
+    def __repr__(self):
+        return "ALLOW_ALL" if self.value else "DENY_ALL"
+
+ALLOW_ALL = Always(True)
+DENY_ALL = Always(False)
+
+class Condition(Predicate):
+    def __init__(self, field: str, op: str, value: Any):
+        self.field = field
+        self.op = op
+        self.value = value
+
+    def __repr__(self):
+        return f"{self.field} {self.op} {self.value!r}"
+
+class And(Predicate):
+    def __init__(self, *predicates: Predicate):
+        self.predicates = predicates
+
+    def __repr__(self):
+        return "(" + " AND ".join(map(repr, self.predicates)) + ")"
+
+class Or(Predicate):
+    def __init__(self, *predicates: Predicate):
+        self.predicates = predicates
+
+    def __repr__(self):
+        return "(" + " OR ".join(map(repr, self.predicates)) + ")"
+
+class Not(Predicate):
+    def __init__(self, predicate: Predicate):
+        self.predicate = predicate
+
+    def __repr__(self):
+        return f"NOT {self.predicate!r}"
+
+class Field:
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, value: Any) -> Condition:
+        return Condition(self.name, "=", value)
+
+    def __ne__(self, value: Any) -> Condition:
+        return Condition(self.name, "!=", value)
+
+    def __lt__(self, value: Any) -> Condition:
+        return Condition(self.name, "<", value)
+
+    def __le__(self, value: Any) -> Condition:
+        return Condition(self.name, "<=", value)
+
+    def __gt__(self, value: Any) -> Condition:
+        return Condition(self.name, ">", value)
+
+    def __ge__(self, value: Any) -> Condition:
+        return Condition(self.name, ">=", value)
+
+    def in_(self, values: Iterable[Any]) -> Condition:
+        return Condition(self.name, "in", tuple(values))
+
+    __hash__ = None
+
+_OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+def to_sql(predicate: Predicate) -> Tuple[str, List[Any]]:
+    if isinstance(predicate, Always):
+        return ("1 = 1" if predicate.value else "1 = 0"), []
+    if isinstance(predicate, (And, Or)):
+        if not predicate.predicates:
+            return to_sql(Always(isinstance(predicate, And)))
+        joiner = " AND " if isinstance(predicate, And) else " OR "
+        clauses, params = [], []
+        for child in predicate.predicates:
+            clause, child_params = to_sql(child)
+            clauses.append(f"({clause})")
+            params += child_params
+        return joiner.join(clauses), params
+    if isinstance(predicate, Not):
+        clause, params = to_sql(predicate.predicate)
+        return f"NOT ({clause})", params
+    if isinstance(predicate, Condition):
+        column = _quote(predicate.field)
+        if predicate.op == "in":
+            # None in the list matches NULL, as ``== None`` does.
+            values = [value for value in predicate.value if value is not None]
+            clauses = [f"{column} IN ({', '.join('?' for _ in values)})"] if values else []
+            if len(values) < len(predicate.value):
+                clauses.append(f"{column} IS NULL")
+            if not clauses:
+                return "1 = 0", []
+            return " OR ".join(clauses), values
+        if predicate.value is None and predicate.op in ("=", "!="):
+            return f"{column} IS {'NULL' if predicate.op == '=' else 'NOT NULL'}", []
+        return f"{column} {predicate.op} ?", [predicate.value]
+    raise TypeError(f"Unsupported predicate: {predicate!r}")
+
+def _all(checks: List[Callable[[Any], Optional[bool]]], record: Any) -> Optional[bool]:
+    result = True
+    for check in checks:
+        value = check(record)
+        if value is False:
+            return False
+        if value is None:
+            result = None
+    return result
+
+def _any(checks: List[Callable[[Any], Optional[bool]]], record: Any) -> Optional[bool]:
+    result = False
+    for check in checks:
+        value = check(record)
+        if value is True:
+            return True
+        if value is None:
+            result = None
+    return result
+
+def compile_predicate(predicate: Predicate, getter: Callable[[Any, str], Any]) -> Callable[[Any], Optional[bool]]:
+    # Follows SQL's three-valued logic so a predicate selects the same records
+    # in memory as in the database: a comparison with None is unknown (None)
+    # rather than True or False, NOT keeps it unknown, and only records whose
+    # predicate is True are kept. ``== None`` and ``!= None`` are IS NULL and
+    # IS NOT NULL, as in ``to_sql``.
+    if isinstance(predicate, Always):
+        value = predicate.value
+        return lambda record: value
+    if isinstance(predicate, (And, Or)):
+        checks = [compile_predicate(child, getter) for child in predicate.predicates]
+        combine = _all if isinstance(predicate, And) else _any
+        return lambda record: combine(checks, record)
+    if isinstance(predicate, Not):
+        check = compile_predicate(predicate.predicate, getter)
+
+        def negate(record: Any) -> Optional[bool]:
+            value = check(record)
+            return None if value is None else not value
+        return negate
+    if isinstance(predicate, Condition):
+        field, value = predicate.field, predicate.value
+        if predicate.op == "in":
+            if not value:
+                return lambda record: False
+            values = set(item for item in value if item is not None)
+            null = len(values) < len(value)
+
+            def contains(record: Any) -> Optional[bool]:
+                current = getter(record, field)
+                if current is None:
+                    return True if null else None
+                return current in values
+            return contains
+        if value is None and predicate.op in ("=", "!="):
+            if predicate.op == "=":
+                return lambda record: getter(record, field) is None
+            return lambda record: getter(record, field) is not None
+        compare = _OPERATORS[predicate.op]
+
+        def condition(record: Any) -> Optional[bool]:
+            current = getter(record, field)
+            if current is None or value is None:
+                return None
+            return compare(current, value)
+        return condition
+    raise TypeError(f"Unsupported predicate: {predicate!r}")
+
+def _item(record: Any, field: str) -> Any:
+    return record[field]
+
+def filter_records(predicate: Predicate, records: Iterable[Any]) -> List[Any]:
+    records = list(records)
+    if not records:
+        return records
+    getter = _item if hasattr(type(records[0]), "__getitem__") else getattr
+    check = compile_predicate(predicate, getter)
+    return [record for record in records if check(record) is True]
+
+class RecordSource:
+    def __init__(self, records: Iterable[Any]):
+        self._records = records
+
+    def records(self) -> Iterable[Any]:
+        return self._records
+
+    def apply(self, predicate: Predicate) -> List[Any]:
+        return filter_records(predicate, self._records)
+
+class SQLSource:
+    def __init__(self, connection, table: str, columns: Sequence[str] = ("*",)):
+        self.connection = connection
+        self.table = table
+        self.columns = columns
+
+    def _select(self) -> str:
+        columns = ", ".join(column if column == "*" else _quote(column) for column in self.columns)
+        return f"SELECT {columns} FROM {_quote(self.table)}"
+
+    def query(self, predicate: Predicate) -> Tuple[str, List[Any]]:
+        clause, params = to_sql(predicate)
+        return f"{self._select()} WHERE {clause}", params
+
+    def records(self) -> List[Any]:
+        return self.connection.execute(self._select()).fetchall()
+
+    def apply(self, predicate: Predicate) -> List[Any]:
+        sql, params = self.query(predicate)
+        return self.connection.execute(sql, params).fetchall()
@@ -1,14 +1,172 @@
 import asyncio
-from typing import Union, List, Any, Tuple
+import inspect
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
+from contextvars import copy_context
+from importlib import import_module
+from time import perf_counter
+from typing import Union, List, Any, Dict, Tuple, Iterable, Optional, Awaitable, Callable
+from weakref import WeakSet
 from scutum.types import Rule
 from scutum.scope import Scope, AsyncScope
-from scutum.policy import Policy, AsyncPolicy
+from scutum.registry import FrozenRegistry, AsyncFrozenRegistry, BaseOverlayRegistry, OverlayRegistry, AsyncOverlayRegistry
+from scutum.policy import Policy, AsyncPolicy, BATCH, FILTER
 from scutum.response import Response
-from scutum.exceptions import AuthorizationException
+from scutum.stats import RuleStats
+from scutum.cache import DecisionCache, MISSING
+from scutum.metrics import Instrumentation, ALLOW, DENY, ERROR
+from scutum.offload import Offloader
+from scutum.deadline import Deadlines, _by_prefix
+from scutum.bulkhead import Bulkhead
+from scutum.audit import BaseAuditLog
+from scutum.coalesce import Coalescer
+from scutum.abilities import Abilities, CACHE_KEY, in_prefix, user_only_rules
+from scutum.filters import RecordSource
+from scutum.exceptions import AuthorizationException, FrozenGateException
+
+# Decisions travel as the True/False singletons or as a Response; the identity
+# tests come first because most rules return a plain bool.
+def _to_response(result: Any) -> Union[Response, bool]:
+    if result is True or result is False or isinstance(result, Response):
+        return result
+    return bool(result)
+
+def _is_fallback(response: Union[Response, bool]) -> bool:
+    return response is not True and response is not False and response.fallback
+
+def _is_allowed(response: Union[Response, bool]) -> bool:
+    if response is True or response is False:
+        return response
+    return response.allowed
+
+def _batch_results(results: Iterable[Any], resources: List[Any]) -> List[Any]:
+    # Decisions are matched to resources by position, so a loader that returns
+    # too few or too many would misattribute them.
+    results = list(results)
+    if len(results) != len(resources):
+        raise ValueError(f"Batch loader returned {len(results)} results for {len(resources)} resources")
+    return results
+
+async def _resolve(result: Any) -> Any:
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+async def _first_with(checks: Iterable[Awaitable[bool]], value: bool) -> bool:
+    pending = {asyncio.ensure_future(check) for check in checks}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.result() is value:
+                    return True
+        return False
+    finally:
+        for task in pending:
+            task.cancel()
+
+def _rule_index(root) -> Dict[str, Tuple[Rule, bool]]:
+    if isinstance(root, BaseOverlayRegistry):
+        return {**root._base._index, **root._index}
+    return root._index
+
+def _mask_rules(root) -> Dict[str, Tuple[Any, Tuple[Tuple[int, int], ...]]]:
+    # RoleRegistry rules by path, so Gate.check can test the user's mask
+    # inline instead of calling the rule.
+    return {path: rule._rbac_words for path, (rule, _) in _rule_index(root).items() if hasattr(rule, "_rbac_words")}
+
+def _import_policy(target: str):
+    module_name, _, attribute = target.partition(":")
+    if not attribute:
+        module_name, _, attribute = target.rpartition(".")
+    return getattr(import_module(module_name), attribute)
 
 class Gate:
-    def __init__(self):
+    def __init__(
+        self,
+        order_rules: bool = False,
+        cache: Optional[DecisionCache] = None,
+        metrics: Optional[Instrumentation] = None,
+        deadlines: Optional[Deadlines] = None,
+        audit: Optional[BaseAuditLog] = None,
+    ):
         self._root = Scope("root")
+        self._rule_stats = RuleStats() if order_rules else None
+        self._cache = cache
+        self._metrics = metrics
+        self._deadlines = deadlines
+        self._audit = audit
+        self._user_only: Dict[Optional[str], List[Tuple[str, Rule]]] = {}
+        self._masks: Optional[Dict[str, Tuple[Any, Tuple[Tuple[int, int], ...]]]] = None
+        self._overlays: "WeakSet[Gate]" = WeakSet()
+        self._seen = (self._root._index, self._root._patterns)
+
+    @property
+    def cache(self) -> Optional[DecisionCache]:
+        return self._cache
+
+    @property
+    def metrics(self) -> Optional[Instrumentation]:
+        return self._metrics
+
+    @property
+    def deadlines(self) -> Optional[Deadlines]:
+        return self._deadlines
+
+    @property
+    def audit(self) -> Optional[BaseAuditLog]:
+        return self._audit
+
+    @property
+    def frozen(self) -> bool:
+        return self._root.frozen
+
+    def freeze(self) -> "Gate":
+        if isinstance(self._root, OverlayRegistry):
+            self._root.freeze()
+        elif not self.frozen:
+            for name in list(self._root._lazy):
+                self._root.get_scope(name)
+            self._root = FrozenRegistry.from_scope(self._root)
+            self._invalidate_decisions()
+        return self
+
+    def overlay(self, **options) -> "Gate":
+        if isinstance(self._root, OverlayRegistry):
+            raise TypeError("Overlays must be created from a base gate, not from another overlay")
+        self.freeze()
+        gate = Gate(**options)
+        gate._root = OverlayRegistry(self._root)
+        self._overlays.add(gate)
+        return gate
+
+    def swap(self, other: "Gate") -> "Gate":
+        if not isinstance(other, Gate):
+            raise TypeError("swap expects a Gate")
+        if isinstance(self._root, BaseOverlayRegistry) or isinstance(other._root, BaseOverlayRegistry):
+            raise TypeError("Overlay gates cannot be swapped, swap or reload their base gate instead")
+        if other is self:
+            return self
+        if self.frozen:
+            other.freeze()
+        # The staging gate gives its registry away and starts over empty, so
+        # later writes to it cannot change this gate behind its caches.
+        self._root, other._root = other._root, Scope("root")
+        other._invalidate_decisions()
+        self._invalidate_decisions()
+        self._rebase_overlays()
+        return self
+
+    def _rebase_overlays(self):
+        # Tenants keep their own rules and see the new base from now on.
+        for overlay in list(self._overlays):
+            overlay._root._base = self._root
+            overlay._invalidate_decisions()
+
+    def reload(self, configure: Callable[["Gate"], Any]) -> "Gate":
+        staging = Gate()
+        configure(staging)
+        return self.swap(staging)
 
     def has_rule(self, name: str):
         return self._root.has_rule(name)
@@ -17,7 +175,34 @@ class Gate:
         return self._root.has_scope(name)
     
     def clear(self):
-        self._root = Scope("root")
+        if self.frozen:
+            raise FrozenGateException()
+        if isinstance(self._root, BaseOverlayRegistry):
+            self._root = OverlayRegistry(self._root._base)
+        else:
+            self._root = Scope("root")
+        self._invalidate_decisions()
+
+    def _writable(self):
+        # Checked before any lookup, so a frozen gate reports itself rather
+        # than a missing scope.
+        if self.frozen:
+            raise FrozenGateException()
+
+    def _invalidate_decisions(self):
+        self._seen = (self._root._index, self._root._patterns)
+        if self._cache is not None:
+            self._cache.clear()
+        self._user_only.clear()
+        self._masks = None
+
+    def _follow_registry(self):
+        # Scopes can be changed directly, not only through the gate. Every
+        # write publishes a new root index or pattern trie, so a new one means
+        # decisions derived from the old registry must go.
+        root, seen = self._root, self._seen
+        if root._index is not seen[0] or root._patterns is not seen[1]:
+            self._invalidate_decisions()
     
     def rules(self):
         return dict(self._root._rules)
@@ -29,6 +214,7 @@ class Gate:
         if not callable(rule):
             raise TypeError("Rule must be a callable")
         self._root.add_rule(name, rule)
+        self._invalidate_decisions()
             
     def _register_policy(self, name: str, policy: Policy):
         if not isinstance(policy, type) or not issubclass(policy, Policy):
@@ -40,9 +226,36 @@ class Gate:
             raise KeyError(f"A scope named {name} already exists")
         scope = policy._to_scope(name)
         self._root.add_scope(name, scope)
+        self._invalidate_decisions()
 
     def _call_rule(self, name: str, *args, **kwargs):
-        return self._root.call(name, *args, **kwargs)
+        if self._deadlines is None:
+            return self._root.call(name, *args, **kwargs)
+        return self._invoke(name, self._root.get_rule(name), *args, **kwargs)
+
+    def _invoke(self, name: str, rule: Rule, *args, **kwargs):
+        timeout = self._deadlines.timeout_for(name) if self._deadlines is not None else None
+        if timeout is None:
+            return rule(*args, **kwargs)
+        deadlines = self._deadlines
+        if timeout <= 0 or not deadlines.acquire(name):
+            return deadlines.fallback_for(name)
+        # The copied context carries contextvars, and so Flask's request and
+        # app context, into the worker thread.
+        try:
+            future = deadlines.executor().submit(copy_context().run, rule, *args, **kwargs)
+        except BaseException:
+            deadlines.release(name)
+            raise
+        future.add_done_callback(lambda _: deadlines.release(name))
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            return self._deadlines.fallback_for(name)
+
+    def _budget(self):
+        return self._deadlines.budget() if self._deadlines is not None else nullcontext()
 
     def scope(self, name: str):
         def decorator(scope: Scope):
@@ -51,9 +264,11 @@ class Gate:
         return decorator
         
     def add_scope(self, name: str, scope: Scope):
+        self._writable()
         if self._root.has_scope(name):
             raise KeyError(f"A scope named {name} already exists")
         self._root.add_scope(name, scope)
+        self._invalidate_decisions()
 
     def rule(self, name: str):
         def decorator(rule: Rule):
@@ -62,9 +277,16 @@ class Gate:
         return decorator
     
     def add_rule(self, name: str, rule: Rule):
+        self._writable()
         if self._root.has_rule(name):
             raise KeyError(f"A rule named {name} already exists")
         self._register_rule(name, rule)
+
+    def override_rule(self, name: str, rule: Rule):
+        self._writable()
+        if not self._root.has_rule(name):
+            raise KeyError(f"No rule named {name} to override")
+        self._register_rule(name, rule)
     
     def policy(self, name):
         def decorator(policy: Policy):
@@ -73,49 +295,239 @@ class Gate:
         return decorator
     
     def add_policy(self, name, policy):
+        self._writable()
         self._register_policy(name, policy)
+
+    def lazy_policy(self, name: str, target: str):
+        self._writable()
+        if self._root.has_scope(name):
+            raise KeyError(f"A scope named {name} already exists")
+        self._root.add_lazy(name, lambda: self._load_policy(name, target))
+        self._invalidate_decisions()
+
+    def _load_policy(self, name: str, target: str) -> Scope:
+        policy = _import_policy(target)
+        if not isinstance(policy, type) or not issubclass(policy, Policy):
+            raise TypeError(f"{target} must be a Policy class (not an instance)")
+        return policy._to_scope(name)
     
     def remove_rule(self, name: str):
         self._root.remove_rule(name)
+        self._invalidate_decisions()
 
     def remove_scope(self, name: str):
         self._root.remove_scope(name)
+        self._invalidate_decisions()
 
     def check(self, rule: str, user: Any, *args, **kwargs) -> Union[Response, bool]:
-        result = self._call_rule(rule, user, *args, **kwargs)
-        if isinstance(result, Response):
-            return result
-        return bool(result)
+        self._follow_registry()
+        if self._metrics is not None or self._audit is not None:
+            return self._measured_check(rule, user, *args, **kwargs)
+        if self._cache is not None:
+            return self._cached_check(rule, user, *args, **kwargs)
+        masks = self._masks
+        if masks is None:
+            masks = self._masks = _mask_rules(self._root) if self._deadlines is None else {}
+        if masks:
+            test = masks.get(rule)
+            if test is not None:
+                registry, words = test
+                user_mask = registry.user_mask(user)
+                for index, word in words:
+                    if user_mask[index] & word != word:
+                        return False
+                return True
+        return _to_response(self._call_rule(rule, user, *args, **kwargs))
+
+    def _measured_check(self, rule: str, user: Any, *args, **kwargs) -> Union[Response, bool]:
+        start = perf_counter()
+        try:
+            if self._cache is not None:
+                response = self._cached_check(rule, user, *args, **kwargs)
+            else:
+                response = _to_response(self._call_rule(rule, user, *args, **kwargs))
+        except Exception:
+            self._record(rule, user, perf_counter() - start, ERROR, None)
+            raise
+        self._record(rule, user, perf_counter() - start, ALLOW if _is_allowed(response) else DENY, response)
+        return response
 
-    def allowed(self, rule: str, user: Any, *args, **kwargs) -> bool:
-        response = self.check(rule, user, *args, **kwargs)
-        if isinstance(response, Response):
-            return response.allowed
+    def _record(self, rule: str, user: Any, elapsed: float, outcome: str, response: Union[Response, bool, None]):
+        if self._metrics is not None:
+            self._metrics.record(rule, elapsed, outcome)
+        if self._audit is not None:
+            self._audit.record(rule, user, elapsed, outcome, response)
+
+    def _record_many(self, rule: str, user: Any, elapsed: float, responses: List[Union[Response, bool]]):
+        # A batch is timed as a whole, so each decision gets an equal share.
+        if responses:
+            share = elapsed / len(responses)
+            for response in responses:
+                self._record(rule, user, share, ALLOW if _is_allowed(response) else DENY, response)
+
+    def _cached_check(self, rule: str, user: Any, *args, **kwargs) -> Union[Response, bool]:
+        generation = self._cache.generation
+        target = self._root.get_rule(rule)
+        if not getattr(target, "_cacheable", True):
+            return _to_response(self._invoke(rule, target, user, *args, **kwargs))
+
+        key = self._cache.key(rule, user, *args, **kwargs)
+        if key is None:
+            return _to_response(self._invoke(rule, target, user, *args, **kwargs))
+
+        response = self._cache.get(key)
+        if response is MISSING:
+            response = _to_response(self._invoke(rule, target, user, *args, **kwargs))
+            if not _is_fallback(response):
+                self._cache.set(key, response, generation)
         return response
 
+    def allowed(self, rule: str, user: Any, *args, **kwargs) -> bool:
+        return _is_allowed(self.check(rule, user, *args, **kwargs))
+
     def denied(self, rule: str, user: Any, *args, **kwargs) -> bool:
-        response = self.check(rule, user, *args, **kwargs)
-        if isinstance(response, Response):
-            return not response.allowed
-        return not response
+        return not _is_allowed(self.check(rule, user, *args, **kwargs))
     
     def authorize(self, rule: str, user: Any, *args, **kwargs) -> None:
         response = self.check(rule, user, *args, **kwargs)
-        if isinstance(response, Response):
-            response.authorize()
-
-        if isinstance(response, bool) and not response:
+        if response is False:
             raise AuthorizationException()
+        if response is not True:
+            response.authorize()
     
     def any(self, rules: List[str], user: Any, *args, **kwargs):
-        return any([self.allowed(rule, user, *args, **kwargs) for rule in rules])
+        with self._budget():
+            return self._any(self.allowed, rules, user, *args, **kwargs)
+
+    def _any(self, check: Callable[..., bool], rules: List[str], user: Any, *args, **kwargs):
+        # ``check`` is this gate's allowed or a request memo's, which shares
+        # the gate's rule ordering.
+        if self._rule_stats is None:
+            return any(check(rule, user, *args, **kwargs) for rule in rules)
+
+        for rule in self._rule_stats.order(rules):
+            start = perf_counter()
+            allowed = check(rule, user, *args, **kwargs)
+            self._rule_stats.record(rule, perf_counter() - start, allowed)
+            if allowed:
+                return True
+        return False
 
     def none(self, rules: List[str], user: Any, *args, **kwargs):
         return not self.any(rules, user, *args, **kwargs)
 
+    def all(self, rules: List[str], user: Any, *args, **kwargs):
+        with self._budget():
+            return all(self.allowed(rule, user, *args, **kwargs) for rule in rules)
+
+    def check_many(self, rule: str, user: Any, resources: Iterable[Any], *args, **kwargs) -> List[Union[Response, bool]]:
+        resources = list(resources)
+        self._follow_registry()
+        if self._metrics is None and self._audit is None:
+            return self._check_many(rule, user, resources, *args, **kwargs)
+        start = perf_counter()
+        try:
+            responses = self._check_many(rule, user, resources, *args, **kwargs)
+        except Exception:
+            self._record(rule, user, perf_counter() - start, ERROR, None)
+            raise
+        self._record_many(rule, user, perf_counter() - start, responses)
+        return responses
+
+    def _check_many(self, rule: str, user: Any, resources: List[Any], *args, **kwargs) -> List[Union[Response, bool]]:
+        root = self._root
+        batch = root.get_companion(rule, BATCH)
+        if batch is not None:
+            results = _batch_results(batch(user, resources, *args, **kwargs), resources)
+        else:
+            target = root.get_rule(rule)
+            results = [self._invoke(rule, target, user, resource, *args, **kwargs) for resource in resources]
+        return [_to_response(result) for result in results]
+
+    def allowed_many(self, rule: str, user: Any, resources: Iterable[Any], *args, **kwargs) -> List[bool]:
+        return [_is_allowed(response) for response in self.check_many(rule, user, resources, *args, **kwargs)]
+
+    def filter_allowed(self, rule: str, user: Any, resources: Iterable[Any], *args, **kwargs) -> List[Any]:
+        resources = list(resources)
+        decisions = self.allowed_many(rule, user, resources, *args, **kwargs)
+        return [resource for resource, allowed in zip(resources, decisions) if allowed]
+
+    def filter(self, rule: str, user: Any, source: Any, *args, **kwargs) -> List[Any]:
+        if not hasattr(source, "apply"):
+            source = RecordSource(source)
+        predicate_for = self._root.get_companion(rule, FILTER)
+        if predicate_for is None:
+            return self.filter_allowed(rule, user, source.records(), *args, **kwargs)
+        start = perf_counter()
+        records = source.apply(predicate_for(user, *args, **kwargs))
+        if self._metrics is not None or self._audit is not None:
+            self._record_many(rule, user, perf_counter() - start, [True] * len(records))
+        return records
+
+    def abilities(self, user: Any, prefix: Optional[str] = None, version_only: bool = False) -> Union[Abilities, str]:
+        self._follow_registry()
+        prefix = prefix.rstrip(":") or None if prefix else None
+        key = self._cache.key(CACHE_KEY, user, prefix) if self._cache is not None else None
+        abilities = self._cache.get(key) if key is not None else MISSING
+        if abilities is MISSING:
+            generation = self._cache.generation if self._cache is not None else None
+            rules = self._user_only_rules(prefix)
+            direct = self._metrics is None and self._audit is None and self._deadlines is None
+            allowed, settled = [], True
+            with self._budget():
+                for path, rule in rules:
+                    try:
+                        response = _to_response(rule(user)) if direct else self.check(path, user)
+                    except Exception:
+                        settled = False
+                        continue
+                    if _is_fallback(response):
+                        settled = False
+                    if _is_allowed(response):
+                        allowed.append(path)
+            abilities = Abilities(allowed)
+            if key is not None and settled:
+                self._cache.set(key, abilities, generation)
+        return abilities.version if version_only else abilities
+
+    def _user_only_rules(self, prefix: Optional[str]) -> List[Tuple[str, Rule]]:
+        rules = self._user_only.get(prefix)
+        if rules is None:
+            root = self._root
+            for name in list(getattr(root, "_lazy", ())):
+                if in_prefix(name, prefix) or in_prefix(prefix, name):
+                    root.get_scope(name)
+            rules = self._user_only[prefix] = user_only_rules(_rule_index(root), prefix)
+        return rules
+
 class AsyncGate:
-    def __init__(self):
+    def __init__(
+        self,
+        order_rules: bool = False,
+        batch_concurrency: Optional[int] = None,
+        cache: Optional[DecisionCache] = None,
+        metrics: Optional[Instrumentation] = None,
+        offload: Optional[Offloader] = None,
+        deadlines: Optional[Deadlines] = None,
+        audit: Optional[BaseAuditLog] = None,
+        coalesce: Optional[Coalescer] = None,
+        bulkheads: Optional[Dict[str, Bulkhead]] = None,
+    ):
         self._root = AsyncScope("root")
+        self._rule_stats = RuleStats() if order_rules else None
+        self.batch_concurrency = batch_concurrency
+        self._cache = cache
+        self._metrics = metrics
+        self._offload = offload
+        self._deadlines = deadlines
+        self._audit = audit
+        self._coalesce = coalesce
+        self._bulkheads = dict(bulkheads) if bulkheads else None
+        self._bulkhead_by_rule: Dict[str, Optional[Bulkhead]] = {}
+        self._loaders = {}
+        self._user_only: Dict[Optional[str], List[Tuple[str, Rule]]] = {}
+        self._overlays: "WeakSet[AsyncGate]" = WeakSet()
+        self._seen = (self._root._index, self._root._patterns)
         self._pending_rules: List[Tuple[str, Rule]] = []
         self._pending_scopes: List[Tuple[str, AsyncScope]] = []
         self._pending_policies: List[Tuple[str, AsyncPolicy]] = []
@@ -141,8 +553,110 @@ class AsyncGate:
     async def has_scope(self, name: str):
         return await self._root.has_scope(name)
 
+    @property
+    def cache(self) -> Optional[DecisionCache]:
+        return self._cache
+
+    @property
+    def metrics(self) -> Optional[Instrumentation]:
+        return self._metrics
+
+    @property
+    def offload(self) -> Optional[Offloader]:
+        return self._offload
+
+    @property
+    def deadlines(self) -> Optional[Deadlines]:
+        return self._deadlines
+
+    @property
+    def audit(self) -> Optional[BaseAuditLog]:
+        return self._audit
+
+    @property
+    def coalesce(self) -> Optional[Coalescer]:
+        return self._coalesce
+
+    @property
+    def bulkheads(self) -> Optional[Dict[str, Bulkhead]]:
+        return self._bulkheads
+
+    @property
+    def frozen(self) -> bool:
+        return self._root.frozen
+
+    async def freeze(self) -> "AsyncGate":
+        if isinstance(self._root, AsyncOverlayRegistry):
+            self._root.freeze()
+        elif not self.frozen:
+            await self.setup()
+            for name in list(self._root._lazy):
+                await self._root.get_scope(name)
+            self._root = AsyncFrozenRegistry.from_scope(self._root)
+            self._invalidate_decisions()
+        return self
+
+    async def overlay(self, **options) -> "AsyncGate":
+        if isinstance(self._root, AsyncOverlayRegistry):
+            raise TypeError("Overlays must be created from a base gate, not from another overlay")
+        await self.freeze()
+        gate = AsyncGate(**options)
+        gate._root = AsyncOverlayRegistry(self._root)
+        self._overlays.add(gate)
+        return gate
+
+    async def swap(self, other: "AsyncGate") -> "AsyncGate":
+        if not isinstance(other, AsyncGate):
+            raise TypeError("swap expects an AsyncGate")
+        if isinstance(self._root, BaseOverlayRegistry) or isinstance(other._root, BaseOverlayRegistry):
+            raise TypeError("Overlay gates cannot be swapped, swap or reload their base gate instead")
+        if other is self:
+            return self
+        await other.setup()
+        if self.frozen:
+            await other.freeze()
+        self._root, other._root = other._root, AsyncScope("root")
+        other._invalidate_decisions()
+        self._invalidate_decisions()
+        self._rebase_overlays()
+        return self
+
+    def _rebase_overlays(self):
+        for overlay in list(self._overlays):
+            overlay._root._base = self._root
+            overlay._invalidate_decisions()
+
+    async def reload(self, configure: Callable[["AsyncGate"], Any]) -> "AsyncGate":
+        staging = AsyncGate()
+        await _resolve(configure(staging))
+        return await self.swap(staging)
+
     def clear(self):
-        self._root = AsyncScope("root")
+        if self.frozen:
+            raise FrozenGateException()
+        if isinstance(self._root, BaseOverlayRegistry):
+            self._root = AsyncOverlayRegistry(self._root._base)
+        else:
+            self._root = AsyncScope("root")
+        self._invalidate_decisions()
+
+    def _writable(self):
+        if self.frozen:
+            raise FrozenGateException()
+
+    def _invalidate_decisions(self):
+        self._seen = (self._root._index, self._root._patterns)
+        if self._cache is not None:
+            self._cache.clear()
+        if self._offload is not None:
+            self._offload.reset()
+        self._loaders.clear()
+        self._user_only.clear()
+
+    def _follow_registry(self):
+        root, seen = self._root, self._seen
+        if root._index is not seen[0] or root._patterns is not seen[1]:
+            self._invalidate_decisions()
 
     def rules(self):
         return dict(self._root._rules)
@@ -154,6 +668,7 @@ class AsyncGate:
         if not callable(rule):
             raise TypeError("Rule must be a callable")
         await self._root.add_rule(name, rule)
+        self._invalidate_decisions()
 
     async def _register_policy(self, name: str, policy: AsyncPolicy):
         if not isinstance(policy, type) or not issubclass(policy, AsyncPolicy):
@@ -165,9 +680,70 @@ class AsyncGate:
             raise KeyError(f"A scope named {name} already exists")
         scope = policy._to_scope(name)
         await self._root.add_scope(name, await scope)
+        self._invalidate_decisions()
 
     async def _call_rule(self, name: str, *args, **kwargs):
-        return await self._root.call(name, *args, **kwargs)
+        if self._offload is None and self._deadlines is None and self._coalesce is None and self._bulkheads is None:
+            return await self._root.call(name, *args, **kwargs)
+        return await self._invoke(name, await self._root.get_rule(name), *args, **kwargs)
+
+    async def _invoke(self, name: str, rule: Rule, *args, **kwargs):
+        timeout = self._deadlines.timeout_for(name) if self._deadlines is not None else None
+        if timeout is None:
+            return await self._execute(name, rule, *args, **kwargs)
+        if timeout <= 0:
+            return self._deadlines.fallback_for(name)
+        try:
+            return await asyncio.wait_for(self._execute(name, rule, *args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            return self._deadlines.fallback_for(name)
+
+    async def _execute(self, name: str, rule: Rule, *args, **kwargs):
+        if self._coalesce is not None and len(args) >= 2:
+            loader = await self._batch_loader(name)
+            if loader is not None:
+                return await self._coalesce.load(name, loader, *args, **kwargs)
+        bulkhead = self._bulkhead(name)
+        if bulkhead is not None:
+            return await bulkhead.call(self._run, name, rule, *args, **kwargs)
+        return await self._run(name, rule, *args, **kwargs)
+
+    async def _run(self, name: str, rule: Rule, *args, **kwargs):
+        if self._offload is None:
+            return await _resolve(rule(*args, **kwargs))
+        return await self._offload.call(name, rule, *args, **kwargs)
+
+    def _bulkhead(self, name: str) -> Optional[Bulkhead]:
+        if self._bulkheads is None:
+            return None
+        bulkhead = self._bulkhead_by_rule.get(name, MISSING)
+        if bulkhead is MISSING:
+            bulkhead = self._bulkhead_by_rule[name] = _by_prefix(self._bulkheads, name, None)
+        return bulkhead
+
+    def _bounded_batch(self, name: str, batch: Rule) -> Rule:
+        bulkhead = self._bulkhead(name)
+        if bulkhead is None:
+            return batch
+
+        async def load(user, resources, *args, **kwargs):
+            results = await bulkhead.call(batch, user, resources, *args, **kwargs)
+            if results is bulkhead.fallback:
+                return [results] * len(resources)
+            return results
+        return load
+
+    async def _batch_loader(self, name: str) -> Optional[Rule]:
+        loader = self._loaders.get(name, MISSING)
+        if loader is MISSING:
+            loader = await self._root.get_companion(name, BATCH)
+            if loader is not None:
+                loader = self._bounded_batch(name, loader)
+            self._loaders[name] = loader
+        return loader
+
+    def _budget(self):
+        return self._deadlines.budget() if self._deadlines is not None else nullcontext()
     
     def scope(self, name: str):
         def decorator(scope: AsyncScope):
@@ -176,9 +752,11 @@ class AsyncGate:
         return decorator
 
     async def add_scope(self, name: str, scope: AsyncScope):
+        self._writable()
         if await self._root.has_scope(name):
             raise KeyError(f"A scope named {name} already exists")
         await self._root.add_scope(name, scope)
+        self._invalidate_decisions()
 
     def rule(self, name: str):
         def decorator(rule: Rule):
@@ -187,10 +765,17 @@ class AsyncGate:
         return decorator
 
     async def add_rule(self, name: str, rule: Rule):
+        self._writable()
         if await self._root.has_rule(name):
             raise KeyError(f"A rule named {name} already exists")
         await self._register_rule(name, rule)
 
+    async def override_rule(self, name: str, rule: Rule):
+        self._writable()
+        if not await self._root.has_rule(name):
+            raise KeyError(f"No rule named {name} to override")
+        await self._register_rule(name, rule)
+
     def policy(self, name: str):
         def decorator(policy: AsyncPolicy):
             self._pending_policies.append((name, policy))
@@ -198,44 +783,221 @@ class AsyncGate:
         return decorator
 
     async def add_policy(self, name: str, policy: AsyncPolicy):
+        self._writable()
         await self._register_policy(name, policy)
 
+    async def lazy_policy(self, name: str, target: str):
+        self._writable()
+        if await self._root.has_scope(name):
+            raise KeyError(f"A scope named {name} already exists")
+        await self._root.add_lazy(name, lambda: self._load_policy(name, target))
+        self._invalidate_decisions()
+
+    async def _load_policy(self, name: str, target: str) -> AsyncScope:
+        policy = _import_policy(target)
+        if not isinstance(policy, type) or not issubclass(policy, AsyncPolicy):
+            raise TypeError(f"{target} must be a AsyncPolicy class (not an instance)")
+        return await policy._to_scope(name)
+
     async def remove_rule(self, name: str):
         await self._root.remove_rule(name)
+        self._invalidate_decisions()
 
     async def remove_scope(self, name: str):
         await self._root.remove_scope(name)
+        self._invalidate_decisions()
 
     async def check(self, rule: str, user: Any, *args, **kwargs) -> Union[Response, bool]:
-        result = await self._call_rule(rule, user, *args, **kwargs)
-        if isinstance(result, Response):
-            return result
-        return bool(result)
+        self._follow_registry()
+        if self._metrics is not None or self._audit is not None:
+            return await self._measured_check(rule, user, *args, **kwargs)
+        if self._cache is not None:
+            return await self._cached_check(rule, user, *args, **kwargs)
+        return _to_response(await self._call_rule(rule, user, *args, **kwargs))
+
+    async def _measured_check(self, rule: str, user: Any, *args, **kwargs) -> Union[Response, bool]:
+        start = perf_counter()
+        try:
+            if self._cache is not None:
+                response = await self._cached_check(rule, user, *args, **kwargs)
+            else:
+                response = _to_response(await self._call_rule(rule, user, *args, **kwargs))
+        except Exception:
+            self._record(rule, user, perf_counter() - start, ERROR, None)
+            raise
+        self._record(rule, user, perf_counter() - start, ALLOW if _is_allowed(response) else DENY, response)
+        return response
 
-    async def allowed(self, rule: str, user: Any, *args, **kwargs) -> bool:
-        response = await self.check(rule, user, *args, **kwargs)
-        if isinstance(response, Response):
-            return response.allowed
+    def _record(self, rule: str, user: Any, elapsed: float, outcome: str, response: Union[Response, bool, None]):
+        if self._metrics is not None:
+            self._metrics.record(rule, elapsed, outcome)
+        if self._audit is not None:
+            self._audit.record(rule, user, elapsed, outcome, response)
+
+    def _record_many(self, rule: str, user: Any, elapsed: float, responses: List[Union[Response, bool]]):
+        if responses:
+            share = elapsed / len(responses)
+            for response in responses:
+                self._record(rule, user, share, ALLOW if _is_allowed(response) else DENY, response)
+
+    async def _cached_check(self, rule: str, user: Any, *args, **kwargs) -> Union[Response, bool]:
+        generation = self._cache.generation
+        target = await self._root.get_rule(rule)
+        if not getattr(target, "_cacheable", True):
+            return _to_response(await self._invoke(rule, target, user, *args, **kwargs))
+
+        key = self._cache.key(rule, user, *args, **kwargs)
+        if key is None:
+            return _to_response(await self._invoke(rule, target, user, *args, **kwargs))
+
+        response = self._cache.get(key)
+        if response is MISSING:
+            response = _to_response(await self._invoke(rule, target, user, *args, **kwargs))
+            if not _is_fallback(response):
+                self._cache.set(key, response, generation)
         return response
 
+    async def allowed(self, rule: str, user: Any, *args, **kwargs) -> bool:
+        return _is_allowed(await self.check(rule, user, *args, **kwargs))
+
     async def denied(self, rule: str, user: Any, *args, **kwargs) -> bool:
-        response = await self.check(rule, user, *args, **kwargs)
-        if isinstance(response, Response):
-            return not response.allowed
-        return not response
+        return not _is_allowed(await self.check(rule, user, *args, **kwargs))
 
     async def authorize(self, rule: str, user: Any, *args, **kwargs) -> None:
         response = await self.check(rule, user, *args, **kwargs)
-        if isinstance(response, Response):
-            response.authorize()
-        elif isinstance(response, bool) and not response:
+        if response is False:
             raise AuthorizationException()
+        if response is not True:
+            response.authorize()
 
     async def any(self, rules: List[str], user: Any, *args, **kwargs):
-        results = await asyncio.gather(
-            *[self.allowed(rule, user, *args, **kwargs) for rule in rules]
-        )
-        return any(results)
+        with self._budget():
+            return await self._any(self.allowed, rules, user, *args, **kwargs)
+
+    async def _any(self, check: Callable[..., Awaitable[bool]], rules: List[str], user: Any, *args, **kwargs):
+        if self._rule_stats is None:
+            return await _first_with((check(rule, user, *args, **kwargs) for rule in rules), True)
+
+        for rule in self._rule_stats.order(rules):
+            start = perf_counter()
+            allowed = await check(rule, user, *args, **kwargs)
+            self._rule_stats.record(rule, perf_counter() - start, allowed)
+            if allowed:
+                return True
+        return False
 
     async def none(self, rules: List[str], user: Any, *args, **kwargs):
         return not await self.any(rules, user, *args, **kwargs)
+
+    async def all(self, rules: List[str], user: Any, *args, **kwargs):
+        with self._budget():
+            return not await _first_with(
+                (self.allowed(rule, user, *args, **kwargs) for rule in rules), False
+            )
+
+    async def check_many(self, rule: str, user: Any, resources: Iterable[Any], *args, **kwargs) -> List[Union[Response, bool]]:
+        resources = list(resources)
+        self._follow_registry()
+        if self._metrics is None and self._audit is None:
+            return await self._check_many(rule, user, resources, *args, **kwargs)
+        start = perf_counter()
+        try:
+            responses = await self._check_many(rule, user, resources, *args, **kwargs)
+        except Exception:
+            self._record(rule, user, perf_counter() - start, ERROR, None)
+            raise
+        self._record_many(rule, user, perf_counter() - start, responses)
+        return responses
+
+    async def _check_many(self, rule: str, user: Any, resources: List[Any], *args, **kwargs) -> List[Union[Response, bool]]:
+        root = self._root
+        batch = await root.get_companion(rule, BATCH)
+        if batch is not None:
+            batch = self._bounded_batch(rule, batch)
+            results = _batch_results(await _resolve(batch(user, resources, *args, **kwargs)), resources)
+            return [_to_response(result) for result in results]
+
+        target = await root.get_rule(rule)
+        semaphore = asyncio.Semaphore(self.batch_concurrency) if self.batch_concurrency else None
+
+        async def check(resource):
+            if semaphore is None:
+                return _to_response(await self._invoke(rule, target, user, resource, *args, **kwargs))
+            async with semaphore:
+                return _to_response(await self._invoke(rule, target, user, resource, *args, **kwargs))
+
+        return list(await asyncio.gather(*[check(resource) for resource in resources]))
+
+    async def allowed_many(self, rule: str, user: Any, resources: Iterable[Any], *args, **kwargs) -> List[bool]:
+        responses = await self.check_many(rule, user, resources, *args, **kwargs)
+        return [_is_allowed(response) for response in responses]
+
+    async def filter_allowed(self, rule: str, user: Any, resources: Iterable[Any], *args, **kwargs) -> List[Any]:
+        resources = list(resources)
+        decisions = await self.allowed_many(rule, user, resources, *args, **kwargs)
+        return [resource for resource, allowed in zip(resources, decisions) if allowed]
+
+    async def filter(self, rule: str, user: Any, source: Any, *args, **kwargs) -> List[Any]:
+        if not hasattr(source, "apply"):
+            source = RecordSource(source)
+        predicate_for = await self._root.get_companion(rule, FILTER)
+        if predicate_for is None:
+            records = await _resolve(source.records())
+            return await self.filter_allowed(rule, user, records, *args, **kwargs)
+        start = perf_counter()
+        predicate = await _resolve(predicate_for(user, *args, **kwargs))
+        records = await _resolve(source.apply(predicate))
+        if self._metrics is not None or self._audit is not None:
+            self._record_many(rule, user, perf_counter() - start, [True] * len(records))
+        return records
+
+    async def abilities(
+        self, user: Any, prefix: Optional[str] = None, version_only: bool = False, concurrency: Optional[int] = None
+    ) -> Union[Abilities, str]:
+        self._follow_registry()
+        prefix = prefix.rstrip(":") or None if prefix else None
+        key = self._cache.key(CACHE_KEY, user, prefix) if self._cache is not None else None
+        abilities = self._cache.get(key) if key is not None else MISSING
+        if abilities is MISSING:
+            generation = self._cache.generation if self._cache is not None else None
+            rules = await self._user_only_rules(prefix)
+            direct = (
+                self._metrics is None and self._audit is None and self._deadlines is None
+                and self._offload is None and self._bulkheads is None
+            )
+            limit = concurrency or self.batch_concurrency
+            semaphore = asyncio.Semaphore(limit) if limit else None
+
+            async def decide(path, rule):
+                if direct:
+                    return _to_response(await _resolve(rule(user)))
+                return await self.check(path, user)
+
+            async def check(path, rule):
+                try:
+                    if semaphore is None:
+                        return await decide(path, rule)
+                    async with semaphore:
+                        return await decide(path, rule)
+                except Exception:
+                    return None
+
+            with self._budget():
+                results = await asyncio.gather(*[check(path, rule) for path, rule in rules])
+            abilities = Abilities(
+                path for (path, _), result in zip(rules, results) if result is not None and _is_allowed(result)
+            )
+            settled = all(result is not None and not _is_fallback(result) for result in results)
+            if key is not None and settled:
+                self._cache.set(key, abilities, generation)
+        return abilities.version if version_only else abilities
+
+    async def _user_only_rules(self, prefix: Optional[str]) -> List[Tuple[str, Rule]]:
+        rules = self._user_only.get(prefix)
+        if rules is None:
+            root = self._root
+            for name in list(getattr(root, "_lazy", ())):
+                if in_prefix(name, prefix) or in_prefix(prefix, name):
+                    await root.get_scope(name)
+            rules = self._user_only[prefix] = user_only_rules(_rule_index(root), prefix)
+        return rules
@@ -0,0 +1,86 @@
+from typing import Any, Dict, Hashable, List, Optional, Tuple, Union
+from scutum.cache import MISSING, default_resource_key, default_subject_key
+from scutum.gate import Gate, AsyncGate, _is_allowed, _is_fallback
+from scutum.response import Response
+
+class BaseRequestMemo:
+    def __init__(self, gate):
+        self._gate = gate
+        self._decisions: Dict[Tuple, Union[Response, bool]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, rule: str, user: Any, *args, **kwargs) -> Optional[Hashable]:
+        key = (rule, default_subject_key(user), default_resource_key(*args, **kwargs))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _lookup(self, key: Optional[Hashable]):
+        if key is None:
+            return MISSING
+        decision = self._decisions.get(key, MISSING)
+        if decision is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return decision
+
+    def _store(self, key: Optional[Hashable], decision: Union[Response, bool]):
+        if key is not None and not _is_fallback(decision):
+            self._decisions[key] = decision
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._decisions)}
+
+class RequestMemo(BaseRequestMemo):
+    def __init__(self, gate: Gate):
+        super().__init__(gate)
+
+    def check(self, rule: str, user: Any, *args, **kwargs) -> Union[Response, bool]:
+        key = self._key(rule, user, *args, **kwargs)
+        decision = self._lookup(key)
+        if decision is MISSING:
+            decision = self._gate.check(rule, user, *args, **kwargs)
+            self._store(key, decision)
+        return decision
+
+    def allowed(self, rule: str, user: Any, *args, **kwargs) -> bool:
+        return _is_allowed(self.check(rule, user, *args, **kwargs))
+
+    def denied(self, rule: str, user: Any, *args, **kwargs) -> bool:
+        return not self.allowed(rule, user, *args, **kwargs)
+
+    def any(self, rules: List[str], user: Any, *args, **kwargs) -> bool:
+        with self._gate._budget():
+            return self._gate._any(self.allowed, rules, user, *args, **kwargs)
+
+    def none(self, rules: List[str], user: Any, *args, **kwargs) -> bool:
+        return not self.any(rules, user, *args, **kwargs)
+
+class AsyncRequestMemo(BaseRequestMemo):
+    def __init__(self, gate: AsyncGate):
+        super().__init__(gate)
+
+    async def check(self, rule: str, user: Any, *args, **kwargs) -> Union[Response, bool]:
+        key = self._key(rule, user, *args, **kwargs)
+        decision = self._lookup(key)
+        if decision is MISSING:
+            decision = await self._gate.check(rule, user, *args, **kwargs)
+            self._store(key, decision)
+        return decision
+
+    async def allowed(self, rule: str, user: Any, *args, **kwargs) -> bool:
+        return _is_allowed(await self.check(rule, user, *args, **kwargs))
+
+    async def denied(self, rule: str, user: Any, *args, **kwargs) -> bool:
+        return not await self.allowed(rule, user, *args, **kwargs)
+
+    async def any(self, rules: List[str], user: Any, *args, **kwargs) -> bool:
+        with self._gate._budget():
+            return await self._gate._any(self.allowed, rules, user, *args, **kwargs)
+
+    async def none(self, rules: List[str], user: Any, *args, **kwargs) -> bool:
+        return not await self.any(rules, user, *args, **kwargs)
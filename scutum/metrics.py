@@ -0,0 +1,115 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+ALLOW = "allow"
+DENY = "deny"
+ERROR = "error"
+
+class Instrumentation:
+    def record(self, rule: str, elapsed: float, outcome: str):
+        pass
+
+class RuleMetrics:
+    __slots__ = ("counts", "buckets", "total", "sum")
+
+    def __init__(self, size: int):
+        self.counts = {ALLOW: 0, DENY: 0, ERROR: 0}
+        self.buckets = [0] * size
+        self.total = 0
+        self.sum = 0.0
+
+class Metrics(Instrumentation):
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "scutum"):
+        self.bounds = tuple(sorted(buckets)) + (float("inf"),)
+        self.namespace = namespace
+        self._rules: Dict[str, RuleMetrics] = {}
+        self._lock = Lock()
+
+    def record(self, rule: str, elapsed: float, outcome: str):
+        with self._lock:
+            metrics = self._rules.get(rule)
+            if metrics is None:
+                metrics = self._rules[rule] = RuleMetrics(len(self.bounds))
+            metrics.counts[outcome] += 1
+            metrics.buckets[bisect_left(self.bounds, elapsed)] += 1
+            metrics.total += 1
+            metrics.sum += elapsed
+
+    def reset(self):
+        with self._lock:
+            self._rules.clear()
+
+    def _quantile(self, metrics: RuleMetrics, q: float) -> Optional[float]:
+        if not metrics.total:
+            return None
+        rank = q * metrics.total
+        seen = 0
+        lower = 0.0
+        for bound, count in zip(self.bounds, metrics.buckets):
+            if count and seen + count >= rank:
+                if bound == float("inf"):
+                    return lower
+                return lower + (bound - lower) * (rank - seen) / count
+            seen += count
+            lower = bound
+        return lower
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            rules = {
+                rule: (dict(m.counts), list(m.buckets), m.total, m.sum, self._quantiles(m))
+                for rule, m in self._rules.items()
+            }
+        return {
+            rule: {
+                "calls": total,
+                "allow": counts[ALLOW],
+                "deny": counts[DENY],
+                "error": counts[ERROR],
+                "deny_rate": counts[DENY] / total if total else 0.0,
+                "latency_sum": latency_sum,
+                "p50": quantiles[0],
+                "p95": quantiles[1],
+                "p99": quantiles[2],
+                "buckets": dict(zip(self.bounds, buckets)),
+            }
+            for rule, (counts, buckets, total, latency_sum, quantiles) in rules.items()
+        }
+
+    def _quantiles(self, metrics: RuleMetrics) -> List[Optional[float]]:
+        return [self._quantile(metrics, q) for q in (0.5, 0.95, 0.99)]
+
+    def exposition(self) -> str:
+        name = self.namespace
+        lines = [
+            f"# HELP {name}_checks_total Authorization checks by rule and outcome.",
+            f"# TYPE {name}_checks_total counter",
+        ]
+        snapshot = self.snapshot()
+        for rule, stats in snapshot.items():
+            for outcome in (ALLOW, DENY, ERROR):
+                lines.append(f'{name}_checks_total{{rule="{_escape(rule)}",outcome="{outcome}"}} {stats[outcome]}')
+
+        lines += [
+            f"# HELP {name}_check_duration_seconds Authorization check latency by rule.",
+            f"# TYPE {name}_check_duration_seconds histogram",
+        ]
+        for rule, stats in snapshot.items():
+            label = f'rule="{_escape(rule)}"'
+            cumulative = 0
+            for bound, count in stats["buckets"].items():
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_check_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"{name}_check_duration_seconds_sum{{{label}}} {stats['latency_sum']}")
+            lines.append(f"{name}_check_duration_seconds_count{{{label}}} {stats['calls']}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
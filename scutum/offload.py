@@ -0,0 +1,141 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from time import perf_counter
+from typing import Any, Dict, Optional
+from scutum.types import Rule
+from scutum.stats import RuleStats
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+_COROUTINE = "coroutine"
+_MEASURED = "measured"
+MODES = (INLINE, THREAD, PROCESS)
+
+def offload(mode: str = THREAD):
+    if mode not in MODES:
+        raise ValueError(f"Unknown offload mode: '{mode}'")
+
+    def decorator(target):
+        target._offload = mode
+        return target
+    return decorator
+
+class Offloader:
+    # Decides, per rule path, whether a sync rule runs on the event loop or in
+    # an executor. A mode set with ``@offload`` on the rule wins over one set on
+    # its policy class, which wins over ``default``. With ``slow_threshold``,
+    # inline rules whose smoothed latency exceeds it move to the thread pool.
+    def __init__(
+        self,
+        default: str = INLINE,
+        executor: Optional[Executor] = None,
+        process_executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        slow_threshold: Optional[float] = None,
+    ):
+        if default not in MODES:
+            raise ValueError(f"Unknown offload mode: '{default}'")
+        self.default = default
+        self.max_workers = max_workers
+        self.concurrency = concurrency
+        self.slow_threshold = slow_threshold
+        self._executors: Dict[str, Optional[Executor]] = {THREAD: executor, PROCESS: process_executor}
+        self._owned = set()
+        # Created on first use, inside the loop that runs the checks.
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._modes: Dict[str, str] = {}
+        self._latency = RuleStats()
+        self.offloaded = 0
+        self.promoted = 0
+
+    def mode_for(self, name: str, rule: Rule) -> str:
+        mode = self._modes.get(name)
+        if mode is None:
+            if inspect.iscoroutinefunction(rule):
+                mode = _COROUTINE
+            else:
+                mode = getattr(rule, "_offload", None)
+                if mode is None:
+                    mode = getattr(getattr(rule, "__self__", None), "_offload", None)
+                if mode is None:
+                    mode = self.default
+                    if mode == INLINE and self.slow_threshold is not None:
+                        mode = _MEASURED
+            self._modes[name] = mode
+        return mode
+
+    def executor(self, mode: str) -> Executor:
+        executor = self._executors[mode]
+        if executor is None:
+            factory = ThreadPoolExecutor if mode == THREAD else ProcessPoolExecutor
+            executor = self._executors[mode] = factory(max_workers=self.max_workers)
+            self._owned.add(mode)
+        return executor
+
+    async def call(self, name: str, rule: Rule, *args, **kwargs) -> Any:
+        mode = self.mode_for(name, rule)
+        if mode == _COROUTINE:
+            return await rule(*args, **kwargs)
+        if mode == INLINE or mode == _MEASURED:
+            if mode == INLINE:
+                result = rule(*args, **kwargs)
+            else:
+                start = perf_counter()
+                result = rule(*args, **kwargs)
+                self._observe(name, perf_counter() - start)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        if mode == THREAD:
+            # Like asyncio.to_thread, so context variables reach the rule.
+            call = partial(copy_context().run, rule, *args, **kwargs)
+        else:
+            call = partial(rule, *args, **kwargs)
+        semaphore = self._limit(loop)
+        if semaphore is None:
+            result = await loop.run_in_executor(self.executor(mode), call)
+        else:
+            async with semaphore:
+                result = await loop.run_in_executor(self.executor(mode), call)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _limit(self, loop: asyncio.AbstractEventLoop) -> Optional[asyncio.Semaphore]:
+        if not self.concurrency:
+            return None
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _observe(self, name: str, elapsed: float):
+        self._latency.record(name, elapsed, True)
+        if self._latency.latency(name) > self.slow_threshold:
+            self._modes[name] = THREAD
+            self.promoted += 1
+
+    def modes(self) -> Dict[str, str]:
+        return {
+            name: INLINE if mode == _MEASURED else mode
+            for name, mode in self._modes.items()
+            if mode != _COROUTINE
+        }
+
+    def reset(self):
+        self._modes.clear()
+
+    def shutdown(self, wait: bool = True):
+        for mode in self._owned:
+            self._executors[mode].shutdown(wait=wait)
+            self._executors[mode] = None
+        self._owned.clear()
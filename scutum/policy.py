@@ -1,55 +1,81 @@
 import inspect
-from functools import wraps
+from typing import Any, Dict, Tuple
 from scutum.scope import Scope, AsyncScope
 
-def _get_method(obj, method):
-    @wraps(method)
-    def get_method(*args, **kwargs):
-        return method(obj, *args, **kwargs)
-    return get_method
+BATCH = "batch"
+FILTER = "filter"
 
-def _get_async_method(obj, method):
-    @wraps(method)
-    async def get_method(*args, **kwargs):
-        return await method(obj, *args, **kwargs)
-    return get_method
-
-def _get_scope(name, rules):
+def _get_scope(name, rules, companions):
     scope = Scope(name)
     for rule_name, rule in rules.items():
         scope.add_rule(rule_name, rule)
+    for (kind, rule_name), rule in companions.items():
+        scope.add_companion(rule_name, kind, rule)
     return scope
 
-async def _get_async_scope(name, rules):
+async def _get_async_scope(name, rules, companions):
     scope = AsyncScope(name)
     for rule_name, rule in rules.items():
         await scope.add_rule(rule_name, rule)
+    for (kind, rule_name), rule in companions.items():
+        await scope.add_companion(rule_name, kind, rule)
     return scope
 
+def _companion(kind: str, action: str):
+    def decorator(method):
+        method._companion = (kind, action)
+        return method
+    return decorator
+
+def batch(action: str):
+    return _companion(BATCH, action)
+
+def filters(action: str):
+    return _companion(FILTER, action)
+
 class BasePolicy:
-    _method_wrapper = staticmethod(_get_method)
     _scope_wrapper = staticmethod(_get_scope)
 
     @classmethod
-    def _to_rules(cls, *args, **kwargs):
-        obj = cls(*args, **kwargs)
-        actions = {
-            name: cls._method_wrapper(obj, method)
-            for name, method in inspect.getmembers(cls, predicate=callable)
-            if not name.startswith("_") and method.__qualname__.startswith(cls.__name__)
-        }
+    def _actions(cls) -> Dict[str, Any]:
+        # Bases are walked before subclasses, so a subclass's definition of a
+        # name replaces the inherited one. Only functions are actions: a class
+        # or other callable attribute such as ``model = Post`` is not a rule.
+        actions = {}
+        for klass in reversed(cls.__mro__):
+            if klass is object or klass in _POLICY_BASES:
+                continue
+            for name, member in vars(klass).items():
+                if name.startswith("_"):
+                    continue
+                if inspect.isfunction(member) or isinstance(member, (staticmethod, classmethod)):
+                    actions[name] = member
+                else:
+                    actions.pop(name, None)
         return actions
+
+    @classmethod
+    def _to_rules(cls, *args, **kwargs) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        obj = cls(*args, **kwargs)
+        rules, companions = {}, {}
+        for name in cls._actions():
+            method = getattr(obj, name)
+            companion = getattr(method, "_companion", None)
+            if companion is None:
+                rules[name] = method
+            else:
+                companions[companion] = method
+        return rules, companions
     
     @classmethod
     def _to_scope(cls, name):
-        rules = cls._to_rules()
-        return cls._scope_wrapper(name, rules)
+        rules, companions = cls._to_rules()
+        return cls._scope_wrapper(name, rules, companions)
     
 class Policy(BasePolicy):
-    _method_wrapper = staticmethod(_get_method)
     _scope_wrapper = staticmethod(_get_scope)
 
 class AsyncPolicy(BasePolicy):
-    _method_wrapper = staticmethod(_get_async_method)
     _scope_wrapper = staticmethod(_get_async_scope)
-    
\ No newline at end of file
+
+_POLICY_BASES = (BasePolicy, Policy, AsyncPolicy)
@@ -0,0 +1,186 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from scutum.types import Rule
+
+WORD_BITS = 64
+WORD_MASK = (1 << WORD_BITS) - 1
+
+def _split(mask: int) -> Tuple[int, ...]:
+    words = []
+    while mask:
+        words.append(mask & WORD_MASK)
+        mask >>= WORD_BITS
+    return tuple(words)
+
+def _default_roles(user: Any) -> Iterable[str]:
+    return getattr(user, "roles", ())
+
+def _default_permissions(user: Any) -> Iterable[str]:
+    return getattr(user, "permissions", ())
+
+def _permission_rule(registry: "RoleRegistry", mask: int, names: Tuple[str, ...]):
+    # User masks are padded to the registry's width, so the rule is a mask
+    # lookup and a word test.
+    words = tuple((index, word) for index, word in enumerate(_split(mask)) if word)
+    user_mask_of = registry.user_mask
+
+    if len(words) == 1:
+        ((index, word),) = words
+
+        def rule(user: Any, *args, **kwargs) -> bool:
+            return user_mask_of(user)[index] & word == word
+    else:
+        def rule(user: Any, *args, **kwargs) -> bool:
+            user_mask = user_mask_of(user)
+            for index, word in words:
+                if user_mask[index] & word != word:
+                    return False
+            return True
+
+    rule.mask = mask
+    rule.permissions = names
+    rule._rbac_words = (registry, words)
+    rule.__qualname__ = rule.__name__ = f"requires({', '.join(names)})"
+    return rule
+
+class RoleRegistry:
+    def __init__(
+        self,
+        roles_of: Callable[[Any], Iterable[str]] = _default_roles,
+        permissions_of: Callable[[Any], Iterable[str]] = _default_permissions,
+        mask_attribute: str = "rbac_mask",
+    ):
+        self.roles_of = roles_of
+        self.permissions_of = permissions_of
+        self.mask_attribute = mask_attribute
+        self._permissions: Dict[str, int] = {}
+        self._role_bits: Dict[str, int] = {}
+        self._role_grants: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._role_masks: Dict[str, int] = {}
+        self._user_masks: Dict[Tuple, Tuple[int, ...]] = {}
+        self._width = 0
+        self._bits = 0
+        self.max_cached_users = 10_000
+
+    def _allocate(self) -> int:
+        bit = 1 << self._bits
+        self._bits += 1
+        return bit
+
+    def permission(self, *names: str):
+        added = False
+        for name in names:
+            if name not in self._permissions:
+                self._permissions[name] = self._allocate()
+                added = True
+        if added:
+            self._forget_users()
+        return self
+
+    def role(self, name: str, permissions: Iterable[str] = (), inherits: Iterable[str] = ()):
+        permissions, inherits = tuple(permissions), tuple(inherits)
+        for parent in inherits:
+            if parent not in self._role_masks:
+                raise KeyError(f"Unknown role: '{parent}'")
+        self.permission(*permissions)
+        previous = self._role_grants.get(name)
+        if previous is None:
+            self._role_bits[name] = self._allocate()
+        self._role_grants[name] = (permissions, inherits)
+        if previous is not None:
+            try:
+                self._compile()
+            except ValueError:
+                self._role_grants[name] = previous
+                raise
+            return self
+
+        mask = self._role_bits[name]
+        for permission in permissions:
+            mask |= self._permissions[permission]
+        for parent in inherits:
+            mask |= self._role_masks[parent]
+        self._role_masks[name] = mask
+        self._forget_users()
+        return self
+
+    def _compile(self):
+        masks: Dict[str, int] = {}
+
+        def flatten(role: str, path: Tuple[str, ...]) -> int:
+            if role in masks:
+                return masks[role]
+            if role in path:
+                raise ValueError(f"Role cycle: {' -> '.join(path + (role,))}")
+            permissions, inherits = self._role_grants[role]
+            mask = self._role_bits[role]
+            for permission in permissions:
+                mask |= self._permissions[permission]
+            for parent in inherits:
+                mask |= flatten(parent, path + (role,))
+            masks[role] = mask
+            return mask
+
+        for role in self._role_grants:
+            flatten(role, ())
+        self._role_masks = masks
+        self._forget_users()
+
+    def _forget_users(self):
+        self._user_masks = {}
+        self._width = (self._bits + WORD_BITS - 1) // WORD_BITS
+
+    def mask_for(self, roles: Iterable[str] = (), permissions: Iterable[str] = ()) -> Tuple[int, ...]:
+        key = (tuple(roles), tuple(permissions))
+        words = self._user_masks.get(key)
+        if words is None:
+            mask = 0
+            for role in key[0]:
+                mask |= self._role_masks.get(role, 0)
+            for permission in key[1]:
+                mask |= self._permissions.get(permission, 0)
+            words = self._pad(_split(mask))
+            if len(self._user_masks) >= self.max_cached_users:
+                self._user_masks = {}
+            self._user_masks[key] = words
+        return words
+
+    def _pad(self, mask: Tuple[int, ...]) -> Tuple[int, ...]:
+        if len(mask) < self._width:
+            return tuple(mask) + (0,) * (self._width - len(mask))
+        return mask
+
+    def user_mask(self, user: Any) -> Tuple[int, ...]:
+        # Nothing is stored on the user. The mask_for memo is keyed by the
+        # user's current roles and permissions, so a change to them is seen
+        # on the next check.
+        mask = getattr(user, self.mask_attribute, None)
+        if mask is not None:
+            return self._pad(mask)
+        key = (tuple(self.roles_of(user)), tuple(self.permissions_of(user)))
+        mask = self._user_masks.get(key)
+        if mask is None:
+            mask = self.mask_for(*key)
+        return mask
+
+    def _mask(self, names: Iterable[str], bits: Dict[str, int], kind: str) -> int:
+        mask = 0
+        for name in names:
+            if name not in bits:
+                raise KeyError(f"Unknown {kind}: '{name}'")
+            mask |= bits[name]
+        return mask
+
+    def requires(self, *permissions: str) -> Rule:
+        return _permission_rule(self, self._mask(permissions, self._permissions, "permission"), permissions)
+
+    def requires_role(self, *roles: str) -> Rule:
+        return _permission_rule(self, self._mask(roles, self._role_bits, "role"), roles)
+
+    def roles(self) -> List[str]:
+        return list(self._role_bits)
+
+    def permissions(self, role: Optional[str] = None) -> List[str]:
+        if role is None:
+            return list(self._permissions)
+        mask = self._role_masks[role]
+        return [name for name, bit in self._permissions.items() if mask & bit]
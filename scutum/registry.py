@@ -0,0 +1,418 @@
+import inspect
+from threading import RLock
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple, Union
+from scutum.types import Rule, Response
+from scutum.scope import BaseScope
+from scutum.trie import WILDCARD, PatternTrie, _copy_patterns, is_pattern
+from scutum.exceptions import FrozenGateException, RuleNotFoundException, ScopeNotFoundException
+
+def _flatten(root: BaseScope, prefix: str = ""):
+    if root._lazy:
+        raise FrozenGateException("Lazy scopes must be loaded before freezing")
+    companions = {}
+    for scope_prefix, scope in [(prefix, root)] + [(f"{prefix}{path}:", scope) for path, scope in root._scope_index.items()]:
+        for (kind, name), companion in scope._companions.items():
+            companions[(kind, scope_prefix + name)] = companion
+    # Fresh entry tuples land next to each other, so the refcount writes a
+    # worker makes on every lookup dirty far fewer shared pages.
+    index = {prefix + path: (rule, is_coroutine) for path, (rule, is_coroutine) in root._index.items()}
+    return index, frozenset(prefix + path for path in root._scope_index), companions
+
+def _scope_view(scopes: FrozenSet[str], index: Mapping[str, Tuple[Rule, bool]]) -> Mapping[str, Mapping[str, Rule]]:
+    # Registries keep no scope objects, so Gate.scopes() gets each top-level
+    # scope as a read-only map of its rules by path relative to the scope.
+    children: Dict[str, Dict[str, Rule]] = {name: {} for name in scopes if ":" not in name}
+    for path, (rule, _) in index.items():
+        name, _, rest = path.partition(":")
+        if rest and name in children:
+            children[name][rest] = rule
+    return MappingProxyType({name: MappingProxyType(rules) for name, rules in children.items()})
+
+class BaseFrozenRegistry:
+    # A read-only snapshot of a scope tree: one flat path table, the set of
+    # scope paths and the companions keyed by full path. Nothing here is
+    # written after construction, so forked workers keep sharing its pages.
+    __slots__ = ("_index", "_scopes", "_companions", "_rules", "_patterns")
+
+    frozen = True
+
+    def __init__(
+        self,
+        index: Dict[str, Tuple[Rule, bool]],
+        scopes: FrozenSet[str],
+        companions: Dict[Tuple[str, str], Rule],
+        patterns: Optional[PatternTrie] = None,
+    ):
+        self._index = index
+        self._patterns = patterns
+        self._scopes = scopes
+        self._companions = companions
+        self._rules = {path: entry[0] for path, entry in index.items() if ":" not in path}
+
+    @classmethod
+    def from_scope(cls, root: BaseScope):
+        index, scopes, companions = _flatten(root)
+        return cls(index, scopes, companions, _copy_patterns(root._patterns, []))
+
+    @property
+    def _children(self) -> Mapping[str, Mapping[str, Rule]]:
+        return _scope_view(self._scopes, self._index)
+
+    def _check_path(self, path: str):
+        if not path or "::" in path or any(part == "" for part in path.split(":")):
+            raise ValueError(f"Invalid path: '{path}'")
+
+    def _check_scope(self, path: str):
+        prefix = None
+        for name in path.split(":"):
+            prefix = name if prefix is None else f"{prefix}:{name}"
+            if prefix not in self._scopes:
+                raise ScopeNotFoundException(f"Scope '{name}' not found")
+
+    def _lookup_entry(self, path: str) -> Tuple[Rule, bool]:
+        entry = self._index.get(path)
+        if entry is None and self._patterns is not None:
+            entry = self._patterns.match(path)
+        if entry is None:
+            self._check_path(path)
+            scope_path, _, rule_name = path.rpartition(":")
+            if scope_path:
+                self._check_scope(scope_path)
+            raise RuleNotFoundException(f"Rule '{rule_name}' not found")
+        return entry
+
+    def _has_rule(self, path: str) -> bool:
+        if WILDCARD in path:
+            return self._patterns is not None and path in self._patterns
+        if path in self._index:
+            return True
+        self._check_path(path)
+        scope_path = path.rpartition(":")[0]
+        if scope_path:
+            self._check_scope(scope_path)
+        return False
+
+    def _lookup_companion(self, path: str, kind: str) -> Optional[Rule]:
+        companion = self._companions.get((kind, path))
+        if companion is None and path not in self._index:
+            if self._patterns is not None and self._patterns.match(path) is not None:
+                return None
+            self._check_path(path)
+            scope_path = path.rpartition(":")[0]
+            if scope_path:
+                self._check_scope(scope_path)
+        return companion
+
+    def _contains_scope(self, path: str) -> bool:
+        if path in self._scopes:
+            return True
+        self._check_path(path)
+        return False
+
+    def _mutate(self, *args, **kwargs):
+        raise FrozenGateException()
+
+    add_rule = remove_rule = add_scope = remove_scope = add_companion = add_lazy = _mutate
+
+class FrozenRegistry(BaseFrozenRegistry):
+    __slots__ = ()
+
+    def has_rule(self, name: str) -> bool:
+        return self._has_rule(name)
+
+    def get_rule(self, name: str) -> Rule:
+        return self._lookup_entry(name)[0]
+
+    def get_companion(self, name: str, kind: str) -> Optional[Rule]:
+        return self._lookup_companion(name, kind)
+
+    def has_scope(self, name: str) -> bool:
+        return self._contains_scope(name)
+
+    def call(self, name: str, *args, **kwargs) -> Union[Response, bool]:
+        entry = self._index.get(name)
+        if entry is None:
+            entry = self._lookup_entry(name)
+        return entry[0](*args, **kwargs)
+
+class AsyncFrozenRegistry(BaseFrozenRegistry):
+    __slots__ = ()
+
+    async def has_rule(self, name: str) -> bool:
+        return self._has_rule(name)
+
+    async def get_rule(self, name: str) -> Rule:
+        return self._lookup_entry(name)[0]
+
+    async def get_companion(self, name: str, kind: str) -> Optional[Rule]:
+        return self._lookup_companion(name, kind)
+
+    async def has_scope(self, name: str) -> bool:
+        return self._contains_scope(name)
+
+    async def call(self, name: str, *args, **kwargs) -> Union[Response, bool]:
+        entry = self._index.get(name)
+        if entry is None:
+            entry = self._lookup_entry(name)
+        rule, is_coroutine = entry
+        if is_coroutine:
+            return await rule(*args, **kwargs)
+        result = rule(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+_EMPTY: Mapping = MappingProxyType({})
+_overlay_lock = RLock()
+
+class BaseOverlayRegistry:
+    # A tenant's rules layered over a shared frozen registry. The overlay keeps
+    # only what the tenant adds or overrides, in the same flat tables as the
+    # base, and every lookup tries it before the base. Writes publish new
+    # tables, so an overlay starts out as a handful of pointers to shared empties.
+    __slots__ = ("_base", "_index", "_scopes", "_companions", "_patterns", "_sealed")
+
+    def __init__(self, base: BaseFrozenRegistry):
+        self._base = base
+        self._index: Mapping[str, Tuple[Rule, bool]] = _EMPTY
+        self._scopes: FrozenSet[str] = frozenset()
+        self._companions: Mapping[Tuple[str, str], Rule] = _EMPTY
+        self._patterns: Optional[PatternTrie] = None
+        self._sealed = False
+
+    @property
+    def frozen(self) -> bool:
+        return self._sealed
+
+    def freeze(self):
+        self._sealed = True
+
+    @property
+    def _rules(self) -> Dict[str, Rule]:
+        return {**self._base._rules, **{path: entry[0] for path, entry in self._index.items() if ":" not in path}}
+
+    @property
+    def _children(self) -> Mapping[str, Mapping[str, Rule]]:
+        return _scope_view(self._base._scopes | self._scopes, {**self._base._index, **self._index})
+
+    def _check_path(self, path: str):
+        if not path or "::" in path or any(part == "" for part in path.split(":")):
+            raise ValueError(f"Invalid path: '{path}'")
+
+    def _check_scope(self, path: str):
+        prefix = None
+        for name in path.split(":"):
+            prefix = name if prefix is None else f"{prefix}:{name}"
+            if prefix not in self._scopes and prefix not in self._base._scopes:
+                raise ScopeNotFoundException(f"Scope '{name}' not found")
+
+    def _check_rule_path(self, path: str):
+        self._check_path(path)
+        scope_path = path.rpartition(":")[0]
+        if scope_path:
+            self._check_scope(scope_path)
+
+    def _lookup_entry(self, path: str) -> Tuple[Rule, bool]:
+        entry = self._index.get(path) or self._base._index.get(path)
+        if entry is None and self._patterns is not None:
+            entry = self._patterns.match(path)
+        if entry is None and self._base._patterns is not None:
+            entry = self._base._patterns.match(path)
+        if entry is None:
+            self._check_rule_path(path)
+            raise RuleNotFoundException(f"Rule '{path.rpartition(':')[2]}' not found")
+        return entry
+
+    def _has_rule(self, path: str) -> bool:
+        if WILDCARD in path:
+            return any(patterns is not None and path in patterns for patterns in (self._patterns, self._base._patterns))
+        if path in self._index or path in self._base._index:
+            return True
+        self._check_rule_path(path)
+        return False
+
+    def _lookup_companion(self, path: str, kind: str) -> Optional[Rule]:
+        # An overridden rule never inherits the companions of the base rule.
+        if path in self._index:
+            return self._companions.get((kind, path))
+        if path in self._base._index:
+            return self._base._companions.get((kind, path))
+        for patterns in (self._patterns, self._base._patterns):
+            if patterns is not None and patterns.match(path) is not None:
+                return None
+        self._check_rule_path(path)
+        return None
+
+    def _contains_scope(self, path: str) -> bool:
+        if path in self._scopes or path in self._base._scopes:
+            return True
+        self._check_path(path)
+        return False
+
+    def _writable(self):
+        if self._sealed:
+            raise FrozenGateException()
+
+    def _drop_companions(self, drop):
+        if any(drop(path) for _, path in self._companions):
+            self._companions = {key: companion for key, companion in self._companions.items() if not drop(key[1])}
+
+    def _set_rule(self, path: str, rule: Rule):
+        with _overlay_lock:
+            self._writable()
+            entry = (rule, inspect.iscoroutinefunction(rule))
+            if is_pattern(path):
+                self._check_path(path)
+                literal = path.partition(WILDCARD)[0].rstrip(":")
+                if literal:
+                    self._check_scope(literal)
+                self._patterns = _copy_patterns(self._patterns, [(path, entry)])
+                return
+            self._check_rule_path(path)
+            self._drop_companions(lambda name: name == path)
+            self._index = {**self._index, path: entry}
+
+    def _delete_rule(self, path: str):
+        with _overlay_lock:
+            self._writable()
+            if is_pattern(path):
+                if self._patterns is None or path not in self._patterns:
+                    raise RuleNotFoundException(f"Rule '{path}' not found")
+                self._patterns = _copy_patterns(self._patterns, [], lambda name: name == path)
+                return
+            if path not in self._index:
+                if path in self._base._index:
+                    raise FrozenGateException("Rules of the base gate cannot be removed, override them instead")
+                self._check_rule_path(path)
+                raise RuleNotFoundException(f"Rule '{path.rpartition(':')[2]}' not found")
+            index = dict(self._index)
+            del index[path]
+            self._index = index
+            self._drop_companions(lambda name: name == path)
+
+    def _set_companion(self, path: str, kind: str, rule: Rule):
+        with _overlay_lock:
+            self._writable()
+            if path not in self._index:
+                raise RuleNotFoundException(f"Rule '{path.rpartition(':')[2]}' not found")
+            self._companions = {**self._companions, (kind, path): rule}
+
+    def _set_scope(self, path: str, scope: BaseScope):
+        with _overlay_lock:
+            self._writable()
+            self._check_rule_path(path)
+            if path in self._base._scopes:
+                raise FrozenGateException("Scopes of the base gate cannot be replaced")
+            if path in self._scopes:
+                self._remove_scope(path)
+            index, scopes, companions = _flatten(scope, f"{path}:")
+            self._index = {**self._index, **index}
+            self._scopes = self._scopes | scopes | {path}
+            self._companions = {**self._companions, **companions}
+            if scope._patterns is not None:
+                self._patterns = _copy_patterns(
+                    self._patterns, [(f"{path}:{name}", entry) for name, entry in scope._patterns.items()]
+                )
+
+    def _delete_scope(self, path: str):
+        with _overlay_lock:
+            self._writable()
+            if path not in self._scopes:
+                if path in self._base._scopes:
+                    raise FrozenGateException("Scopes of the base gate cannot be removed")
+                raise ScopeNotFoundException(f"Scope '{path.rpartition(':')[2]}' not found")
+            self._remove_scope(path)
+
+    def _remove_scope(self, path: str):
+        prefix = f"{path}:"
+        inside = lambda name: name.startswith(prefix)
+        self._index = {name: entry for name, entry in self._index.items() if not inside(name)}
+        self._scopes = frozenset(name for name in self._scopes if name != path and not inside(name))
+        self._drop_companions(inside)
+        if self._patterns is not None:
+            self._patterns = _copy_patterns(self._patterns, [], inside)
+
+    def add_lazy(self, name: str, loader):
+        raise FrozenGateException("Overlay gates load policies eagerly")
+
+class OverlayRegistry(BaseOverlayRegistry):
+    __slots__ = ()
+
+    def has_rule(self, name: str) -> bool:
+        return self._has_rule(name)
+
+    def get_rule(self, name: str) -> Rule:
+        return self._lookup_entry(name)[0]
+
+    def get_companion(self, name: str, kind: str) -> Optional[Rule]:
+        return self._lookup_companion(name, kind)
+
+    def has_scope(self, name: str) -> bool:
+        return self._contains_scope(name)
+
+    def add_rule(self, name: str, rule: Rule):
+        self._set_rule(name, rule)
+
+    def remove_rule(self, name: str):
+        self._delete_rule(name)
+
+    def add_companion(self, name: str, kind: str, rule: Rule):
+        self._set_companion(name, kind, rule)
+
+    def add_scope(self, name: str, scope: BaseScope):
+        self._set_scope(name, scope)
+
+    def remove_scope(self, name: str):
+        self._delete_scope(name)
+
+    def call(self, name: str, *args, **kwargs) -> Union[Response, bool]:
+        entry = self._index.get(name) or self._base._index.get(name)
+        if entry is None:
+            entry = self._lookup_entry(name)
+        return entry[0](*args, **kwargs)
+
+class AsyncOverlayRegistry(BaseOverlayRegistry):
+    __slots__ = ()
+
+    async def has_rule(self, name: str) -> bool:
+        return self._has_rule(name)
+
+    async def get_rule(self, name: str) -> Rule:
+        return self._lookup_entry(name)[0]
+
+    async def get_companion(self, name: str, kind: str) -> Optional[Rule]:
+        return self._lookup_companion(name, kind)
+
+    async def has_scope(self, name: str) -> bool:
+        return self._contains_scope(name)
+
+    async def add_rule(self, name: str, rule: Rule):
+        self._set_rule(name, rule)
+
+    async def remove_rule(self, name: str):
+        self._delete_rule(name)
+
+    async def add_companion(self, name: str, kind: str, rule: Rule):
+        self._set_companion(name, kind, rule)
+
+    async def add_scope(self, name: str, scope: BaseScope):
+        self._set_scope(name, scope)
+
+    async def remove_scope(self, name: str):
+        self._delete_scope(name)
+
+    async def add_lazy(self, name: str, loader):
+        raise FrozenGateException("Overlay gates load policies eagerly")
+
+    async def call(self, name: str, *args, **kwargs) -> Union[Response, bool]:
+        entry = self._index.get(name) or self._base._index.get(name)
+        if entry is None:
+            entry = self._lookup_entry(name)
+        rule, is_coroutine = entry
+        if is_coroutine:
+            return await rule(*args, **kwargs)
+        result = rule(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
@@ -1,20 +1,74 @@
 from scutum.exceptions import AuthorizationException
 
+_GRANTED = "Permission granted"
+_DENIED = "Permission denied"
+
 class Response:
-    def __init__(self, allowed=False, message="Permission denied", status_code=403, json=False):
-        super().__init__()
-        self.allowed = allowed
-        self.message = message
-        self.status_code = status_code
+    # Responses are immutable values, so the default allow and deny responses
+    # are shared instances and checks returning them allocate nothing.
+    # ``fallback`` marks stand-in answers (timeouts, saturated bulkheads) that
+    # caches and memos must not keep.
+    __slots__ = ("allowed", "message", "status_code", "timed_out", "fallback")
+
+    def __init__(self, allowed=False, message=_DENIED, status_code=403, json=False, timed_out=False, fallback=False):
+        _set_allowed(self, allowed)
+        _set_message(self, message)
+        _set_status_code(self, status_code)
+        _set_timed_out(self, timed_out)
+        _set_fallback(self, fallback or timed_out)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Response is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Response is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, Response):
+            return NotImplemented
+        return (self.allowed, self.message, self.status_code, self.timed_out, self.fallback) == (
+            other.allowed, other.message, other.status_code, other.timed_out, other.fallback
+        )
+
+    def __hash__(self):
+        return hash((self.allowed, self.message, self.status_code, self.timed_out, self.fallback))
+
+    def __repr__(self):
+        if self.timed_out:
+            flags = ", timed_out=True"
+        else:
+            flags = ", fallback=True" if self.fallback else ""
+        return f"Response(allowed={self.allowed!r}, message={self.message!r}, status_code={self.status_code!r}{flags})"
+
+    def __reduce__(self):
+        return (type(self), (self.allowed, self.message, self.status_code, False, self.timed_out, self.fallback))
 
     @classmethod
-    def allow(cls, message="Permission granted", status_code=200):
+    def allow(cls, message=_GRANTED, status_code=200):
+        if cls is Response and message == _GRANTED and status_code == 200:
+            return ALLOWED
         return cls(True, message, status_code)
 
     @classmethod
-    def deny(cls, message="Permission denied", status_code=403):
+    def deny(cls, message=_DENIED, status_code=403):
+        if cls is Response and message == _DENIED and status_code == 403:
+            return DENIED
         return cls(False, message, status_code)
-    
+
+    @classmethod
+    def timeout(cls, allowed=False, message="Authorization timed out"):
+        return cls(allowed, message, 200 if allowed else 503, timed_out=True)
+
     def authorize(self):
         if not self.allowed:
             raise AuthorizationException(self.message, self.status_code)
+
+# The slot descriptors write straight past the __setattr__ guard.
+_set_allowed = Response.allowed.__set__
+_set_message = Response.message.__set__
+_set_status_code = Response.status_code.__set__
+_set_timed_out = Response.timed_out.__set__
+_set_fallback = Response.fallback.__set__
+
+ALLOWED = Response(True, _GRANTED, 200)
+DENIED = Response(False, _DENIED, 403)
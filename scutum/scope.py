@@ -2,31 +2,210 @@ import inspect
 from asyncio import Lock
 from threading import RLock
 from abc import ABC
-from functools import lru_cache
-from typing import Dict, Optional, Union
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
 from scutum.types import Rule, Response
 from scutum.exceptions import RuleNotFoundException, ScopeNotFoundException
+from scutum.trie import WILDCARD, _copy_patterns, is_pattern
 
 class BaseScope(ABC):
+    frozen = False
+
     def __init__(self, name: str):
         self.name = name
         self._rules: Dict[str, Rule] = {}
         self._children: Dict[str, "BaseScope"] = {}
+        self._companions: Dict[Tuple[str, str], Rule] = {}
         self._parent: Optional["BaseScope"] = None
+        self._key: str = name
+        self._index: Dict[str, Tuple[Rule, bool]] = {}
+        self._scope_index: Dict[str, "BaseScope"] = {}
+        self._lazy: Dict[str, Callable[[], "BaseScope"]] = {}
+        self._patterns = None
 
 class ScopeResolverMixin:
-    @lru_cache(maxsize=1024)
-    def _resolve_scope_cached(self, path: str):
-        return self._resolve_scope(path)
+    # ``_index``/``_scope_index`` map every full path below a scope to its
+    # (rule, is_coroutine) entry or scope, so lock-free readers resolve a path
+    # with a single dict access. Writers never mutate any of these dicts or the
+    # pattern tries in place: each ancestor gets a new one, published with one
+    # reference swap. Writes change every ancestor, so they hold the lock of
+    # the topmost scope.
+    def _writer_lock(self):
+        scope = self
+        while scope._parent is not None:
+            scope = scope._parent
+        return scope._lock
 
-    @lru_cache(maxsize=1024)
-    def _resolve_rule_cached(self, path: str):
-        return self._resolve_rule(path)
+    def _lookup_scope(self, path: str):
+        scope = self._scope_index.get(path)
+        if scope is None:
+            return self._resolve_scope(path)
+        return scope
+
+    def _lookup_rule(self, path: str) -> Rule:
+        return self._lookup_entry(path)[0]
+
+    def _lookup_entry(self, path: str, patterns: bool = True) -> Tuple[Rule, bool]:
+        entry = self._index.get(path)
+        if entry is None:
+            if patterns and self._patterns is not None:
+                entry = self._patterns.match(path)
+                if entry is not None:
+                    return entry
+            rule = self._resolve_rule(path)
+            return rule, inspect.iscoroutinefunction(rule)
+        return entry
+
+    def _ancestors(self, scope: "BaseScope") -> Iterator[Tuple["BaseScope", str]]:
+        prefix = ""
+        while scope is not None:
+            yield scope, prefix
+            prefix = f"{scope._key}:{prefix}"
+            scope = scope._parent
+
+    def _set_rule(self, scope: "BaseScope", name: str, rule: Rule):
+        # Companions belong to the rule they were registered with, so they are
+        # dropped before a replacement is published.
+        if name in scope._rules and any(rule_name == name for _, rule_name in scope._companions):
+            scope._companions = {
+                key: companion for key, companion in scope._companions.items() if key[1] != name
+            }
+        scope._rules = {**scope._rules, name: rule}
+        entry = (rule, inspect.iscoroutinefunction(rule))
+        for ancestor, prefix in self._ancestors(scope):
+            ancestor._index = {**ancestor._index, prefix + name: entry}
+
+    def _delete_rule(self, scope: "BaseScope", name: str):
+        if name not in scope._rules:
+            raise RuleNotFoundException(f"Rule '{name}' not found")
+        rules = dict(scope._rules)
+        del rules[name]
+        scope._rules = rules
+        if any(rule_name == name for _, rule_name in scope._companions):
+            scope._companions = {
+                key: companion for key, companion in scope._companions.items() if key[1] != name
+            }
+        for ancestor, prefix in self._ancestors(scope):
+            index = dict(ancestor._index)
+            index.pop(prefix + name, None)
+            ancestor._index = index
+
+    def _has_pattern(self, path: str) -> bool:
+        return self._patterns is not None and path in self._patterns
+
+    def _pattern_scope(self, path: str) -> Tuple["BaseScope", str]:
+        # A pattern lives on the deepest scope its literal prefix names, so it
+        # goes away with that scope and an unknown prefix fails like a rule path.
+        parts = path.split(":")
+        if any(part == "" for part in parts):
+            raise ValueError(f"Invalid path: '{path}'")
+        scope = self
+        for index, part in enumerate(parts[:-1]):
+            if part == WILDCARD:
+                return scope, ":".join(parts[index:])
+            if part not in scope._children:
+                raise ScopeNotFoundException(f"Scope '{part}' not found")
+            scope = scope._children[part]
+        return scope, parts[-1]
+
+    def _set_pattern(self, path: str, rule: Rule):
+        scope, name = self._pattern_scope(path)
+        entry = (rule, inspect.iscoroutinefunction(rule))
+        for ancestor, prefix in self._ancestors(scope):
+            ancestor._patterns = _copy_patterns(ancestor._patterns, [(prefix + name, entry)])
+
+    def _delete_pattern(self, path: str):
+        if not self._has_pattern(path):
+            raise RuleNotFoundException(f"Rule '{path}' not found")
+        scope, name = self._pattern_scope(path)
+        for ancestor, prefix in self._ancestors(scope):
+            path = prefix + name
+            ancestor._patterns = _copy_patterns(ancestor._patterns, [], lambda pattern: pattern == path)
+
+    def _set_companion(self, scope: "BaseScope", name: str, kind: str, rule: Rule):
+        if name not in scope._rules:
+            raise RuleNotFoundException(f"Rule '{name}' not found")
+        scope._companions = {**scope._companions, (kind, name): rule}
+
+    def _get_companion(self, path: str, kind: str) -> Optional[Rule]:
+        # Pattern rules have no companions, and their paths need not name scopes.
+        if path not in self._index and self._patterns is not None and self._patterns.match(path) is not None:
+            return None
+        scope, rule_name = self._resolve_path(path)
+        return scope._companions.get((kind, rule_name))
+
+    def _set_scope(self, parent: "BaseScope", name: str, scope: "BaseScope"):
+        # A replaced scope's paths are dropped and the new scope's added in the
+        # same new dicts, so readers see one tree or the other, never neither.
+        old = parent._children.get(name)
+        scope._parent = parent
+        scope._key = name
+        self._publish_scope(parent, name, old, scope)
+        parent._children = {**parent._children, name: scope}
+        if old is not None:
+            old._parent = None
+
+    def _delete_scope(self, parent: "BaseScope", name: str):
+        if name not in parent._children:
+            raise ScopeNotFoundException(f"Scope '{name}' not found")
+        children = dict(parent._children)
+        child_scope = children.pop(name)
+        parent._children = children
+        self._publish_scope(parent, name, child_scope, None)
+        child_scope._parent = None
+
+    def _publish_scope(self, parent: "BaseScope", name: str, old: Optional["BaseScope"], new: Optional["BaseScope"]):
+        for ancestor, prefix in self._ancestors(parent):
+            base = f"{prefix}{name}:"
+            index = dict(ancestor._index)
+            scope_index = dict(ancestor._scope_index)
+            if old is not None:
+                for path in old._index:
+                    index.pop(base + path, None)
+                for path in old._scope_index:
+                    scope_index.pop(base + path, None)
+                scope_index.pop(prefix + name, None)
+            if new is not None:
+                for path, entry in list(new._index.items()):
+                    index[base + path] = entry
+                for path, child in list(new._scope_index.items()):
+                    scope_index[base + path] = child
+                scope_index[prefix + name] = new
+            old_patterns = old._patterns if old is not None else None
+            new_patterns = new._patterns if new is not None else None
+            if old_patterns is not None or new_patterns is not None:
+                ancestor._patterns = _copy_patterns(
+                    ancestor._patterns,
+                    [(base + path, entry) for path, entry in list(new_patterns.items() if new_patterns is not None else ())],
+                    lambda path: old_patterns is not None and path.startswith(base) and path[len(base):] in old_patterns,
+                )
+            ancestor._index = index
+            ancestor._scope_index = scope_index
+
+    def _lazy_key(self, path: str) -> Optional[str]:
+        if not self._lazy or path in self._index or path in self._scope_index:
+            return None
+        prefix = None
+        for part in path.split(":"):
+            prefix = part if prefix is None else f"{prefix}:{part}"
+            if prefix in self._lazy:
+                return prefix
+        return None
+
+    def _set_lazy(self, name: str, loader: Callable[[], "BaseScope"]):
+        self._resolve_path(name)
+        self._lazy[name] = loader
+
+    def _attach_lazy(self, name: str, scope: "BaseScope"):
+        parent_scope, child_name = self._resolve_path(name)
+        self._set_scope(parent_scope, child_name, scope)
+        self._lazy.pop(name, None)
+
+    def _drop_lazy(self, name: str) -> bool:
+        if name not in self._lazy or name in self._scope_index:
+            return False
+        self._lazy.pop(name, None)
+        return True
 
-    def _invalidate_cache(self):
-        self._resolve_scope_cached.cache_clear()
-        self._resolve_rule_cached.cache_clear()
-    
     def _resolve_scope(self, path: str):
         if not path or "::" in path or any(part == "" for part in path.split(":")):
             raise ValueError(f"Invalid path: '{path}'")
@@ -69,130 +248,186 @@ class Scope(BaseScope, ScopeResolverMixin):
         super().__init__(name)
         self._lock: RLock = lock or RLock()
 
+    def _ensure_loaded(self, name: str):
+        key = self._lazy_key(name)
+        if key is None:
+            return
+        with self._writer_lock():
+            loader = self._lazy.get(key)
+            if loader is not None:
+                self._attach_lazy(key, loader())
+
+    def add_lazy(self, name: str, loader: Callable[[], "Scope"]):
+        with self._writer_lock():
+            self._set_lazy(name, loader)
+
     def has_rule(self, name: str) -> bool:
-        with self._lock:
-            try:
-                self._resolve_rule_cached(name)
-                return True
-            except RuleNotFoundException:
-                return False
+        if name in self._index:
+            return True
+        if WILDCARD in name:
+            return self._has_pattern(name)
+        self._ensure_loaded(name)
+        try:
+            self._lookup_entry(name, patterns=False)
+            return True
+        except RuleNotFoundException:
+            return False
     
     def get_rule(self, name: str) -> Rule:
-        with self._lock:
-            return self._resolve_rule_cached(name)
+        self._ensure_loaded(name)
+        return self._lookup_rule(name)
 
     def add_rule(self, name: str, rule: Rule):
-        with self._lock:
-            self._invalidate_cache()
+        with self._writer_lock():
+            if is_pattern(name):
+                return self._set_pattern(name, rule)
             scope, rule_name = self._resolve_path(name)
-            scope._rules[rule_name] = rule
+            self._set_rule(scope, rule_name, rule)
 
     def remove_rule(self, name: str):
-        with self._lock:
-            self._invalidate_cache()
+        with self._writer_lock():
+            if is_pattern(name):
+                return self._delete_pattern(name)
             scope, rule_name = self._resolve_path(name)
-            if rule_name not in scope._rules:
-                raise RuleNotFoundException(f"Rule '{rule_name}' not found")
-            del scope._rules[rule_name]
+            self._delete_rule(scope, rule_name)
+
+    def add_companion(self, name: str, kind: str, rule: Rule):
+        with self._writer_lock():
+            scope, rule_name = self._resolve_path(name)
+            self._set_companion(scope, rule_name, kind, rule)
+
+    def get_companion(self, name: str, kind: str) -> Optional[Rule]:
+        self._ensure_loaded(name)
+        return self._get_companion(name, kind)
 
     def has_scope(self, name: str) -> bool:
-        with self._lock:
-            try:
-                self._resolve_scope_cached(name)
-                return True
-            except ScopeNotFoundException:
-                return False
+        if name in self._scope_index or name in self._lazy:
+            return True
+        self._ensure_loaded(name)
+        try:
+            self._lookup_scope(name)
+            return True
+        except ScopeNotFoundException:
+            return False
 
     def get_scope(self, name: str) -> "Scope":
-        with self._lock:
-            return self._resolve_scope_cached(name)
+        self._ensure_loaded(name)
+        return self._lookup_scope(name)
 
     def add_scope(self, name: str, scope: "Scope"):
-        with self._lock:
-            self._invalidate_cache()
+        with self._writer_lock():
             parent_scope, child_name = self._resolve_path(name)
-            parent_scope._children[child_name] = scope
-            scope._parent = parent_scope
+            self._set_scope(parent_scope, child_name, scope)
 
     def remove_scope(self, name: str):
-        with self._lock:
-            self._invalidate_cache()
+        with self._writer_lock():
+            if self._drop_lazy(name):
+                return
             parent_scope, child_name = self._resolve_path(name)
-            if child_name not in parent_scope._children:
-                raise ScopeNotFoundException(f"Scope '{child_name}' not found")
-            child_scope = parent_scope._children[child_name]
-            child_scope._parent = None
-            del parent_scope._children[child_name]
+            self._delete_scope(parent_scope, child_name)
 
     def call(self, name: str, *args, **kwargs) -> Union[Response, bool]:
-        with self._lock:
-            rule = self._resolve_rule_cached(name)
-            return rule(*args, **kwargs)
+        entry = self._index.get(name)
+        if entry is None:
+            self._ensure_loaded(name)
+            entry = self._lookup_entry(name)
+        return entry[0](*args, **kwargs)
 
 class AsyncScope(BaseScope, ScopeResolverMixin):
     def __init__(self, name: str, lock: Optional[Lock] = None):
         super().__init__(name)
         self._lock: Lock = lock or Lock()
 
+    async def _ensure_loaded(self, name: str):
+        key = self._lazy_key(name)
+        if key is None:
+            return
+        async with self._writer_lock():
+            loader = self._lazy.get(key)
+            if loader is not None:
+                scope = loader()
+                if inspect.isawaitable(scope):
+                    scope = await scope
+                self._attach_lazy(key, scope)
+
+    async def add_lazy(self, name: str, loader: Callable[[], "AsyncScope"]):
+        async with self._writer_lock():
+            self._set_lazy(name, loader)
+
     async def has_rule(self, name: str) -> bool:
-        async with self._lock:
-            try:
-                self._resolve_rule_cached(name)
-                return True
-            except RuleNotFoundException:
-                return False
+        if name in self._index:
+            return True
+        if WILDCARD in name:
+            return self._has_pattern(name)
+        await self._ensure_loaded(name)
+        try:
+            self._lookup_entry(name, patterns=False)
+            return True
+        except RuleNotFoundException:
+            return False
 
     async def get_rule(self, name: str) -> Rule:
-        async with self._lock:
-            return self._resolve_rule_cached(name)
+        await self._ensure_loaded(name)
+        return self._lookup_rule(name)
 
     async def add_rule(self, name: str, rule: Rule):
-        async with self._lock:
-            self._invalidate_cache()
+        async with self._writer_lock():
+            if is_pattern(name):
+                return self._set_pattern(name, rule)
             scope, rule_name = self._resolve_path(name)
-            scope._rules[rule_name] = rule
+            self._set_rule(scope, rule_name, rule)
 
     async def remove_rule(self, name: str):
-        async with self._lock:
-            self._invalidate_cache()
+        async with self._writer_lock():
+            if is_pattern(name):
+                return self._delete_pattern(name)
+            scope, rule_name = self._resolve_path(name)
+            self._delete_rule(scope, rule_name)
+
+    async def add_companion(self, name: str, kind: str, rule: Rule):
+        async with self._writer_lock():
             scope, rule_name = self._resolve_path(name)
-            if rule_name not in scope._rules:
-                raise RuleNotFoundException(f"Rule '{rule_name}' not found")
-            del scope._rules[rule_name]
+            self._set_companion(scope, rule_name, kind, rule)
+
+    async def get_companion(self, name: str, kind: str) -> Optional[Rule]:
+        await self._ensure_loaded(name)
+        return self._get_companion(name, kind)
 
     async def has_scope(self, name: str) -> bool:
-        async with self._lock:
-            try:
-                self._resolve_scope_cached(name)
-                return True
-            except ScopeNotFoundException:
-                return False
+        if name in self._scope_index or name in self._lazy:
+            return True
+        await self._ensure_loaded(name)
+        try:
+            self._lookup_scope(name)
+            return True
+        except ScopeNotFoundException:
+            return False
 
     async def get_scope(self, name: str) -> "AsyncScope":
-        async with self._lock:
-            return self._resolve_scope_cached(name)
+        await self._ensure_loaded(name)
+        return self._lookup_scope(name)
 
     async def add_scope(self, name: str, scope: "AsyncScope"):
-        async with self._lock:
-            self._invalidate_cache()
+        async with self._writer_lock():
             parent_scope, child_name = self._resolve_path(name)
-            parent_scope._children[child_name] = scope
-            scope._parent = parent_scope
+            self._set_scope(parent_scope, child_name, scope)
 
     async def remove_scope(self, name: str):
-        async with self._lock:
-            self._invalidate_cache()
+        async with self._writer_lock():
+            if self._drop_lazy(name):
+                return
             parent_scope, child_name = self._resolve_path(name)
-            if child_name not in parent_scope._children:
-                raise ScopeNotFoundException(f"Scope '{child_name}' not found")
-            child_scope = parent_scope._children[child_name]
-            child_scope._parent = None
-            del parent_scope._children[child_name]
+            self._delete_scope(parent_scope, child_name)
 
     async def call(self, name: str, *args, **kwargs) -> Union[Response, bool]:
-        async with self._lock:
-            rule = self._resolve_rule_cached(name)
-            result = rule(*args, **kwargs)
-            if inspect.isawaitable(result):
-                result = await result
-            return result
+        entry = self._index.get(name)
+        if entry is None:
+            await self._ensure_loaded(name)
+            entry = self._lookup_entry(name)
+        rule, is_coroutine = entry
+        if is_coroutine:
+            return await rule(*args, **kwargs)
+        result = rule(*args, **kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
@@ -0,0 +1,37 @@
+from typing import Dict, Iterable, List, Tuple
+
+class RuleStats:
+    def __init__(self, smoothing: float = 0.2):
+        self.smoothing = smoothing
+        self._stats: Dict[str, Tuple[float, float]] = {}
+
+    def record(self, rule: str, elapsed: float, allowed: bool):
+        stats = self._stats.get(rule)
+        if stats is None:
+            self._stats[rule] = (elapsed, float(allowed))
+            return
+        latency, allow_rate = stats
+        self._stats[rule] = (
+            latency + self.smoothing * (elapsed - latency),
+            allow_rate + self.smoothing * (float(allowed) - allow_rate),
+        )
+
+    def latency(self, rule: str) -> float:
+        stats = self._stats.get(rule)
+        return stats[0] if stats is not None else 0.0
+
+    def cost(self, rule: str) -> float:
+        stats = self._stats.get(rule)
+        if stats is None:
+            return 0.0
+        latency, allow_rate = stats
+        return latency / max(allow_rate, 0.01)
+
+    def order(self, rules: Iterable[str]) -> List[str]:
+        return sorted(rules, key=self.cost)
+
+    def snapshot(self) -> Dict[str, Tuple[float, float]]:
+        return dict(self._stats)
+
+    def clear(self):
+        self._stats.clear()
@@ -0,0 +1,97 @@
+from typing import Any, Callable, Dict, ItemsView, Iterator, List, Optional, Tuple
+
+WILDCARD = "*"
+
+def is_pattern(path: str) -> bool:
+    if WILDCARD not in path:
+        return False
+    for part in path.split(":"):
+        if WILDCARD in part and part != WILDCARD:
+            raise ValueError(f"Wildcards must be a whole segment: '{path}'")
+    return True
+
+class _Node:
+    __slots__ = ("children", "entry")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.entry: Optional[Any] = None
+
+class PatternTrie:
+    # Rules registered under paths with ``*`` segments. A ``*`` matches exactly
+    # one segment. When several patterns match, the one with a literal segment
+    # furthest to the left wins: ``admin:*`` beats ``*:read`` for ``admin:read``.
+    __slots__ = ("_root", "_paths")
+
+    def __init__(self):
+        self._root = _Node()
+        self._paths: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._paths
+
+    def items(self) -> ItemsView[str, Any]:
+        return self._paths.items()
+
+    def insert(self, path: str, entry: Any):
+        node = self._root
+        for part in path.split(":"):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node()
+            node = child
+        node.entry = entry
+        self._paths[path] = entry
+
+    def remove(self, path: str):
+        parts = path.split(":")
+        nodes: List[_Node] = [self._root]
+        for part in parts:
+            node = nodes[-1].children.get(part)
+            if node is None:
+                return
+            nodes.append(node)
+        nodes[-1].entry = None
+        self._paths.pop(path, None)
+        for index in range(len(parts) - 1, -1, -1):
+            node = nodes[index + 1]
+            if node.entry is not None or node.children:
+                break
+            del nodes[index].children[parts[index]]
+
+    def match(self, path: str) -> Optional[Any]:
+        if not self._paths:
+            return None
+        return self._match(self._root, path.split(":"), 0)
+
+    def _match(self, node: _Node, parts: List[str], index: int) -> Optional[Any]:
+        if index == len(parts):
+            return node.entry
+        child = node.children.get(parts[index])
+        if child is not None:
+            entry = self._match(child, parts, index + 1)
+            if entry is not None:
+                return entry
+        child = node.children.get(WILDCARD)
+        if child is not None:
+            return self._match(child, parts, index + 1)
+        return None
+
+def _copy_patterns(
+    patterns: Optional[PatternTrie], items: List[Tuple[str, Any]], drop: Callable[[str], bool] = lambda path: False
+) -> Optional[PatternTrie]:
+    # Tries are never changed once readers can reach them: writers build a
+    # copy without the ``drop`` paths and with ``items``, then publish it.
+    copy = PatternTrie()
+    for path, entry in list(patterns.items() if patterns is not None else ()):
+        if not drop(path):
+            copy.insert(path, entry)
+    for path, entry in items:
+        copy.insert(path, entry)
+    return copy if len(copy) else None
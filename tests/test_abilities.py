@@ -0,0 +1,134 @@
+import asyncio
+import time
+from scutum import AsyncGate, DecisionCache, Deadlines, Gate, Policy, Scope
+
+class PostPolicy(Policy):
+    def create(self, user):
+        return user == "root"
+
+    def view(self, user):
+        return True
+
+    def edit(self, user, post):
+        return user == post
+
+def make_gate(**options):
+    gate = Gate(**options)
+    gate.add_policy("post", PostPolicy)
+    gate.add_scope("admin", Scope("admin"))
+    gate.add_rule("admin:panel", lambda user: user == "root")
+    gate.add_rule("admin:*", lambda user: True)
+    return gate
+
+def test_only_rules_taking_the_user_alone_are_evaluated():
+    gate = make_gate()
+    abilities = gate.abilities("root")
+    assert list(abilities) == ["admin:panel", "post:create", "post:view"]
+    assert "post:edit" not in abilities
+    assert list(gate.abilities("guest")) == ["post:view"]
+
+def test_prefix_limits_the_map_to_one_scope():
+    gate = make_gate()
+    assert list(gate.abilities("root", prefix="post")) == ["post:create", "post:view"]
+    assert gate.abilities("root", prefix="post:") == gate.abilities("root", prefix="post")
+
+def test_the_version_only_changes_with_the_allowed_set():
+    gate = make_gate()
+    root = gate.abilities("root")
+    assert gate.abilities("root", version_only=True) == root.version
+    assert gate.abilities("guest").version != root.version
+    assert root.to_dict() == {"version": root.version, "allowed": list(root)}
+
+def test_maps_are_cached_until_the_registry_changes():
+    calls = []
+    gate = make_gate(cache=DecisionCache())
+    gate.add_rule("report", lambda user: calls.append(user) or True)
+    first = gate.abilities("root")
+    assert gate.abilities("root") is first
+    assert calls == ["root"]
+    gate.add_rule("export", lambda user: True)
+    assert "export" in gate.abilities("root")
+    assert calls == ["root", "root"]
+
+def test_invalidate_drops_cached_maps():
+    calls = []
+    cache = DecisionCache()
+    gate = make_gate(cache=cache)
+    gate.add_rule("report", lambda user: calls.append(user) or True)
+    gate.abilities("root")
+    gate.abilities("guest")
+    cache.invalidate(rule="report", user="root")
+    gate.abilities("root")
+    gate.abilities("guest")
+    assert calls == ["root", "guest", "root"]
+
+def test_a_raising_rule_counts_as_denied_and_is_not_cached():
+    calls = []
+    gate = make_gate(cache=DecisionCache())
+
+    def flaky(user):
+        calls.append(user)
+        if len(calls) == 1:
+            raise RuntimeError("backend down")
+        return True
+
+    gate.add_rule("report", flaky)
+    assert "report" not in gate.abilities("root")
+    assert "post:view" in gate.abilities("root")
+    assert "report" in gate.abilities("root")
+    assert calls == ["root", "root"]
+
+def test_fallback_maps_are_not_cached():
+    calls = []
+    deadlines = Deadlines(timeout=0.01, fallback="open")
+    gate = Gate(cache=DecisionCache(), deadlines=deadlines)
+
+    def slow(user):
+        calls.append(user)
+        if len(calls) == 1:
+            time.sleep(0.05)
+        return False
+
+    gate.add_rule("report", slow)
+    assert "report" in gate.abilities("root")
+    assert "report" not in gate.abilities("root")
+    assert "report" not in gate.abilities("root")
+    assert calls == ["root", "root"]
+    deadlines.shutdown()
+
+def test_async_abilities_respect_the_concurrency_limit():
+    running = [0, 0]
+
+    async def rule(user):
+        running[0] += 1
+        running[1] = max(running)
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        return True
+
+    async def main():
+        gate = AsyncGate(batch_concurrency=2)
+        for index in range(6):
+            await gate.add_rule(f"rule{index}", rule)
+        limited = await gate.abilities("root")
+        peak, running[1] = running[1], 0
+        unlimited = await gate.abilities("root", concurrency=6)
+        return limited, peak, running[1]
+
+    abilities, limited, unlimited = asyncio.run(main())
+    assert len(abilities) == 6
+    assert limited == 2
+    assert unlimited == 6
+
+def test_async_raising_rules_count_as_denied():
+    async def main():
+        gate = AsyncGate(cache=DecisionCache())
+
+        async def broken(user):
+            raise RuntimeError("backend down")
+
+        await gate.add_rule("broken", broken)
+        await gate.add_rule("view", lambda user: True)
+        return await gate.abilities("root")
+
+    assert list(asyncio.run(main())) == ["view"]
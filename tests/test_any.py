@@ -0,0 +1,54 @@
+import asyncio
+from scutum import AsyncGate, Gate
+
+def counting_gate(results, **options):
+    gate = Gate(**options)
+    calls = []
+    for index, result in enumerate(results):
+        def rule(user, index=index, result=result):
+            calls.append(index)
+            return result
+        gate.add_rule(f"r{index}", rule)
+    return gate, calls
+
+def test_any_stops_at_the_first_allowed_rule():
+    gate, calls = counting_gate([False, True, True])
+    assert gate.any(["r0", "r1", "r2"], 1)
+    assert calls == [0, 1]
+
+def test_none_is_the_negation_of_any():
+    gate, _ = counting_gate([False, False])
+    assert gate.none(["r0", "r1"], 1)
+    assert not gate.any([], 1) and gate.none([], 1)
+
+def test_ordered_any_tries_cheap_and_often_allowed_rules_first():
+    gate, calls = counting_gate([False, True], order_rules=True)
+    for _ in range(3):
+        gate.any(["r0", "r1"], 1)
+    calls.clear()
+    assert gate.any(["r0", "r1"], 1)
+    assert calls == [1]
+
+def test_async_any_cancels_the_rest_once_one_allows():
+    async def main():
+        gate = AsyncGate()
+        cancelled = []
+
+        async def fast(user):
+            return True
+
+        async def slow(user):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return False
+
+        await gate.add_rule("fast", fast)
+        await gate.add_rule("slow", slow)
+        allowed = await asyncio.wait_for(gate.any(["slow", "fast"], 1), 1)
+        await asyncio.sleep(0)
+        return allowed, cancelled, await gate.none(["fast"], 1)
+
+    assert asyncio.run(main()) == (True, [True], False)
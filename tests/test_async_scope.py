@@ -0,0 +1,56 @@
+import asyncio
+import time
+from scutum import AsyncGate, AsyncScope
+
+def test_concurrent_checks_await_rules_without_holding_the_lock():
+    async def main():
+        gate = AsyncGate()
+
+        async def slow(user):
+            await asyncio.sleep(0.05)
+            return True
+
+        await gate.add_rule("slow", slow)
+        start = time.perf_counter()
+        results = await asyncio.gather(*[gate.allowed("slow", user) for user in range(20)])
+        return results, time.perf_counter() - start
+
+    results, elapsed = asyncio.run(main())
+    assert results == [True] * 20
+    assert elapsed < 0.5
+
+def test_a_rule_registered_while_another_is_awaited_is_visible_at_once():
+    async def main():
+        scope = AsyncScope("root")
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def waiting(user):
+            started.set()
+            await release.wait()
+            return True
+
+        await scope.add_rule("waiting", waiting)
+        pending = asyncio.ensure_future(scope.call("waiting", 1))
+        await started.wait()
+        await asyncio.wait_for(scope.add_rule("quick", lambda user: False), 1)
+        quick = await scope.call("quick", 1)
+        release.set()
+        return quick, await pending
+
+    assert asyncio.run(main()) == (False, True)
+
+def test_sync_rules_and_awaitable_results_are_resolved():
+    async def main():
+        scope = AsyncScope("root")
+        post = AsyncScope("post")
+        await scope.add_scope("post", post)
+        await post.add_rule("sync", lambda user: user == 1)
+
+        async def inner():
+            return True
+
+        await post.add_rule("awaitable", lambda user: inner())
+        return await scope.call("post:sync", 1), await scope.call("post:awaitable", 1)
+
+    assert asyncio.run(main()) == (True, True)
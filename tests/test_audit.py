@@ -0,0 +1,125 @@
+import asyncio
+import json
+import time
+import pytest
+from scutum import AsyncAuditLog, AsyncGate, AuditLog, Gate, JSONLinesSink
+from scutum.audit import DROP_OLDEST
+
+class ListSink:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.records = []
+        self.events = []
+        self.closed = False
+
+    def write(self, records):
+        self.events.append("write")
+        time.sleep(self.delay if len(self.events) == 1 else 0.0)
+        self.records.extend(records)
+        self.events.append("written")
+
+    def close(self):
+        self.events.append("close")
+        self.closed = True
+
+def test_unknown_overflow_policies_are_rejected():
+    with pytest.raises(ValueError):
+        AuditLog(ListSink(), overflow="block")
+
+def test_denies_are_always_recorded_and_allows_are_sampled():
+    sink = ListSink()
+    audit = AuditLog(sink, sample_rate=0.0)
+    gate = Gate(audit=audit)
+    gate.add_rule("edit", lambda user: user == "root")
+    for user in ("root", "guest", "root", "guest"):
+        gate.check("edit", user)
+    audit.close()
+    assert [record["decision"] for record in sink.records] == ["deny", "deny"]
+    assert audit.stats()["sampled_out"] == 2
+    assert sink.closed
+
+def test_a_full_queue_drops_the_newest_or_oldest_records():
+    newest = AuditLog(ListSink(), maxsize=2)
+    oldest = AuditLog(ListSink(), maxsize=2, overflow=DROP_OLDEST)
+    for audit in (newest, oldest):
+        audit.start = lambda: None
+        for index in range(4):
+            audit.record(f"rule{index}", 1, 0.0, "deny")
+    assert [record[1] for record in newest._queue] == ["rule0", "rule1"]
+    assert [record[1] for record in oldest._queue] == ["rule2", "rule3"]
+    assert newest.dropped == oldest.dropped == 2
+
+def test_records_are_written_in_batches():
+    sink = ListSink()
+    writes = []
+    write = sink.write
+    sink.write = lambda records: writes.append(len(records)) or write(records)
+    audit = AuditLog(sink, batch_size=3, flush_interval=60)
+    audit.start = lambda: None
+    for index in range(7):
+        audit.record("edit", index, 0.001, "deny")
+    audit.flush()
+    assert writes == [3, 3, 1]
+    assert audit.stats()["written"] == 7
+    assert sink.records[0]["latency_ms"] == 1.0
+
+def test_sink_errors_are_counted_not_raised():
+    class Broken:
+        def write(self, records):
+            raise OSError("disk full")
+
+    audit = AuditLog(Broken())
+    audit.record("edit", 1, 0.0, "deny")
+    audit.close()
+    assert audit.stats()["errors"] == 1
+
+def test_json_lines_sink_writes_and_rotates(tmp_path):
+    path = str(tmp_path / "audit.log")
+    sink = JSONLinesSink(path, max_bytes=100, backup_count=2)
+    audit = AuditLog(sink)
+    for index in range(6):
+        audit.record("edit", index, 0.0, "deny")
+        audit.flush()
+    audit.close()
+    lines = []
+    for name in ("audit.log.2", "audit.log.1", "audit.log"):
+        if (tmp_path / name).exists():
+            lines.extend((tmp_path / name).read_text().splitlines())
+    records = [json.loads(line) for line in lines]
+    assert records and all(record["rule"] == "edit" for record in records)
+    assert not (tmp_path / "audit.log.3").exists()
+
+def test_async_audit_log_writes_through_the_executor():
+    sink = ListSink()
+
+    async def main():
+        audit = AsyncAuditLog(sink)
+        gate = AsyncGate(audit=audit)
+        await gate.add_rule("edit", lambda user: False)
+        for user in range(5):
+            await gate.check("edit", user)
+        await audit.close()
+        return audit.stats()
+
+    stats = asyncio.run(main())
+    assert stats["written"] == 5 and stats["queued"] == 0
+    assert sink.events[-1] == "close"
+
+def test_async_close_waits_for_the_batch_being_written():
+    sink = ListSink(delay=0.1)
+
+    async def main():
+        audit = AsyncAuditLog(sink, batch_size=2)
+        for user in range(2):
+            audit.record("edit", user, 0.0, "deny")
+        while "write" not in sink.events:
+            await asyncio.sleep(0.005)
+        for user in range(2, 5):
+            audit.record("edit", user, 0.0, "deny")
+        await audit.close()
+        return audit.stats()
+
+    stats = asyncio.run(main())
+    assert sink.events == ["write", "written"] * 3 + ["close"]
+    assert [record["subject"] for record in sink.records] == [0, 1, 2, 3, 4]
+    assert stats["written"] == 5
@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from scutum import AsyncGate, AsyncPolicy, Gate, Policy, batch
+
+class PostPolicy(Policy):
+    loads = 0
+
+    def edit(self, user, post):
+        return user == post
+
+    @batch("edit")
+    def edit_many(self, user, posts):
+        PostPolicy.loads += 1
+        return [user == post for post in posts]
+
+    def view(self, user, post):
+        return post > 0
+
+class ShortPolicy(Policy):
+    def edit(self, user, post):
+        return True
+
+    @batch("edit")
+    def edit_many(self, user, posts):
+        return [True for post in posts[1:]]
+
+def test_check_many_calls_the_bulk_method_once():
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    PostPolicy.loads = 0
+    assert gate.allowed_many("post:edit", 1, [1, 2, 1]) == [True, False, True]
+    assert PostPolicy.loads == 1
+    assert gate.filter_allowed("post:edit", 2, [1, 2, 3]) == [2]
+
+def test_check_many_falls_back_to_the_rule_per_resource():
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    assert gate.filter_allowed("post:view", 1, [-1, 0, 3]) == [3]
+    assert gate.check_many("post:view", 1, []) == []
+
+def test_all_needs_every_rule():
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    assert gate.all(["post:edit", "post:view"], 1, 1)
+    assert not gate.all(["post:edit", "post:view"], 1, 2)
+
+def test_a_bulk_method_with_the_wrong_number_of_results_raises():
+    gate = Gate()
+    gate.add_policy("post", ShortPolicy)
+    with pytest.raises(ValueError):
+        gate.filter_allowed("post:edit", 1, [1, 2, 3])
+
+class AsyncPostPolicy(AsyncPolicy):
+    async def edit(self, user, post):
+        await asyncio.sleep(0.01)
+        return user == post
+
+    @batch("edit")
+    async def edit_many(self, user, posts):
+        return [user == post for post in posts][:-1]
+
+def test_async_check_many_limits_concurrency_and_checks_batch_length():
+    async def main():
+        gate = AsyncGate(batch_concurrency=2)
+        running, peak = [0], [0]
+
+        async def view(user, post):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+            return True
+
+        await gate.add_rule("view", view)
+        await gate.add_policy("post", AsyncPostPolicy)
+        assert await gate.allowed_many("view", 1, range(6)) == [True] * 6
+        assert peak[0] == 2
+        assert await gate.all(["view"], 1, 1)
+        with pytest.raises(ValueError):
+            await gate.check_many("post:edit", 1, [1, 2])
+
+    asyncio.run(main())
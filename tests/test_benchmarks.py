@@ -0,0 +1,14 @@
+from benchmarks.__main__ import CALIBRATION, compare
+
+def test_results_are_compared_relative_to_the_calibration():
+    baseline = {CALIBRATION: 1.0, "check": 1.0}
+    assert compare({CALIBRATION: 2.0, "check": 2.2}, {}, baseline, 0.25) == []
+    assert compare({CALIBRATION: 1.0, "check": 1.3}, {}, baseline, 0.25) == ["check"]
+
+def test_noisy_benchmarks_need_a_larger_slowdown_to_regress():
+    baseline = {"check": 1.0}
+    assert compare({"check": 1.5}, {"check": 0.2}, baseline, 0.25) == []
+    assert compare({"check": 1.7}, {"check": 0.2}, baseline, 0.25) == ["check"]
+
+def test_baselines_without_a_calibration_compare_directly():
+    assert compare({CALIBRATION: 3.0, "check": 1.0, "new": 1.0}, {}, {"check": 1.0}, 0.25) == []
@@ -0,0 +1,149 @@
+import asyncio
+import pytest
+from scutum import AsyncGate, AsyncPolicy, AsyncScope, Bulkhead, DecisionCache, batch
+from scutum.exceptions import BulkheadFullException
+
+def test_invalid_options_are_rejected():
+    with pytest.raises(ValueError):
+        Bulkhead(0)
+    with pytest.raises(ValueError):
+        Bulkhead(1, on_full="drop")
+
+def blocking_rule(release, running):
+    async def rule(user, *args):
+        running[0] += 1
+        running[1] = max(running)
+        await release.wait()
+        running[0] -= 1
+        return True
+    return rule
+
+def test_at_most_max_concurrent_rules_run_and_the_rest_queue_in_order():
+    async def main():
+        bulkhead = Bulkhead(2, max_queue=10)
+        release, running, order = asyncio.Event(), [0, 0], []
+
+        async def rule(user):
+            order.append(user)
+            running[0] += 1
+            running[1] = max(running)
+            await release.wait()
+            running[0] -= 1
+            return True
+
+        tasks = [asyncio.ensure_future(bulkhead.call(rule, user)) for user in range(6)]
+        await asyncio.sleep(0.01)
+        depth = bulkhead.queue_depth
+        release.set()
+        results = await asyncio.gather(*tasks)
+        return results, running[1], order, depth, bulkhead.stats()
+
+    results, peak, order, depth, stats = asyncio.run(main())
+    assert results == [True] * 6
+    assert peak == 2
+    assert order == list(range(6))
+    assert depth == 4
+    assert stats == {
+        "in_flight": 0, "queue_depth": 0, "max_queue_depth": 4, "completed": 6, "rejected": 0, "timed_out": 0,
+    }
+
+def test_a_full_queue_rejects_or_falls_back():
+    async def run(on_full):
+        bulkhead = Bulkhead(1, max_queue=1, on_full=on_full)
+        release, running = asyncio.Event(), [0, 0]
+        rule = blocking_rule(release, running)
+        tasks = [asyncio.ensure_future(bulkhead.call(rule, user)) for user in range(2)]
+        await asyncio.sleep(0)
+        try:
+            return await bulkhead.call(rule, 3), bulkhead.rejected
+        finally:
+            release.set()
+            await asyncio.gather(*tasks)
+
+    with pytest.raises(BulkheadFullException):
+        asyncio.run(run("reject"))
+    closed, rejected = asyncio.run(run("closed"))
+    assert closed.fallback and not closed.allowed and closed.status_code == 503
+    assert rejected == 1
+    open_, _ = asyncio.run(run("open"))
+    assert open_.fallback and open_.allowed
+
+def test_waiters_give_up_after_the_queue_timeout():
+    async def main():
+        bulkhead = Bulkhead(1, max_queue=5, queue_timeout=0.01, on_full="closed")
+        release, running = asyncio.Event(), [0, 0]
+        rule = blocking_rule(release, running)
+        first = asyncio.ensure_future(bulkhead.call(rule, 1))
+        await asyncio.sleep(0)
+        response = await bulkhead.call(rule, 2)
+        release.set()
+        await first
+        return response, bulkhead.stats()
+
+    response, stats = asyncio.run(main())
+    assert response.fallback
+    assert stats["timed_out"] == 1 and stats["rejected"] == 1
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+
+def test_a_cancelled_waiter_gives_back_its_place():
+    async def main():
+        bulkhead = Bulkhead(1, max_queue=5)
+        release, running = asyncio.Event(), [0, 0]
+        rule = blocking_rule(release, running)
+        first = asyncio.ensure_future(bulkhead.call(rule, 1))
+        waiting = asyncio.ensure_future(bulkhead.call(rule, 2))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        release.set()
+        await first
+        await asyncio.gather(waiting, return_exceptions=True)
+        return await bulkhead.call(rule, 3), bulkhead.stats()
+
+    result, stats = asyncio.run(main())
+    assert result is True
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+
+def test_fallbacks_are_not_cached():
+    async def main():
+        bulkhead = Bulkhead(1, on_full="open")
+        gate = AsyncGate(cache=DecisionCache(), bulkheads={"billing": bulkhead})
+        release, calls = asyncio.Event(), []
+
+        async def pay(user):
+            calls.append(user)
+            await release.wait()
+            return False
+
+        await gate.add_scope("billing", AsyncScope("billing"))
+        await gate.add_rule("billing:pay", pay)
+        first = asyncio.ensure_future(gate.check("billing:pay", 1))
+        await asyncio.sleep(0)
+        fallback = await gate.check("billing:pay", 2)
+        release.set()
+        await first
+        return fallback, await gate.check("billing:pay", 2), calls
+
+    fallback, again, calls = asyncio.run(main())
+    assert fallback.fallback and fallback.allowed
+    assert again is False
+    assert calls == [1, 2]
+
+def test_the_longest_prefix_picks_the_bulkhead_and_a_batch_takes_one_slot():
+    class Invoices(AsyncPolicy):
+        async def view(self, user, invoice):
+            return True
+
+        @batch("view")
+        async def view_many(self, user, invoices):
+            return [True] * len(invoices)
+
+    async def main():
+        billing, view = Bulkhead(4), Bulkhead(1)
+        gate = AsyncGate(bulkheads={"billing": billing, "billing:view": view})
+        await gate.add_policy("billing", Invoices)
+        return await gate.allowed_many("billing:view", 1, range(10)), billing.stats(), view.stats()
+
+    results, billing, view = asyncio.run(main())
+    assert results == [True] * 10
+    assert view["completed"] == 1
+    assert billing["completed"] == 0
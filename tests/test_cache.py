@@ -0,0 +1,138 @@
+import asyncio
+import time
+import pytest
+import scutum.cache
+from scutum import AsyncGate, DecisionCache, Deadlines, Gate, Response, uncached
+from scutum.cache import MISSING
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scutum.cache, "monotonic", clock)
+    return clock
+
+def counting_gate(cache, result=True):
+    gate = Gate(cache=cache)
+    calls = []
+
+    def edit(user, post):
+        calls.append((user, post))
+        return result
+
+    gate.add_rule("edit", edit)
+    return gate, calls
+
+def test_repeated_checks_are_answered_from_the_cache():
+    cache = DecisionCache()
+    gate, calls = counting_gate(cache)
+    assert gate.allowed("edit", 1, 2) and gate.allowed("edit", 1, 2)
+    assert calls == [(1, 2)]
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+def test_least_recently_used_entries_are_evicted():
+    cache = DecisionCache(maxsize=2)
+    gate, calls = counting_gate(cache)
+    gate.check("edit", 1, 1)
+    gate.check("edit", 1, 2)
+    gate.check("edit", 1, 1)
+    gate.check("edit", 1, 3)
+    assert cache.evictions == 1
+    gate.check("edit", 1, 1)
+    gate.check("edit", 1, 2)
+    assert calls == [(1, 1), (1, 2), (1, 3), (1, 2)]
+
+def test_entries_expire_with_the_rule_ttl(clock):
+    cache = DecisionCache(ttl=60, rule_ttls={"edit": 5})
+    gate, calls = counting_gate(cache)
+    gate.check("edit", 1, 1)
+    clock.now += 4
+    gate.check("edit", 1, 1)
+    clock.now += 2
+    gate.check("edit", 1, 1)
+    assert len(calls) == 2
+
+def test_invalidate_by_rule_scope_and_user():
+    cache = DecisionCache()
+    for rule in ("post:edit", "post:view", "page:edit"):
+        for user in (1, 2):
+            cache.set(cache.key(rule, user, 1), True)
+    cache.invalidate(rule="post:view", user=1)
+    assert cache.get(cache.key("post:view", 1, 1)) is MISSING
+    assert cache.get(cache.key("post:view", 2, 1)) is True
+    cache.invalidate(scope="post")
+    assert cache.get(cache.key("post:edit", 2, 1)) is MISSING
+    assert cache.get(cache.key("page:edit", 1, 1)) is True
+
+def test_a_decision_computed_across_an_invalidation_is_not_stored():
+    cache = DecisionCache()
+    gate = Gate(cache=cache)
+
+    def edit(user, post):
+        cache.invalidate()
+        return True
+
+    gate.add_rule("edit", edit)
+    gate.check("edit", 1, 1)
+    assert cache.stats()["size"] == 0
+
+def test_registry_changes_clear_the_cache():
+    cache = DecisionCache()
+    gate, calls = counting_gate(cache)
+    gate.check("edit", 1, 1)
+    gate.add_rule("view", lambda user: True)
+    gate.check("edit", 1, 1)
+    assert len(calls) == 2
+
+def test_uncached_rules_and_unhashable_arguments_always_run():
+    cache = DecisionCache()
+    gate = Gate(cache=cache)
+    calls = []
+    gate.add_rule("live", uncached(lambda user: calls.append(user) or True))
+    gate.add_rule("tags", lambda user, tags: calls.append(tags) or True)
+    gate.check("live", 1)
+    gate.check("live", 1)
+    gate.check("tags", 1, ["a"])
+    gate.check("tags", 1, ["a"])
+    assert len(calls) == 4 and cache.stats()["size"] == 0
+
+def test_fallback_decisions_are_not_cached():
+    cache = DecisionCache()
+    gate = Gate(cache=cache, deadlines=Deadlines(timeout=0.01, fallback="open"))
+    calls = []
+
+    def slow(user):
+        calls.append(user)
+        if len(calls) == 1:
+            time.sleep(0.05)
+        return False
+
+    gate.add_rule("slow", slow)
+    first = gate.check("slow", 1)
+    assert first.fallback and first.allowed
+    assert gate.check("slow", 1) is False
+    gate.deadlines.shutdown()
+
+def test_async_gate_uses_the_cache():
+    async def main():
+        cache = DecisionCache()
+        gate = AsyncGate(cache=cache)
+        calls = []
+
+        async def edit(user):
+            calls.append(user)
+            return Response.deny("No")
+
+        await gate.add_rule("edit", edit)
+        first = await gate.check("edit", 1)
+        second = await gate.check("edit", 1)
+        return first, second, calls
+
+    first, second, calls = asyncio.run(main())
+    assert first is second and calls == [1]
@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from scutum import AsyncGate, AsyncPolicy, Coalescer, batch
+
+def make_policy(calls, results=None, error=None):
+    class Posts(AsyncPolicy):
+        async def edit(self, user, post, *args):
+            calls.append(("edit", user, [post]))
+            return user == post
+
+        @batch("edit")
+        async def edit_many(self, user, posts, *args):
+            calls.append(("edit_many", user, list(posts)))
+            await asyncio.sleep(0)
+            if error is not None:
+                raise error
+            if results is not None:
+                return results
+            return [user == post for post in posts]
+    return Posts
+
+async def make_gate(coalesce, **policy):
+    calls = []
+    gate = AsyncGate(coalesce=coalesce)
+    await gate.add_policy("posts", make_policy(calls, **policy))
+    return gate, calls
+
+def test_checks_in_one_tick_share_one_loader_call_per_user():
+    async def main():
+        gate, calls = await make_gate(Coalescer())
+        results = await asyncio.gather(
+            gate.allowed("posts:edit", 1, 1),
+            gate.allowed("posts:edit", 1, 2),
+            gate.allowed("posts:edit", 2, 2),
+            gate.allowed("posts:edit", 1, 3),
+        )
+        return results, calls
+
+    results, calls = asyncio.run(main())
+    assert results == [True, False, True, False]
+    assert sorted(calls) == [("edit_many", 1, [1, 2, 3]), ("edit_many", 2, [2])]
+
+def test_identical_checks_in_flight_are_deduplicated():
+    async def main():
+        coalesce = Coalescer()
+        gate, calls = await make_gate(coalesce)
+        results = await asyncio.gather(*[gate.allowed("posts:edit", 1, 1) for _ in range(5)])
+        return results, calls, coalesce.stats()
+
+    results, calls, stats = asyncio.run(main())
+    assert results == [True] * 5
+    assert calls == [("edit_many", 1, [1])]
+    assert stats == {"checks": 5, "batches": 1, "deduplicated": 4}
+
+def test_extra_arguments_split_groups():
+    async def main():
+        gate, calls = await make_gate(Coalescer())
+        await asyncio.gather(
+            gate.allowed("posts:edit", 1, 1, "draft"),
+            gate.allowed("posts:edit", 1, 2, "draft"),
+            gate.allowed("posts:edit", 1, 3, "published"),
+        )
+        return calls
+
+    assert sorted(asyncio.run(main())) == [("edit_many", 1, [1, 2]), ("edit_many", 1, [3])]
+
+def test_max_batch_splits_large_groups():
+    async def main():
+        gate, calls = await make_gate(Coalescer(max_batch=2))
+        results = await asyncio.gather(*[gate.allowed("posts:edit", 1, post) for post in range(5)])
+        return results, calls
+
+    results, calls = asyncio.run(main())
+    assert results == [False, True, False, False, False]
+    assert [len(call[2]) for call in calls] == [2, 2, 1]
+
+def test_loader_errors_reach_every_waiting_check():
+    async def main():
+        gate, calls = await make_gate(Coalescer(), error=RuntimeError("backend down"))
+        results = await asyncio.gather(
+            *[gate.check("posts:edit", 1, post) for post in range(3)], return_exceptions=True
+        )
+        return results, calls
+
+    results, calls = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert len(calls) == 1
+
+def test_a_loader_returning_the_wrong_number_of_results_raises():
+    async def main():
+        gate, _ = await make_gate(Coalescer(), results=[True])
+        return await asyncio.gather(
+            *[gate.check("posts:edit", 1, post) for post in range(3)], return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_a_failed_batch_does_not_stay_in_flight():
+    async def main():
+        coalesce = Coalescer()
+        gate, calls = await make_gate(coalesce, results=[])
+        with pytest.raises(ValueError):
+            await gate.check("posts:edit", 1, 1)
+        with pytest.raises(ValueError):
+            await gate.check("posts:edit", 1, 1)
+        return calls, coalesce.stats()
+
+    calls, stats = asyncio.run(main())
+    assert len(calls) == 2
+    assert stats["deduplicated"] == 0
+
+def test_unhashable_resources_are_loaded_alone():
+    async def main():
+        gate, calls = await make_gate(Coalescer(resource_key=lambda *args: args))
+        results = await asyncio.gather(gate.allowed("posts:edit", 1, [1]), gate.allowed("posts:edit", 1, [2]))
+        return results, calls
+
+    results, calls = asyncio.run(main())
+    assert results == [False, False]
+    assert calls == [("edit_many", 1, [[1]]), ("edit_many", 1, [[2]])]
+
+def test_rules_without_a_batch_method_run_as_usual():
+    async def main():
+        gate = AsyncGate(coalesce=Coalescer())
+        await gate.add_rule("view", lambda user, post: user == post)
+        return await asyncio.gather(gate.allowed("view", 1, 1), gate.allowed("view", 1, 2))
+
+    assert asyncio.run(main()) == [True, False]
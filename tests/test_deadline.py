@@ -0,0 +1,161 @@
+import asyncio
+import threading
+import time
+from contextvars import ContextVar
+import pytest
+from scutum import AsyncGate, DecisionCache, Deadlines, Gate, Policy, deadline
+from scutum.deadline import remaining
+
+request_id = ContextVar("request_id", default=None)
+
+class Reports(Policy):
+    def view(self, user):
+        time.sleep(0.05)
+        return True
+
+    def export(self, user):
+        return True
+
+def test_unknown_fallbacks_are_rejected():
+    with pytest.raises(ValueError):
+        Deadlines(fallback="maybe")
+    with pytest.raises(ValueError):
+        Deadlines(fallbacks={"reports": "maybe"})
+
+def test_a_slow_rule_gets_the_fallback_of_its_longest_prefix():
+    deadlines = Deadlines(timeout=0.01, fallbacks={"reports": "open", "reports:view": "closed"})
+    gate = Gate(deadlines=deadlines)
+    gate.add_policy("reports", Reports)
+
+    def slow(user):
+        time.sleep(0.05)
+        return True
+
+    gate.add_rule("slow", slow)
+    view = gate.check("reports:view", 1)
+    assert view.timed_out and view.fallback and not view.allowed
+    assert gate.check("reports:export", 1) is True
+    assert gate.check("slow", 1).allowed is False
+    assert deadlines.timeouts == 2
+    deadlines.shutdown()
+
+def test_rule_timeouts_override_the_check_timeout_by_prefix():
+    deadlines = Deadlines(timeout=0.01, rule_timeouts={"reports": 1.0}, fallback="open")
+    gate = Gate(deadlines=deadlines)
+    gate.add_policy("reports", Reports)
+    assert gate.check("reports:view", 1) is True
+    assert deadlines.timeouts == 0
+    deadlines.shutdown()
+
+def test_the_enclosing_deadline_shortens_rule_timeouts():
+    deadlines = Deadlines(rule_timeouts={"reports": 1.0})
+    with deadline(0.2):
+        assert 0 < deadlines.timeout_for("reports:view") <= 0.2
+        with deadline(5):
+            assert remaining() <= 0.2
+    assert deadlines.timeout_for("reports:view") == 1.0
+    assert deadlines.timeout_for("other") is None
+
+def test_a_spent_budget_answers_with_the_fallback_without_calling_the_rule():
+    deadlines = Deadlines(timeout=1.0)
+    gate = Gate(deadlines=deadlines)
+    calls = []
+    gate.add_rule("edit", lambda user: calls.append(user) or True)
+    with deadline(0):
+        assert gate.check("edit", 1).timed_out
+    assert calls == []
+    deadlines.shutdown()
+
+def test_max_workers_per_scope_keeps_a_hanging_scope_from_taking_the_pool():
+    release = threading.Event()
+    deadlines = Deadlines(timeout=0.01, max_workers=4, max_workers_per_scope=1)
+    gate = Gate(deadlines=deadlines)
+
+    class Slow(Policy):
+        def hang(self, user):
+            release.wait(1)
+            return True
+
+    class Posts(Policy):
+        def view(self, user):
+            return True
+
+    gate.add_policy("reports", Slow)
+    gate.add_policy("posts", Posts)
+    try:
+        assert gate.check("reports:hang", 1).timed_out
+        start = time.perf_counter()
+        assert gate.check("reports:hang", 2).timed_out
+        assert time.perf_counter() - start < 0.01 + 0.05
+        assert gate.check("posts:view", 1) is True
+    finally:
+        release.set()
+        deadlines.shutdown()
+    assert gate.check("posts:view", 1) is True
+
+def test_rules_run_in_a_copy_of_the_callers_context():
+    deadlines = Deadlines(timeout=1.0)
+    gate = Gate(deadlines=deadlines)
+    gate.add_rule("edit", lambda user: request_id.get() == "abc")
+    token = request_id.set("abc")
+    try:
+        assert gate.check("edit", 1) is True
+    finally:
+        request_id.reset(token)
+    assert gate.check("edit", 1) is False
+    deadlines.shutdown()
+
+def test_async_rules_are_cancelled_on_timeout():
+    cancelled = []
+
+    async def slow(user):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(user)
+            raise
+        return True
+
+    async def main():
+        gate = AsyncGate(deadlines=Deadlines(timeout=0.01, fallback="open"))
+        await gate.add_rule("slow", slow)
+        return await gate.check("slow", 1)
+
+    response = asyncio.run(main())
+    assert response.timed_out and response.allowed
+    assert cancelled == [1]
+
+def test_any_shares_one_budget_across_its_rules():
+    deadlines = Deadlines(timeout=0.03)
+    gate = Gate(deadlines=deadlines)
+
+    def slow(user):
+        time.sleep(0.02)
+        return False
+
+    for name in ("a", "b", "c", "d"):
+        gate.add_rule(name, slow)
+    start = time.perf_counter()
+    assert gate.any(["a", "b", "c", "d"], 1) is False
+    assert time.perf_counter() - start < 0.07
+    assert deadlines.timeouts >= 1
+    deadlines.shutdown()
+
+def test_async_timeouts_are_not_cached():
+    calls = []
+
+    async def slow(user):
+        calls.append(user)
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+        return False
+
+    async def main():
+        gate = AsyncGate(cache=DecisionCache(), deadlines=Deadlines(timeout=0.01, fallback="open"))
+        await gate.add_rule("slow", slow)
+        return await gate.check("slow", 1), await gate.check("slow", 1), await gate.check("slow", 1)
+
+    first, second, third = asyncio.run(main())
+    assert first.fallback and first.allowed
+    assert second is False and third is False
+    assert calls == [1, 1]
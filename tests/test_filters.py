@@ -0,0 +1,110 @@
+import asyncio
+import sqlite3
+import pytest
+from scutum import ALLOW_ALL, DENY_ALL, AsyncGate, AsyncPolicy, Field, Gate, Policy, RecordSource, SQLSource, filters
+from scutum.filters import to_sql
+
+ROWS = [
+    {"id": 1, "author_id": 1, "score": 5},
+    {"id": 2, "author_id": 2, "score": None},
+    {"id": 3, "author_id": None, "score": 1},
+    {"id": 4, "author_id": None, "score": None},
+    {"id": 5, "author_id": 3, "score": 9},
+]
+
+author, score = Field("author_id"), Field("score")
+
+PREDICATES = [
+    ALLOW_ALL,
+    DENY_ALL,
+    author == 1,
+    author != 1,
+    author == None,
+    author != None,
+    ~(author == None),
+    score < 6,
+    score >= 5,
+    ~(score < 6),
+    author.in_([1, 3]),
+    ~author.in_([1, 3]),
+    author.in_([1, None]),
+    ~author.in_([1, None]),
+    author.in_([]),
+    ~author.in_([]),
+    author.in_([None]),
+    (author == 1) | (score > 4),
+    (author != 1) & (score > 0),
+    ~((author != 1) & (score > 0)),
+    ~((author == 2) | (score < 3)),
+    score > None,
+    ~(score > None),
+]
+
+@pytest.fixture
+def connection():
+    connection = sqlite3.connect(":memory:")
+    connection.execute('CREATE TABLE "posts" ("id" INTEGER, "author_id" INTEGER, "score" INTEGER)')
+    connection.executemany("INSERT INTO posts VALUES (?, ?, ?)", [tuple(row.values()) for row in ROWS])
+    yield connection
+    connection.close()
+
+def filter_gate(predicate):
+    class PostPolicy(Policy):
+        def edit(self, user, post):
+            return True
+
+        @filters("edit")
+        def edit_filter(self, user):
+            return predicate
+
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    return gate
+
+@pytest.mark.parametrize("predicate", PREDICATES, ids=repr)
+def test_sql_and_in_memory_filters_select_the_same_rows(connection, predicate):
+    gate = filter_gate(predicate)
+    in_sql = [row[0] for row in gate.filter("post:edit", 1, SQLSource(connection, "posts", ["id"]))]
+    in_memory = [row["id"] for row in gate.filter("post:edit", 1, ROWS)]
+    assert sorted(in_sql) == sorted(in_memory)
+
+def test_objects_are_read_by_attribute():
+    class Post:
+        def __init__(self, author_id):
+            self.author_id = author_id
+
+    posts = [Post(1), Post(None), Post(2)]
+    assert RecordSource(posts).apply(author != 1) == [posts[2]]
+
+def test_sql_uses_parameters_and_quotes_identifiers():
+    assert to_sql((Field('we"ird') == "x") & author.in_([1, None])) == (
+        '("we""ird" = ?) AND ("author_id" IN (?) OR "author_id" IS NULL)', ["x", 1]
+    )
+    assert SQLSource(None, "posts", ["id"]).query(author == None) == (
+        'SELECT "id" FROM "posts" WHERE "author_id" IS NULL', []
+    )
+
+def test_actions_without_a_filter_check_each_record():
+    class PostPolicy(Policy):
+        def edit(self, user, post):
+            return post["author_id"] == user
+
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    assert [row["id"] for row in gate.filter("post:edit", 1, ROWS)] == [1]
+
+def test_async_filter_supports_async_predicates(connection):
+    class PostPolicy(AsyncPolicy):
+        async def edit(self, user, post):
+            return True
+
+        @filters("edit")
+        async def edit_filter(self, user):
+            return author == user
+
+    async def main():
+        gate = AsyncGate()
+        await gate.add_policy("post", PostPolicy)
+        return await gate.filter("post:edit", 1, SQLSource(connection, "posts", ["id"]))
+
+    assert asyncio.run(main()) == [(1,)]
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import pytest
+from scutum import AsyncGate, AsyncPolicy, Gate, Policy, Scope, batch
+from scutum.exceptions import FrozenGateException, RuleNotFoundException, ScopeNotFoundException
+
+class PostPolicy(Policy):
+    def edit(self, user, post):
+        return user == post
+
+    @batch("edit")
+    def edit_many(self, user, posts):
+        return [user == post for post in posts]
+
+def make_gate():
+    gate = Gate()
+    gate.add_rule("top", lambda user: True)
+    gate.add_scope("admin", Scope("admin"))
+    gate.add_scope("admin:users", Scope("users"))
+    gate.add_rule("admin:users:delete", lambda user: user == "root")
+    gate.add_policy("post", PostPolicy)
+    return gate
+
+def test_a_frozen_gate_answers_like_the_mutable_one():
+    gate = make_gate().freeze()
+    assert gate.frozen
+    assert gate.allowed("admin:users:delete", "root") and not gate.allowed("admin:users:delete", 1)
+    assert gate.allowed_many("post:edit", 1, [1, 2]) == [True, False]
+    assert gate.has_scope("admin:users") and not gate.has_scope("admin:groups")
+    assert gate.has_rule("post:edit") and not gate.has_rule("post:view")
+    assert gate.rules().keys() == {"top"}
+
+def test_lookup_errors_match_the_mutable_gate():
+    gate = make_gate().freeze()
+    with pytest.raises(ScopeNotFoundException):
+        gate.check("billing:view", 1)
+    with pytest.raises(RuleNotFoundException):
+        gate.check("admin:users:create", 1)
+    with pytest.raises(ValueError):
+        gate.check("admin::users", 1)
+
+@pytest.mark.parametrize("write", [
+    lambda gate: gate.add_rule("new", lambda user: True),
+    lambda gate: gate.add_rule("missing:new", lambda user: True),
+    lambda gate: gate.override_rule("top", lambda user: False),
+    lambda gate: gate.add_scope("billing", Scope("billing")),
+    lambda gate: gate.add_policy("page", PostPolicy),
+    lambda gate: gate.lazy_policy("page", "pages:PagePolicy"),
+    lambda gate: gate.remove_rule("top"),
+    lambda gate: gate.remove_scope("admin"),
+    lambda gate: gate.clear(),
+])
+def test_every_write_raises(write):
+    gate = make_gate().freeze()
+    with pytest.raises(FrozenGateException):
+        write(gate)
+
+def test_scopes_returns_a_read_only_view():
+    scopes = make_gate().freeze().scopes()
+    assert sorted(scopes) == ["admin", "post"]
+    assert "users:delete" in scopes["admin"]
+    with pytest.raises(TypeError):
+        scopes["billing"] = {}
+
+def test_scopes_kept_from_before_the_freeze_do_not_change_it():
+    gate = Gate()
+    admin = Scope("admin")
+    gate.add_scope("admin", admin)
+    admin.add_rule("delete", lambda user: False)
+    gate.freeze()
+    admin.add_rule("create", lambda user: True)
+    admin.remove_rule("delete")
+    assert not gate.has_rule("admin:create")
+    assert not gate.allowed("admin:delete", 1)
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_workers_share_the_frozen_registry():
+    gate = make_gate().freeze()
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        os.write(write, b"1" if gate.allowed("admin:users:delete", "root") else b"0")
+        os._exit(0)
+    os.close(write)
+    os.waitpid(pid, 0)
+    with os.fdopen(read, "rb") as output:
+        assert output.read() == b"1"
+
+def test_async_freeze_runs_pending_registrations():
+    class AsyncPostPolicy(AsyncPolicy):
+        async def edit(self, user, post):
+            return user == post
+
+    async def main():
+        gate = AsyncGate()
+
+        @gate.rule("top")
+        def top(user):
+            return True
+
+        gate.policy("post")(AsyncPostPolicy)
+        await gate.freeze()
+        with pytest.raises(FrozenGateException):
+            await gate.add_rule("missing:new", top)
+        return await gate.allowed("top", 1), await gate.allowed("post:edit", 1, 1), sorted(gate.scopes())
+
+    assert asyncio.run(main()) == (True, True, ["post"])
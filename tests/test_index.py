@@ -0,0 +1,40 @@
+import gc
+import weakref
+from scutum import Gate, Policy, Scope
+
+class PostPolicy(Policy):
+    def edit(self, user, post):
+        return user == post
+
+def test_each_gate_keeps_its_own_path_index():
+    first, second = Gate(), Gate()
+    first.add_policy("post", PostPolicy)
+    second.add_rule("view", lambda user: True)
+    assert set(first._root._index) == {"post:edit"}
+    assert set(second._root._index) == {"view"}
+    first.add_rule("other", lambda user: True)
+    assert set(second._root._index) == {"view"}
+
+def test_index_follows_rule_and_scope_changes():
+    gate = Gate()
+    gate.add_scope("post", Scope("post"))
+    gate.add_rule("post:edit", lambda user: True)
+    assert gate.allowed("post:edit", 1)
+    gate.override_rule("post:edit", lambda user: False)
+    assert not gate.allowed("post:edit", 1)
+    gate.remove_rule("post:edit")
+    assert not gate.has_rule("post:edit")
+    gate.remove_scope("post")
+    assert "post" not in gate._root._scope_index
+
+def test_removed_and_cleared_scopes_are_not_kept_alive():
+    gate = Gate()
+    scope = Scope("post")
+    gate.add_scope("post", scope)
+    gate.add_rule("post:edit", lambda user: True)
+    gate.allowed("post:edit", 1)
+    reference = weakref.ref(scope)
+    gate.clear()
+    del scope
+    gc.collect()
+    assert reference() is None
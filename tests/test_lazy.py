@@ -0,0 +1,79 @@
+import asyncio
+import sys
+import textwrap
+import pytest
+from scutum import AsyncGate, Gate
+
+@pytest.fixture
+def billing(tmp_path, monkeypatch):
+    (tmp_path / "lazy_billing.py").write_text(textwrap.dedent("""
+        from scutum import AsyncPolicy, Policy
+
+        IMPORTS = [0]
+        IMPORTS[0] += 1
+
+        class InvoicePolicy(Policy):
+            def view(self, user):
+                return user == "owner"
+
+        class AsyncInvoicePolicy(AsyncPolicy):
+            async def view(self, user):
+                return user == "owner"
+
+        NOT_A_POLICY = object()
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_billing"
+    sys.modules.pop("lazy_billing", None)
+
+def test_the_module_is_imported_on_first_use_only(billing):
+    gate = Gate()
+    gate.lazy_policy("invoice", f"{billing}:InvoicePolicy")
+    assert gate.has_scope("invoice")
+    assert billing not in sys.modules
+    assert gate.allowed("invoice:view", "owner")
+    assert not gate.allowed("invoice:view", "guest")
+    assert sys.modules[billing].IMPORTS == [1]
+
+def test_dotted_targets_and_has_rule_load_the_policy(billing):
+    gate = Gate()
+    gate.lazy_policy("invoice", f"{billing}.InvoicePolicy")
+    assert gate.has_rule("invoice:view")
+    assert not gate.has_rule("invoice:edit")
+
+def test_a_taken_name_is_rejected(billing):
+    gate = Gate()
+    gate.lazy_policy("invoice", f"{billing}:InvoicePolicy")
+    with pytest.raises(KeyError):
+        gate.lazy_policy("invoice", f"{billing}:InvoicePolicy")
+
+def test_a_target_that_is_not_a_policy_raises_on_load(billing):
+    gate = Gate()
+    gate.lazy_policy("invoice", f"{billing}:NOT_A_POLICY")
+    with pytest.raises(TypeError):
+        gate.allowed("invoice:view", "owner")
+
+def test_removing_a_lazy_scope_never_imports_it(billing):
+    gate = Gate()
+    gate.lazy_policy("invoice", f"{billing}:InvoicePolicy")
+    gate.remove_scope("invoice")
+    assert not gate.has_scope("invoice")
+    assert billing not in sys.modules
+
+def test_freeze_and_abilities_load_lazy_policies(billing):
+    gate = Gate()
+    gate.lazy_policy("invoice", f"{billing}:InvoicePolicy")
+    assert list(gate.abilities("owner")) == ["invoice:view"]
+    frozen = Gate()
+    frozen.lazy_policy("invoice", f"{billing}:InvoicePolicy")
+    frozen.freeze()
+    assert frozen.allowed("invoice:view", "owner")
+
+def test_async_lazy_policy(billing):
+    async def main():
+        gate = AsyncGate()
+        await gate.lazy_policy("invoice", f"{billing}:AsyncInvoicePolicy")
+        loaded = billing in sys.modules
+        return loaded, await gate.allowed("invoice:view", "owner")
+
+    assert asyncio.run(main()) == (False, True)
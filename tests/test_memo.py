@@ -0,0 +1,90 @@
+import asyncio
+import pytest
+from scutum import AsyncGate, Deadlines, Gate, Response
+from scutum.memo import AsyncRequestMemo, RequestMemo
+
+def counting_gate(**options):
+    gate = Gate(**options)
+    calls = []
+
+    def edit(user, post):
+        calls.append((user, post))
+        return user == post
+
+    gate.add_rule("edit", edit)
+    gate.add_rule("view", lambda user, post: calls.append(("view", post)) or True)
+    return gate, calls
+
+def test_a_request_memo_evaluates_each_decision_once():
+    gate, calls = counting_gate()
+    memo = RequestMemo(gate)
+    assert memo.allowed("edit", 1, 1) and memo.allowed("edit", 1, 1)
+    assert memo.denied("edit", 1, 2)
+    assert calls == [(1, 1), (1, 2)]
+    assert memo.stats() == {"hits": 1, "misses": 2, "size": 2}
+
+def test_each_request_starts_with_an_empty_memo():
+    gate, calls = counting_gate()
+    RequestMemo(gate).check("edit", 1, 1)
+    RequestMemo(gate).check("edit", 1, 1)
+    assert len(calls) == 2
+
+def test_memo_any_and_none_reuse_memoized_decisions():
+    gate, calls = counting_gate()
+    memo = RequestMemo(gate)
+    memo.check("edit", 1, 2)
+    assert memo.any(["edit", "view"], 1, 2)
+    assert not memo.none(["edit", "view"], 1, 2)
+    assert calls == [(1, 2), ("view", 2)]
+
+def test_unhashable_arguments_are_not_memoized():
+    gate = Gate()
+    calls = []
+    gate.add_rule("tags", lambda user, tags: calls.append(tags) or True)
+    memo = RequestMemo(gate)
+    memo.check("tags", 1, ["a"])
+    memo.check("tags", 1, ["a"])
+    assert len(calls) == 2 and memo.stats()["size"] == 0
+
+def test_fallback_decisions_are_not_memoized():
+    gate = Gate(deadlines=Deadlines(timeout=0))
+    gate.add_rule("edit", lambda user: True)
+    memo = RequestMemo(gate)
+    assert memo.check("edit", 1).fallback
+    assert memo.stats()["size"] == 0
+
+def test_async_request_memo():
+    async def main():
+        gate = AsyncGate()
+        calls = []
+
+        async def edit(user, post):
+            calls.append(post)
+            return Response.allow() if user == post else Response.deny()
+
+        await gate.add_rule("edit", edit)
+        memo = AsyncRequestMemo(gate)
+        results = [await memo.allowed("edit", 1, 1), await memo.allowed("edit", 1, 1), await memo.denied("edit", 1, 2)]
+        return results, calls, await memo.any(["edit"], 1, 1), await memo.none(["edit"], 1, 2)
+
+    assert asyncio.run(main()) == ([True, True, True], [1, 2], True, True)
+
+def test_flask_memoizes_the_user_and_decisions_per_request():
+    flask = pytest.importorskip("flask")
+    from scutum.ext.flask import Scutum
+
+    app = flask.Flask(__name__)
+    resolved, calls = [], []
+    scutum = Scutum(app, user_resolver=lambda *args, **kwargs: resolved.append(1) or 1)
+    scutum.gate.add_rule("edit", lambda user: calls.append(user) or True)
+
+    @app.route("/")
+    @scutum.authorized("edit")
+    @scutum.authorized_rules(["edit"])
+    def index():
+        return str(scutum.allowed("edit", scutum.current_user()))
+
+    client = app.test_client()
+    assert client.get("/").data == b"True"
+    assert client.get("/").data == b"True"
+    assert resolved == [1, 1] and calls == [1, 1]
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from scutum import AsyncGate, Gate, Instrumentation, Metrics
+
+def make_gate(metrics):
+    gate = Gate(metrics=metrics)
+    gate.add_rule("edit", lambda user: user == 1)
+
+    def broken(user):
+        raise RuntimeError("backend down")
+
+    gate.add_rule("broken", broken)
+    return gate
+
+def test_counts_outcomes_and_deny_rate_per_rule():
+    metrics = Metrics()
+    gate = make_gate(metrics)
+    gate.allowed("edit", 1)
+    gate.allowed("edit", 2)
+    gate.allowed("edit", 2)
+    with pytest.raises(RuntimeError):
+        gate.check("broken", 1)
+    snapshot = metrics.snapshot()
+    edit = snapshot["edit"]
+    assert (edit["calls"], edit["allow"], edit["deny"], edit["error"]) == (3, 1, 2, 0)
+    assert edit["deny_rate"] == pytest.approx(2 / 3)
+    assert snapshot["broken"]["error"] == 1
+
+def test_latencies_land_in_histogram_buckets():
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.record("edit", 0.05, "allow")
+    metrics.record("edit", 0.5, "allow")
+    metrics.record("edit", 5.0, "deny")
+    edit = metrics.snapshot()["edit"]
+    assert edit["buckets"] == {0.1: 1, 1.0: 1, float("inf"): 1}
+    assert edit["latency_sum"] == pytest.approx(5.55)
+    assert 0.1 <= edit["p50"] <= 1.0
+
+def test_exposition_is_prometheus_text_format():
+    metrics = Metrics(buckets=(0.1,), namespace="app")
+    metrics.record('post:"edit"', 0.05, "allow")
+    text = metrics.exposition()
+    assert "# TYPE app_checks_total counter" in text
+    assert 'app_checks_total{rule="post:\\"edit\\"",outcome="allow"} 1' in text
+    assert 'app_check_duration_seconds_bucket{rule="post:\\"edit\\"",le="0.1"} 1' in text
+    assert 'app_check_duration_seconds_bucket{rule="post:\\"edit\\"",le="+Inf"} 1' in text
+    assert 'app_check_duration_seconds_count{rule="post:\\"edit\\""} 1' in text
+    assert text.endswith("\n")
+
+def test_reset_drops_every_rule():
+    metrics = Metrics()
+    metrics.record("edit", 0.1, "allow")
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+def test_custom_instrumentation_receives_every_check():
+    class Recorder(Instrumentation):
+        def __init__(self):
+            self.records = []
+
+        def record(self, rule, elapsed, outcome):
+            self.records.append((rule, outcome))
+
+    recorder = Recorder()
+    gate = make_gate(recorder)
+    gate.allowed("edit", 2)
+    assert recorder.records == [("edit", "deny")]
+
+def test_async_gate_records_checks():
+    async def main():
+        metrics = Metrics()
+        gate = AsyncGate(metrics=metrics)
+
+        async def edit(user):
+            return True
+
+        await gate.add_rule("edit", edit)
+        await gate.allowed("edit", 1)
+        return metrics.snapshot()["edit"]["allow"]
+
+    assert asyncio.run(main()) == 1
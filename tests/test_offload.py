@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from contextvars import ContextVar
+import pytest
+from scutum import AsyncPolicy, Offloader, offload
+
+current_user = ContextVar("current_user", default=None)
+
+def test_unknown_modes_are_rejected():
+    with pytest.raises(ValueError):
+        Offloader(default="fiber")
+    with pytest.raises(ValueError):
+        offload("fiber")
+
+def test_rule_mode_beats_policy_mode_which_beats_the_default():
+    @offload("process")
+    class Posts(AsyncPolicy):
+        def view(self, user):
+            return True
+
+        @offload("inline")
+        def edit(self, user):
+            return True
+
+    @offload("thread")
+    def publish(user):
+        return True
+
+    offloader = Offloader()
+    policy = Posts()
+    assert offloader.mode_for("publish", publish) == "thread"
+    assert offloader.mode_for("delete", lambda user: True) == "inline"
+    assert offloader.mode_for("posts:view", policy.view) == "process"
+    assert offloader.mode_for("posts:edit", policy.edit) == "inline"
+    assert Offloader(default="thread").mode_for("delete", lambda user: True) == "thread"
+
+def test_thread_rules_see_the_callers_context_variables():
+    seen = []
+
+    @offload("thread")
+    def rule(user):
+        seen.append(threading.current_thread() is threading.main_thread())
+        return current_user.get() == user
+
+    async def main():
+        offloader = Offloader()
+        current_user.set("alice")
+        try:
+            return await offloader.call("rule", rule, "alice"), offloader.offloaded
+        finally:
+            offloader.shutdown()
+
+    assert asyncio.run(main()) == (True, 1)
+    assert seen == [False]
+
+def test_concurrency_caps_offloaded_calls():
+    lock = threading.Lock()
+    running = [0, 0]
+
+    @offload("thread")
+    def rule(user):
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return True
+
+    async def main():
+        offloader = Offloader(max_workers=8, concurrency=2)
+        try:
+            return await asyncio.gather(*[offloader.call("rule", rule, user) for user in range(8)])
+        finally:
+            offloader.shutdown()
+
+    assert asyncio.run(main()) == [True] * 8
+    assert running[1] <= 2
+
+def test_an_offloader_with_a_cap_can_be_built_outside_a_loop_and_used_by_several():
+    @offload("thread")
+    def rule(user):
+        time.sleep(0.01)
+        return True
+
+    offloader = Offloader(concurrency=1)
+
+    async def main():
+        return await asyncio.gather(*[offloader.call("rule", rule, user) for user in range(3)])
+
+    try:
+        assert asyncio.run(main()) == [True] * 3
+        assert asyncio.run(main()) == [True] * 3
+    finally:
+        offloader.shutdown()
+
+def test_slow_inline_rules_are_promoted_to_the_thread_pool():
+    threads = []
+
+    def slow(user):
+        threads.append(threading.current_thread() is threading.main_thread())
+        time.sleep(0.01)
+        return True
+
+    async def main():
+        offloader = Offloader(slow_threshold=0.001)
+        try:
+            for user in range(3):
+                await offloader.call("slow", slow, user)
+            return offloader.promoted, offloader.modes()
+        finally:
+            offloader.shutdown()
+
+    promoted, modes = asyncio.run(main())
+    assert promoted == 1
+    assert modes == {"slow": "thread"}
+    assert threads[0] is True
+    assert threads[-1] is False
+
+def test_coroutine_rules_are_awaited_on_the_loop():
+    async def rule(user):
+        return user == 1
+
+    async def main():
+        offloader = Offloader(default="thread")
+        return await offloader.call("rule", rule, 1), offloader.offloaded, offloader.modes()
+
+    assert asyncio.run(main()) == (True, 0, {})
@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+from scutum import AsyncGate, DecisionCache, Gate, Policy, Scope, batch
+from scutum.exceptions import FrozenGateException, RuleNotFoundException
+
+class PostPolicy(Policy):
+    def edit(self, user, post):
+        return user == post
+
+    @batch("edit")
+    def edit_many(self, user, posts):
+        return [user == post for post in posts]
+
+def make_base():
+    base = Gate()
+    base.add_rule("view", lambda user: True)
+    base.add_policy("post", PostPolicy)
+    return base
+
+def test_lookups_try_the_tenant_before_the_base():
+    base = make_base()
+    tenant = base.overlay()
+    tenant.add_rule("export", lambda user: user == "root")
+    tenant.override_rule("view", lambda user: False)
+    assert base.frozen
+    assert tenant.allowed("export", "root")
+    assert not tenant.allowed("view", 1)
+    assert base.allowed("view", 1)
+    assert not base.has_rule("export")
+    assert tenant.allowed("post:edit", 1, 1)
+
+def test_add_rule_still_refuses_taken_paths():
+    tenant = make_base().overlay()
+    with pytest.raises(KeyError):
+        tenant.add_rule("view", lambda user: False)
+
+def test_an_overridden_rule_does_not_keep_the_base_companions():
+    tenant = make_base().overlay()
+    assert tenant.allowed_many("post:edit", 1, [1, 2]) == [True, False]
+    calls = []
+
+    def edit(user, post):
+        calls.append(post)
+        return True
+
+    tenant.override_rule("post:edit", edit)
+    assert tenant.allowed_many("post:edit", 1, [1, 2]) == [True, True]
+    assert calls == [1, 2]
+
+def test_base_rules_and_scopes_cannot_be_removed_or_replaced():
+    tenant = make_base().overlay()
+    with pytest.raises(FrozenGateException):
+        tenant.remove_rule("view")
+    with pytest.raises(FrozenGateException):
+        tenant.remove_scope("post")
+    with pytest.raises(KeyError):
+        tenant.add_scope("post", Scope("post"))
+    with pytest.raises(RuleNotFoundException):
+        tenant.remove_rule("missing")
+
+def test_tenants_can_add_and_remove_their_own_scopes():
+    tenant = make_base().overlay()
+    billing = Scope("billing")
+    billing.add_rule("pay", lambda user: True)
+    tenant.add_scope("billing", billing)
+    assert tenant.has_rule("billing:pay")
+    assert sorted(tenant.scopes()) == ["billing", "post"]
+    tenant.remove_scope("billing")
+    assert not tenant.has_scope("billing")
+    assert sorted(tenant.scopes()) == ["post"]
+
+def test_overlays_are_isolated_from_each_other():
+    base = make_base()
+    first, second = base.overlay(), base.overlay()
+    first.override_rule("view", lambda user: False)
+    assert not first.allowed("view", 1)
+    assert second.allowed("view", 1)
+
+def test_overlays_follow_a_reloaded_base_and_keep_their_rules():
+    base = make_base()
+    tenant = base.overlay(cache=DecisionCache())
+    tenant.add_rule("export", lambda user: True)
+    assert tenant.allowed("view", 1)
+    base.reload(lambda staging: staging.add_rule("view", lambda user: False))
+    assert not tenant.allowed("view", 1)
+    assert tenant.allowed("export", 1)
+    assert not tenant.has_scope("post")
+
+def test_overlays_follow_a_swapped_base():
+    base = make_base()
+    tenant = base.overlay()
+    staging = Gate()
+    staging.add_rule("view", lambda user: user == "root")
+    base.swap(staging)
+    assert tenant.allowed("view", "root")
+    assert not tenant.allowed("view", 1)
+
+def test_clear_drops_only_the_tenants_rules():
+    tenant = make_base().overlay()
+    tenant.override_rule("view", lambda user: False)
+    tenant.add_rule("export", lambda user: True)
+    tenant.clear()
+    assert tenant.allowed("view", 1)
+    assert not tenant.has_rule("export")
+
+def test_overlays_cannot_be_swapped_stacked_or_lazy():
+    base = make_base()
+    tenant = base.overlay()
+    with pytest.raises(TypeError):
+        tenant.swap(Gate())
+    with pytest.raises(TypeError):
+        base.swap(tenant)
+    with pytest.raises(TypeError):
+        tenant.reload(lambda staging: None)
+    with pytest.raises(TypeError):
+        tenant.overlay()
+
+def test_a_frozen_overlay_rejects_writes():
+    tenant = make_base().overlay().freeze()
+    with pytest.raises(FrozenGateException):
+        tenant.add_rule("export", lambda user: True)
+    with pytest.raises(FrozenGateException):
+        tenant.clear()
+
+def test_async_overlay():
+    async def main():
+        base = AsyncGate()
+        await base.add_rule("view", lambda user: True)
+        tenant = await base.overlay()
+        await tenant.override_rule("view", lambda user: False)
+        return await base.allowed("view", 1), await tenant.allowed("view", 1)
+
+    assert asyncio.run(main()) == (True, False)
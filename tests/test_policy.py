@@ -0,0 +1,76 @@
+import asyncio
+from scutum import AsyncGate, AsyncPolicy, Gate, Policy
+
+class Post:
+    def __init__(self, user=None):
+        self.user = user
+
+class BasePostPolicy(Policy):
+    model = Post
+    label = "post"
+
+    def view(self, user, post):
+        return True
+
+    def edit(self, user, post):
+        return False
+
+    def _owner(self, user, post):
+        return post.user == user
+
+class PostPolicy(BasePostPolicy):
+    checker = staticmethod(lambda user: True)
+
+    def edit(self, user, post):
+        return self._owner(user, post)
+
+    @staticmethod
+    def publish(user, post):
+        return user == "editor"
+
+    @classmethod
+    def archive(cls, user, post):
+        return cls is PostPolicy
+
+def test_methods_are_registered_bound_to_one_instance():
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    assert gate.allowed("post:view", 1, Post())
+    edit = gate._root.get_rule("post:edit")
+    view = gate._root.get_rule("post:view")
+    assert edit.__self__ is view.__self__
+
+def test_subclass_definitions_replace_inherited_ones():
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    assert gate.allowed("post:edit", 1, Post(1))
+    assert not gate.allowed("post:edit", 2, Post(1))
+
+def test_static_and_class_methods_are_actions():
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    assert gate.allowed("post:publish", "editor", Post())
+    assert gate.allowed("post:archive", 1, Post())
+    assert gate.allowed("post:checker", 1)
+
+def test_classes_values_and_private_methods_are_not_actions():
+    gate = Gate()
+    gate.add_policy("post", PostPolicy)
+    assert not gate.has_rule("post:model")
+    assert not gate.has_rule("post:label")
+    assert not gate.has_rule("post:_owner")
+    assert "post:model" not in gate.abilities(1)
+
+def test_async_policy_actions():
+    class AsyncPostPolicy(AsyncPolicy):
+        model = Post
+
+        async def view(self, user):
+            return True
+
+    async def main():
+        gate = AsyncGate()
+        await gate.add_policy("post", AsyncPostPolicy)
+        return await gate.allowed("post:view", 1), await gate.has_rule("post:model")
+
+    assert asyncio.run(main()) == (True, False)
@@ -0,0 +1,128 @@
+import asyncio
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Tuple
+import pytest
+from scutum import AsyncGate, DecisionCache, Gate, RoleRegistry, Scope
+
+def make_roles():
+    roles = RoleRegistry()
+    roles.role("viewer", permissions=["post.view"])
+    roles.role("editor", permissions=["post.edit"], inherits=["viewer"])
+    roles.role("admin", permissions=["post.delete"], inherits=["editor"])
+    return roles
+
+def make_gate(roles, **options):
+    gate = Gate(**options)
+    gate.add_rule("view", roles.requires("post.view"))
+    gate.add_rule("edit", roles.requires("post.edit"))
+    gate.add_rule("admin", roles.requires_role("admin"))
+    gate.add_rule("edit_delete", roles.requires("post.edit", "post.delete"))
+    return gate
+
+@pytest.mark.parametrize("options", [{}, {"cache": DecisionCache()}])
+def test_inherited_roles_grant_their_permissions(options):
+    roles = make_roles()
+    gate = make_gate(roles, **options)
+    editor = SimpleNamespace(roles=["editor"], permissions=[])
+    admin = SimpleNamespace(roles=["admin"], permissions=[])
+    assert gate.allowed("view", editor) and gate.allowed("edit", editor)
+    assert not gate.allowed("admin", editor) and not gate.allowed("edit_delete", editor)
+    assert gate.allowed("admin", admin) and gate.allowed("edit_delete", admin)
+    assert roles.permissions("editor") == ["post.view", "post.edit"]
+
+def test_direct_permissions_and_explicit_masks():
+    roles = make_roles()
+    gate = make_gate(roles)
+    assert gate.allowed("edit", SimpleNamespace(roles=[], permissions=["post.edit"]))
+    assert gate.allowed("edit", SimpleNamespace(rbac_mask=roles.mask_for(["editor"])))
+    assert not gate.allowed("edit", SimpleNamespace(rbac_mask=()))
+
+def test_nothing_is_stored_on_user_objects():
+    roles = make_roles()
+    gate = make_gate(roles)
+    user = SimpleNamespace(roles=["editor"], permissions=[])
+    gate.allowed("edit", user)
+    roles.role("other")
+    gate.allowed("edit", user)
+    assert vars(user) == {"roles": ["editor"], "permissions": []}
+
+def test_a_change_to_a_users_roles_applies_on_the_next_check():
+    roles = make_roles()
+    gate = make_gate(roles)
+    user = SimpleNamespace(roles=["viewer"], permissions=[])
+    assert not gate.allowed("edit", user)
+    user.roles.append("editor")
+    assert gate.allowed("edit", user)
+    user.roles = []
+    assert not gate.allowed("view", user)
+
+def test_slotted_and_frozen_users_are_supported():
+    @dataclass(frozen=True)
+    class FrozenUser:
+        roles: Tuple[str, ...]
+        permissions: Tuple[str, ...] = ()
+
+    class SlottedUser:
+        __slots__ = ("roles", "permissions")
+
+        def __init__(self, roles):
+            self.roles = roles
+            self.permissions = ()
+
+    gate = make_gate(make_roles())
+    assert gate.allowed("edit", FrozenUser(("editor",)))
+    assert gate.allowed("edit", SlottedUser(["admin"]))
+    assert not gate.allowed("admin", SlottedUser(["editor"]))
+
+def test_redeclaring_a_role_updates_existing_rules():
+    roles = make_roles()
+    gate = make_gate(roles)
+    viewer = SimpleNamespace(roles=["viewer"], permissions=[])
+    assert not gate.allowed("edit", viewer)
+    roles.role("viewer", permissions=["post.view", "post.edit"])
+    assert gate.allowed("edit", viewer)
+    with pytest.raises(ValueError):
+        roles.role("viewer", inherits=["admin"])
+    assert gate.allowed("edit", viewer)
+
+def test_masks_wider_than_one_word():
+    roles = RoleRegistry()
+    roles.permission(*[f"p{index}" for index in range(200)])
+    roles.role("last", permissions=["p199"])
+    gate = Gate()
+    gate.add_rule("last", roles.requires("p199"))
+    gate.add_rule("first", roles.requires("p0", "p199"))
+    user = SimpleNamespace(roles=["last"], permissions=[])
+    assert gate.allowed("last", user) and not gate.allowed("first", user)
+    assert gate.allowed("first", SimpleNamespace(roles=["last"], permissions=["p0"]))
+
+def test_unknown_names_are_rejected():
+    roles = make_roles()
+    with pytest.raises(KeyError):
+        roles.requires("post.publish")
+    with pytest.raises(KeyError):
+        roles.role("writer", inherits=["missing"])
+
+@pytest.mark.parametrize("options", [{}, {"cache": DecisionCache()}])
+def test_rules_changed_on_a_scope_directly_are_seen_by_the_gate(options):
+    roles = make_roles()
+    gate = Gate(**options)
+    post = Scope("post")
+    gate.add_scope("post", post)
+    post.add_rule("edit", roles.requires("post.delete"))
+    editor = SimpleNamespace(roles=["editor"], permissions=[])
+    assert not gate.allowed("post:edit", editor)
+    post.remove_rule("edit")
+    post.add_rule("edit", roles.requires("post.edit"))
+    assert gate.allowed("post:edit", editor)
+
+def test_async_gate_runs_mask_rules():
+    roles = make_roles()
+
+    async def main():
+        gate = AsyncGate()
+        await gate.add_rule("edit", roles.requires("post.edit"))
+        return await gate.allowed("edit", SimpleNamespace(roles=["editor"], permissions=[]))
+
+    assert asyncio.run(main())
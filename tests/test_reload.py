@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import pytest
+from scutum import AsyncGate, AsyncPolicy, DecisionCache, Gate, Policy
+from scutum.exceptions import FrozenGateException, RuleNotFoundException, ScopeNotFoundException
+
+def policy(result):
+    class PostPolicy(Policy):
+        def edit(self, user, post):
+            return result
+    return PostPolicy
+
+def test_reload_publishes_the_new_registry():
+    gate = Gate()
+    gate.add_policy("post", policy(False))
+    gate.reload(lambda staging: staging.add_policy("post", policy(True)))
+    assert gate.allowed("post:edit", 1, 1)
+
+def test_swap_clears_the_decision_cache():
+    gate = Gate(cache=DecisionCache())
+    gate.add_policy("post", policy(False))
+    gate.allowed("post:edit", 1, 1)
+    staging = Gate()
+    staging.add_policy("post", policy(True))
+    gate.swap(staging)
+    assert gate.allowed("post:edit", 1, 1)
+
+def test_the_staging_gate_is_detached_after_a_swap():
+    gate = Gate(cache=DecisionCache())
+    staging = Gate()
+    staging.add_policy("post", policy(True))
+    gate.swap(staging)
+    assert gate.allowed("post:edit", 1, 1)
+    assert not staging.has_scope("post")
+    staging.add_rule("later", lambda user: True)
+    staging.add_policy("post", policy(False))
+    assert not gate.has_rule("later")
+    assert gate.allowed("post:edit", 1, 1)
+
+def test_swapping_a_gate_with_itself_changes_nothing():
+    gate = Gate()
+    gate.add_policy("post", policy(True))
+    assert gate.swap(gate) is gate
+    assert gate.allowed("post:edit", 1, 1)
+
+def test_a_frozen_gate_freezes_the_incoming_registry():
+    gate = Gate()
+    gate.add_policy("post", policy(False))
+    gate.freeze()
+    gate.reload(lambda staging: staging.add_policy("post", policy(True)))
+    assert gate.frozen and gate.allowed("post:edit", 1, 1)
+    with pytest.raises(FrozenGateException):
+        gate.add_rule("other", lambda user: True)
+
+def test_swap_expects_a_gate():
+    with pytest.raises(TypeError):
+        Gate().swap(AsyncGate())
+
+def test_checks_never_see_a_missing_scope_during_reloads():
+    gate = Gate()
+    gate.add_policy("post", policy(True))
+    stop = threading.Event()
+    errors = []
+
+    def check():
+        while not stop.is_set():
+            try:
+                gate.allowed("post:edit", 1, 1)
+            except (RuleNotFoundException, ScopeNotFoundException) as error:
+                errors.append(error)
+
+    threads = [threading.Thread(target=check) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for step in range(300):
+        gate.reload(lambda staging: staging.add_policy("post", policy(step % 2 == 0)))
+    stop.set()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+def test_async_reload_and_swap():
+    class AsyncPostPolicy(AsyncPolicy):
+        async def edit(self, user, post):
+            return True
+
+    async def main():
+        gate = AsyncGate()
+
+        async def configure(staging):
+            await staging.add_policy("post", AsyncPostPolicy)
+
+        await gate.reload(configure)
+        staging = AsyncGate()
+
+        @staging.rule("pending")
+        def pending(user):
+            return True
+
+        await gate.swap(staging)
+        await staging.add_rule("later", pending)
+        return await gate.allowed("pending", 1), await gate.has_scope("post"), await gate.has_rule("later")
+
+    assert asyncio.run(main()) == (True, False, False)
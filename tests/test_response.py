@@ -0,0 +1,71 @@
+import pickle
+import pytest
+from scutum import DecisionCache, Gate, Response
+from scutum.exceptions import AuthorizationException
+
+class JSONResponse(Response):
+    __slots__ = ()
+
+def test_responses_are_immutable():
+    response = Response.deny("No")
+    with pytest.raises(AttributeError):
+        response.allowed = True
+    with pytest.raises(AttributeError):
+        del response.message
+    with pytest.raises(AttributeError):
+        response.extra = 1
+    assert response.allowed is False
+
+def test_equal_fields_mean_equal_responses():
+    assert Response.allow("Yes") == Response(True, "Yes", 200)
+    assert hash(Response.allow("Yes")) == hash(Response(True, "Yes", 200))
+    assert Response.allow("Yes") != Response.allow("Yes", 201)
+    assert Response.timeout() != Response(False, "Authorization timed out", 503)
+    assert len({Response.deny(), Response.deny(), Response.allow()}) == 2
+    assert Response.allow() != True
+
+def test_default_allow_and_deny_are_shared():
+    assert Response.allow() is Response.allow()
+    assert Response.deny() is Response.deny()
+    assert Response.allow("Other") is not Response.allow("Other")
+    assert JSONResponse.allow() is not Response.allow()
+    assert type(JSONResponse.deny()) is JSONResponse
+
+def test_responses_survive_pickling():
+    for response in (Response.allow(), Response.deny("No", 404), Response.timeout(True), JSONResponse.allow("Yes")):
+        copy = pickle.loads(pickle.dumps(response))
+        assert copy == response
+        assert type(copy) is type(response)
+    fallback = pickle.loads(pickle.dumps(Response(True, "Saturated", 200, fallback=True)))
+    assert fallback.fallback and not fallback.timed_out
+
+def test_timeouts_are_fallbacks():
+    closed, open_ = Response.timeout(), Response.timeout(True)
+    assert closed.timed_out and closed.fallback and closed.status_code == 503
+    assert open_.allowed and open_.status_code == 200
+    assert "timed_out=True" in repr(closed)
+    assert "fallback=True" in repr(Response(False, fallback=True))
+    assert "fallback" not in repr(Response.deny())
+
+def test_authorize_raises_with_the_status_code():
+    Response.allow().authorize()
+    with pytest.raises(AuthorizationException) as error:
+        Response.deny("Gone", 410).authorize()
+    assert error.value.status_code == 410
+    assert str(error.value) == "Gone"
+
+def test_gates_pass_responses_through_and_cache_them():
+    calls = []
+    gate = Gate(cache=DecisionCache())
+
+    def edit(user):
+        calls.append(user)
+        return Response.deny("Read only", 423)
+
+    gate.add_rule("edit", edit)
+    assert gate.check("edit", 1) == Response.deny("Read only", 423)
+    assert gate.check("edit", 1).status_code == 423
+    assert calls == [1]
+    with pytest.raises(AuthorizationException) as error:
+        gate.authorize("edit", 1)
+    assert error.value.status_code == 423
@@ -0,0 +1,99 @@
+import sys
+import threading
+import pytest
+from scutum import Scope
+from scutum.exceptions import RuleNotFoundException, ScopeNotFoundException
+
+def make_post(allowed=True):
+    post = Scope("post")
+    post.add_rule("edit", lambda user: allowed)
+    post.add_scope("comment", Scope("comment"))
+    post.add_rule("comment:delete", lambda user: allowed)
+    return post
+
+def test_writes_publish_new_dicts_and_leave_old_snapshots_intact():
+    root = Scope("root")
+    root.add_scope("post", make_post())
+    index, scope_index = root._index, root._scope_index
+    root.add_rule("post:view", lambda user: True)
+    assert root._index is not index and "post:view" not in index
+    root.remove_scope("post")
+    assert "post:edit" in index and "post:comment" in scope_index
+    assert root._index == {} and root._scope_index == {}
+
+def test_rules_and_scopes_resolve_through_the_flat_index():
+    root = Scope("root")
+    root.add_scope("post", make_post())
+    assert root.call("post:comment:delete", 1) is True
+    assert root.has_rule("post:edit") and root.has_scope("post:comment")
+    assert not root.has_rule("post:missing")
+    with pytest.raises(ScopeNotFoundException):
+        root.get_rule("page:edit")
+    with pytest.raises(RuleNotFoundException):
+        root.get_rule("post:missing")
+    with pytest.raises(ValueError):
+        root.get_rule("post::edit")
+
+def test_writes_on_a_retained_child_reach_every_ancestor():
+    root = Scope("root")
+    post = make_post()
+    root.add_scope("post", post)
+    post.get_scope("comment").add_rule("edit", lambda user: False)
+    assert root.call("post:comment:edit", 1) is False
+    post.remove_rule("edit")
+    assert not root.has_rule("post:edit")
+
+def test_writers_hold_the_lock_of_the_topmost_scope():
+    root = Scope("root")
+    post = make_post()
+    root.add_scope("post", post)
+    assert post.get_scope("comment")._writer_lock() is root._lock
+    root.remove_scope("post")
+    assert post._writer_lock() is post._lock
+
+def test_replacing_a_scope_never_hides_its_rules_from_readers():
+    # Many rules widen the window a replacement would leave open if it
+    # removed the old paths before adding the new ones.
+    def make_large(step):
+        post = make_post(step % 2 == 0)
+        for index in range(300):
+            post.add_rule(f"rule{index}", lambda user: True)
+        return post
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    root = Scope("root")
+    root.add_scope("post", make_large(0))
+    stop = threading.Event()
+    misses = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                root.call("post:comment:delete", 1)
+            except (RuleNotFoundException, ScopeNotFoundException) as error:
+                misses.append(error)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for step in range(200):
+            root.add_scope("post", make_large(step))
+    finally:
+        stop.set()
+        sys.setswitchinterval(interval)
+    for reader in readers:
+        reader.join()
+    assert misses == []
+
+def test_replacing_a_scope_drops_the_rules_it_no_longer_has():
+    root = Scope("root")
+    root.add_scope("post", make_post())
+    replacement = Scope("post")
+    replacement.add_rule("view", lambda user: True)
+    root.add_scope("post", replacement)
+    assert root.has_rule("post:view")
+    assert not root.has_scope("post:comment")
+    with pytest.raises(ScopeNotFoundException):
+        root.get_rule("post:comment:delete")
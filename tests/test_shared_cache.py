@@ -0,0 +1,129 @@
+import multiprocessing
+import os
+import pytest
+import scutum.cache
+from scutum import Gate, Response, Scope, SharedDecisionCache
+from scutum.cache import MISSING
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="the shared cache is inherited through fork")
+
+def expected(user, post):
+    return (user + post) % 3 != 0
+
+def make_gate(cache):
+    gate = Gate(cache=cache)
+    evaluations = []
+
+    def edit(user, post):
+        evaluations.append((user, post))
+        return expected(user, post)
+
+    gate.add_scope("post", Scope("post"))
+    gate.add_rule("post:edit", edit)
+    return gate, evaluations
+
+def in_children(count, func, *args):
+    # Runs ``func(index, *args)`` in ``count`` forked workers at once and
+    # returns what each of them put on the queue, in worker order.
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    def run(index):
+        queue.put((index, func(index, *args)))
+
+    workers = [context.Process(target=run, args=(index,)) for index in range(count)]
+    for worker in workers:
+        worker.start()
+    results = dict(queue.get(timeout=60) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    return [results[index] for index in range(count)]
+
+def test_decisions_computed_in_one_worker_are_hits_in_the_others():
+    gate, evaluations = make_gate(SharedDecisionCache(slots=1024))
+
+    def fill(index):
+        return [gate.allowed("post:edit", user, index) for user in range(10)]
+
+    assert in_children(2, fill) == [[expected(user, post) for user in range(10)] for post in range(2)]
+    assert [gate.allowed("post:edit", user, post) for post in range(2) for user in range(10)] == [
+        expected(user, post) for post in range(2) for user in range(10)
+    ]
+    assert evaluations == []
+
+def test_clear_in_another_worker_invalidates_every_worker():
+    cache = SharedDecisionCache(slots=1024)
+    gate, evaluations = make_gate(cache)
+    gate.allowed("post:edit", 1, 1)
+    in_children(1, lambda index: cache.clear())
+    gate.allowed("post:edit", 1, 1)
+    assert len(evaluations) == 2
+
+def test_invalidate_with_filters_drops_every_decision():
+    cache = SharedDecisionCache(slots=1024)
+    gate, evaluations = make_gate(cache)
+    gate.allowed("post:edit", 1, 1)
+    gate.allowed("post:edit", 2, 1)
+    in_children(1, lambda index: cache.invalidate(user=1))
+    gate.allowed("post:edit", 2, 1)
+    assert len(evaluations) == 3
+
+def test_file_backed_cache_is_shared_by_name(tmp_path):
+    path = str(tmp_path / "decisions")
+    cache = SharedDecisionCache(slots=64, path=path)
+
+    def store(index):
+        other = SharedDecisionCache(slots=64, path=path)
+        other.set(other.key("post:edit", 1, 2), Response.deny("Not yours", 404))
+        other.close()
+
+    in_children(1, store)
+    assert cache.get(cache.key("post:edit", 1, 2)) == Response.deny("Not yours", 404)
+    with pytest.raises(ValueError):
+        SharedDecisionCache(slots=128, path=path)
+
+def test_concurrent_writers_never_return_a_wrong_decision():
+    # One way per bucket and far more keys than slots, so the workers keep
+    # overwriting each other's slots. A read may miss, never disagree.
+    cache = SharedDecisionCache(slots=16, ways=1)
+
+    def hammer(index):
+        wrong = 0
+        for step in range(20_000):
+            user, post = divmod((step * 7919 + index * 104729) % 2500, 50)
+            key = cache.key("post:edit", user, post)
+            cache.set(key, expected(user, post))
+            decision = cache.get(cache.key("post:edit", post, user))
+            if decision is not MISSING and decision is not expected(post, user):
+                wrong += 1
+        return wrong
+
+    assert in_children(4, hammer) == [0, 0, 0, 0]
+
+def test_fallback_responses_are_not_shared():
+    cache = SharedDecisionCache(slots=64)
+    key = cache.key("post:edit", 1, 1)
+    cache.set(key, Response.timeout(True))
+    assert cache.get(key) is MISSING
+
+def test_expiry_is_wall_clock_time_stored_in_the_table(tmp_path, monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(scutum.cache, "time", lambda: now[0])
+    monkeypatch.setattr(scutum.cache, "monotonic", lambda: 5.0)
+    path = str(tmp_path / "decisions")
+    cache = SharedDecisionCache(slots=64, ttl=30, path=path)
+    cache.set(cache.key("post:edit", 1, 2), True)
+    cache.close()
+    reopened = SharedDecisionCache(slots=64, ttl=30, path=path)
+    key = reopened.key("post:edit", 1, 2)
+    now[0] += 29
+    assert reopened.get(key) is True
+    now[0] += 2
+    assert reopened.get(key) is MISSING
+
+def test_tables_from_an_older_layout_are_rejected(tmp_path):
+    path = tmp_path / "decisions"
+    path.write_bytes(b"scutum01" + (64).to_bytes(8, "little") + bytes(8))
+    with pytest.raises(ValueError):
+        SharedDecisionCache(slots=64, path=str(path))
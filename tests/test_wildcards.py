@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from scutum import AsyncGate, AsyncScope, Gate, Scope
+from scutum.exceptions import RuleNotFoundException
+
+TAGS = ["posts:read", "admin:*", "*:read", "*", "admin:*:*", "posts:*"]
+
+def tagged(tag):
+    return lambda user: user == tag
+
+def winner(gate, path):
+    return next(tag for tag in TAGS if gate.allowed(path, tag))
+
+def make_gate():
+    gate = Gate()
+    gate.add_scope("admin", Scope("admin"))
+    gate.add_scope("posts", Scope("posts"))
+    gate.add_rule("admin:*", tagged("admin:*"))
+    gate.add_rule("*:read", tagged("*:read"))
+    gate.add_rule("*", tagged("*"))
+    gate.add_rule("posts:read", tagged("posts:read"))
+    return gate
+
+def test_exact_rules_beat_patterns_and_the_leftmost_literal_wins():
+    gate = make_gate()
+    assert winner(gate, "posts:read") == "posts:read"
+    assert winner(gate, "admin:read") == "admin:*"
+    assert winner(gate, "billing:read") == "*:read"
+    assert winner(gate, "anything") == "*"
+
+def test_a_star_matches_exactly_one_segment():
+    gate = make_gate()
+    gate.add_scope("admin:users", Scope("users"))
+    with pytest.raises(RuleNotFoundException):
+        gate.check("admin:users:delete", 1)
+    gate.add_rule("admin:*:*", tagged("admin:*:*"))
+    assert winner(gate, "admin:users:delete") == "admin:*:*"
+
+def test_has_rule_only_reports_registered_paths():
+    gate = make_gate()
+    assert gate.has_rule("admin:*")
+    assert not gate.has_rule("posts:*")
+    assert not gate.has_rule("admin:read")
+    assert not gate.has_rule("a*b")
+    assert not gate.has_rule("admin:a*b")
+    assert not gate.freeze().has_rule("a*b")
+
+def test_partial_wildcards_cannot_be_registered():
+    gate = Gate()
+    with pytest.raises(ValueError):
+        gate.add_rule("a*b", lambda user: True)
+    with pytest.raises(ValueError):
+        gate.remove_rule("a*b")
+
+def test_removing_a_pattern_or_its_scope_stops_it_matching():
+    gate = make_gate()
+    gate.remove_rule("admin:*")
+    assert winner(gate, "admin:read") == "*:read"
+    gate.add_rule("posts:*", tagged("posts:*"))
+    gate.remove_scope("posts")
+    assert not gate.has_rule("posts:*")
+
+def test_patterns_kept_from_before_the_freeze_do_not_change_it():
+    gate = Gate()
+    admin = Scope("admin")
+    gate.add_scope("admin", admin)
+    admin.add_rule("read", lambda user: True)
+    gate.freeze()
+    admin.add_rule("*", lambda user: True)
+    assert not gate.has_rule("admin:*")
+    with pytest.raises(RuleNotFoundException):
+        gate.check("admin:write", 1)
+
+def test_async_patterns():
+    async def main():
+        gate = AsyncGate()
+        await gate.add_scope("admin", AsyncScope("admin"))
+        await gate.add_rule("admin:*", lambda user: user == "root")
+        return (
+            await gate.allowed("admin:delete", "root"),
+            await gate.allowed("admin:delete", "guest"),
+            await gate.has_rule("a*b"),
+        )
+
+    assert asyncio.run(main()) == (True, False, False)